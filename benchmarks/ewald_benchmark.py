@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+#  Copyright (c) 2020. Distributed under the terms of the MIT License.
+"""Benchmark of the speed/accuracy trade-off of the Ewald sums.
+
+Lattices and dielectric tensors are taken from the test files, and the
+default and optimized Ewald parameters are compared for several accuracies.
+
+Usage: python benchmarks/ewald_benchmark.py [accuracy ...]
+
+The script can be run from a source checkout without installing pydefect,
+as the repository root is added to sys.path.
+"""
+import sys
+from pathlib import Path
+
+from monty.serialization import loadfn
+from tabulate import tabulate
+
+repository_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(repository_root))
+
+from pydefect.corrections.ewald import Ewald  # noqa: E402
+
+vasp_files = repository_root / "pydefect" / "tests" / "cli" / "vasp" \
+    / "vasp_files"
+
+
+def benchmark_lattices():
+    for unitcell_file in sorted(vasp_files.glob("*/unitcell.json")):
+        unitcell = loadfn(unitcell_file)
+        for calc_results_file in sorted(
+                unitcell_file.parent.glob("**/*calc_results.json")):
+            lattice = loadfn(calc_results_file).structure.lattice.matrix
+            name = str(calc_results_file.relative_to(vasp_files))
+            yield name, lattice, unitcell.dielectric_constant
+
+
+def main(accuracies):
+    table = []
+    for name, lattice, diele in benchmark_lattices():
+        for accuracy in accuracies:
+            for label, ewald in [
+                ("default", Ewald(lattice, diele, accuracy)),
+                ("optimized",
+                 Ewald.from_optimized_param(lattice, diele, accuracy))]:
+                stats = ewald.sum_statistics()
+                table.append([name, accuracy, label, ewald.ewald_param,
+                              stats["num_r_vectors"], stats["num_g_vectors"],
+                              stats["real_time"], stats["rec_time"],
+                              ewald.lattice_energy])
+
+    print(tabulate(table,
+                   headers=["file", "accuracy", "param", "ewald_param",
+                            "#R", "#G", "real (s)", "rec (s)",
+                            "lattice energy"],
+                   floatfmt=".6g"))
+
+
+if __name__ == "__main__":
+    main([float(a) for a in sys.argv[1:]] or [5.0, 10.0, 15.0])
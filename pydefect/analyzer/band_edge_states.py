@@ -1,6 +1,5 @@
 # -*- coding: utf-8 -*-
 #  Copyright (c) 2020. Distributed under the terms of the MIT License.
-from copy import deepcopy
 from dataclasses import dataclass
 from typing import List, Dict, Tuple, Optional, Set
 
@@ -51,25 +50,128 @@ class OrbitalInfo(MSONable):
     participation_ratio: float = None
 
 
-@dataclass
+@dataclass(eq=False)
 class BandEdgeOrbitalInfos(MSONable, ToJsonFileMixIn):
-    orbital_infos: List[List[List["OrbitalInfo"]]]  # [spin, k-idx, band-idx]
+    """Eigenvalues and orbital characters of the bands near the band edges.
+
+    The quantities are stored in arrays indexed by [spin, k-idx, band-idx],
+    and the orbital weights by [spin, k-idx, band-idx, element-idx, l],
+    where the elements are listed in the elements attribute. Unknown
+    participation ratios are set to nan.
+    """
+    energies: np.ndarray
+    occupations: np.ndarray
+    orbitals: np.ndarray
+    elements: List[str]
     kpt_coords: List[GenCoords]
     kpt_weights: List[float]
     lowest_band_index: int  # python convention starting from 0.
     fermi_level: float
+    participation_ratios: Optional[np.ndarray] = None
     eigval_shift: float = 0.0  # add this value to the energies.
 
+    def __post_init__(self):
+        self.energies = np.array(self.energies, dtype=float)
+        self.occupations = np.array(self.occupations, dtype=float)
+        self.orbitals = np.array(self.orbitals, dtype=float)
+        if self.orbitals.size == 0:
+            self.orbitals = self.orbitals.reshape(
+                self.energies.shape + (len(self.elements), 0))
+        if self.participation_ratios is not None:
+            self.participation_ratios = np.array(self.participation_ratios,
+                                                 dtype=float)
+
+    @classmethod
+    def from_orbital_infos(cls,
+                           orbital_infos: List[List[List[OrbitalInfo]]],
+                           **kwargs) -> "BandEdgeOrbitalInfos":
+        """Construct from OrbitalInfo's nested as [spin, k-idx, band-idx]."""
+        flat = [o for x in orbital_infos for y in x for o in y]
+        shape = np.shape(orbital_infos)
+        elements = list(dict.fromkeys(e for o in flat for e in o.orbitals))
+        num_l = max([len(v) for o in flat for v in o.orbitals.values()],
+                    default=0)
+
+        orbitals = np.zeros((len(flat), len(elements), num_l))
+        for i, o in enumerate(flat):
+            for j, elem in enumerate(elements):
+                weights = o.orbitals.get(elem, [])
+                orbitals[i, j, :len(weights)] = weights
+
+        p_ratios = [o.participation_ratio for o in flat]
+        if all(p is None for p in p_ratios):
+            p_ratios = None
+        else:
+            p_ratios = np.array(p_ratios, dtype=float).reshape(shape)
+
+        return cls(energies=np.reshape([o.energy for o in flat], shape),
+                   occupations=np.reshape([o.occupation for o in flat], shape),
+                   orbitals=orbitals.reshape(shape + orbitals.shape[1:]),
+                   elements=elements,
+                   participation_ratios=p_ratios,
+                   **kwargs)
+
+    def as_dict(self) -> dict:
+        d = super().as_dict()
+        for key in ["energies", "occupations", "orbitals"]:
+            d[key] = getattr(self, key).tolist()
+        if self.participation_ratios is not None:
+            p_ratios = self.participation_ratios
+            d["participation_ratios"] = \
+                np.where(np.isnan(p_ratios), None, p_ratios).tolist()
+        return d
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "BandEdgeOrbitalInfos":
+        d = {k: v for k, v in d.items() if not k.startswith("@")}
+        # Files written before the arrays were introduced.
+        if "orbital_infos" in d:
+            orbital_infos = [[[OrbitalInfo.from_dict(o)
+                               if isinstance(o, dict) else o for o in y]
+                              for y in x] for x in d.pop("orbital_infos")]
+            return cls.from_orbital_infos(orbital_infos, **d)
+        return cls(**d)
+
+    def __eq__(self, other):
+        if not isinstance(other, BandEdgeOrbitalInfos):
+            return NotImplemented
+        return self.as_dict() == other.as_dict()
+
+    def orbital_info(self, spin_idx: int, k_idx: int, band_idx: int,
+                     shifted: bool = False) -> OrbitalInfo:
+        """OrbitalInfo of a band, whose energy is shifted by eigval_shift
+        when shifted is True. band_idx is counted from lowest_band_index.
+        """
+        idx = (spin_idx, k_idx, band_idx)
+        shift = self.eigval_shift if shifted else 0.0
+        orbitals = {e: orbs.tolist()
+                    for e, orbs in zip(self.elements, self.orbitals[idx])}
+        p_ratio = None
+        if self.participation_ratios is not None:
+            p_ratio = float(self.participation_ratios[idx])
+            if np.isnan(p_ratio):
+                p_ratio = None
+        return OrbitalInfo(energy=float(self.energies[idx]) + shift,
+                           orbitals=orbitals,
+                           occupation=float(self.occupations[idx]),
+                           participation_ratio=p_ratio)
+
+    def _orbital_info_view(self, shifted: bool
+                           ) -> List[List[List[OrbitalInfo]]]:
+        num_spin, num_k, num_band = self.energies.shape
+        return [[[self.orbital_info(s, k, b, shifted) for b in range(num_band)]
+                 for k in range(num_k)] for s in range(num_spin)]
+
+    @property
+    def orbital_infos(self) -> List[List[List[OrbitalInfo]]]:
+        """OrbitalInfo's nested as [spin, k-idx, band-idx], created on demand.
+        """
+        return self._orbital_info_view(shifted=False)
+
     @property
     def shifted_orbital_infos(self) -> List[List[List[OrbitalInfo]]]:
         """Return new orbital_infos with energy shifted by eigval_shift."""
-        new_orbital_infos = deepcopy(self.orbital_infos)
-        for spin_idx in range(len(new_orbital_infos)):
-            for k_idx in range(len(new_orbital_infos[spin_idx])):
-                for band_idx in range(len(new_orbital_infos[spin_idx][k_idx])):
-                    new_orbital_infos[spin_idx][k_idx][band_idx].energy \
-                        += self.eigval_shift
-        return new_orbital_infos
+        return self._orbital_info_view(shifted=True)
 
     def kpt_idx(self, kpt_coord):
         for i, orig_kpt in enumerate(self.kpt_coords):
@@ -79,16 +181,11 @@ class BandEdgeOrbitalInfos(MSONable, ToJsonFileMixIn):
 
     @property
     def energies_and_occupations(self) -> List[List[List[List[float]]]]:
-        result = np.zeros(np.shape(self.orbital_infos) + (2,))
         if self.eigval_shift:
             logger.info(
                 f"The eigenvalues are shifted by {self.eigval_shift:4.2f}")
-        for i, x in enumerate(self.orbital_infos):
-            for j, y in enumerate(x):
-                for k, z in enumerate(y):
-                    result[i][j][k] = \
-                        [z.energy + self.eigval_shift, z.occupation]
-        return result.tolist()
+        return np.stack([self.energies + self.eigval_shift, self.occupations],
+                        axis=-1).tolist()
 
     def __str__(self):
         return "\n".join([" -- band-edge orbitals info",
@@ -105,12 +202,12 @@ class BandEdgeOrbitalInfos(MSONable, ToJsonFileMixIn):
         if self.eigval_shift:
             band_block[0].insert(3, "Shifted")
 
-        for orbital_info in self.orbital_infos:
-            max_idx, min_idx, t_orb_info = self._band_idx_range(orbital_info)
+        for spin_idx, occupations in enumerate(self.occupations):
+            max_idx, min_idx = self._band_idx_range(occupations)
             for band_idx in range(min_idx, max_idx):
                 actual_band_idx = band_idx + self.lowest_band_index + 1
-                for kpt_idx, orb_info in enumerate(t_orb_info[band_idx], 1):
-
+                for kpt_idx in range(len(occupations)):
+                    orb_info = self.orbital_info(spin_idx, kpt_idx, band_idx)
                     energy = f"{orb_info.energy :5.2f}"
                     occupation = f"{orb_info.occupation:4.1f}"
                     if orb_info.participation_ratio:
@@ -118,7 +215,7 @@ class BandEdgeOrbitalInfos(MSONable, ToJsonFileMixIn):
                     else:
                         p_ratio = "N.A."
                     orbs = pretty_orbital(orb_info.orbitals)
-                    data = [actual_band_idx, kpt_idx, energy, occupation,
+                    data = [actual_band_idx, kpt_idx + 1, energy, occupation,
                             p_ratio, orbs]
                     if self.eigval_shift:
                         shifted = f"{orb_info.energy + self.eigval_shift :5.2f}"
@@ -139,20 +236,20 @@ class BandEdgeOrbitalInfos(MSONable, ToJsonFileMixIn):
         return tabulate(kpt_block, tablefmt="plain")
 
     @staticmethod
-    def _band_idx_range(orbital_info: List[List[OrbitalInfo]]
-                        ) -> Tuple[int, int, List[List[OrbitalInfo]]]:
-        # swap [kpt_idx][band_idx] -> [bane_idx][kpt_idx]
-        t_orbital_info = np.array(orbital_info).T.tolist()
-        middle_idx = int(len(t_orbital_info) / 2)
-        for band_idx, (upper, lower) in enumerate(zip(t_orbital_info[1:],
-                                                      t_orbital_info[:-1])):
-            # determine the band_idx where the occupation changes largely.
-            if lower[0].occupation - upper[0].occupation > 0.1:
-                middle_idx = band_idx + 1
-                break
-        max_idx = min(middle_idx + 3, len(t_orbital_info))
+    def _band_idx_range(occupations: np.ndarray) -> Tuple[int, int]:
+        """Range of band indices around the band where the occupation at the
+        first k-point changes largely.
+
+        occupations: [k-idx, band-idx]
+        """
+        num_bands = occupations.shape[1]
+        middle_idx = int(num_bands / 2)
+        changed = np.flatnonzero(occupations[0, :-1] - occupations[0, 1:] > 0.1)
+        if len(changed):
+            middle_idx = int(changed[0]) + 1
+        max_idx = min(middle_idx + 3, num_bands)
         min_idx = max(middle_idx - 3, 0)
-        return max_idx, min_idx, t_orbital_info
+        return max_idx, min_idx
 
 
 @dataclass
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 #  Copyright (c) 2020. Distributed under the terms of the MIT License.
 from dataclasses import dataclass
+from pathlib import Path
 from typing import List, Optional
 
 from monty.json import MSONable
@@ -44,3 +45,21 @@ class NoElectronicConvError(AssertionError):
 
 class NoIonicConvError(AssertionError):
     pass
+
+
+def check_convergence(calc_results, _dir: Path, check: bool) -> None:
+    """Warn when the calculation in _dir is not converged, and raise an error
+    when check is True.
+
+    calc_results is an object with electronic_conv and ionic_conv, e.g.,
+    CalcResults and SingleCalcSummary.
+    """
+    if calc_results.electronic_conv is False:
+        logger.warning(f"SCF in {_dir} is not reached.")
+        if check:
+            raise NoElectronicConvError
+
+    elif calc_results.ionic_conv is False:
+        logger.warning(f"Ionic convergence in {_dir} is not reached.")
+        if check:
+            raise NoIonicConvError
@@ -9,10 +9,11 @@ from ruamel.yaml.scalarint import ScalarInt
 
 from pydefect.analyzer.calc_results import CalcResults
 from pydefect.analyzer.defect_energy import DefectEnergyInfo
-from pydefect.analyzer.defect_structure_info import DefectStructureInfo
+from pydefect.analyzer.defect_structure_info import DefectStructureInfo, \
+    unique_point_group
+from pydefect.database.database import num_symmetry_operation
 from pymatgen.symmetry.groups import SpaceGroup
 from vise.util.mix_in import ToYamlFileMixIn
-from vise.util.structure_symmetrizer import num_symmetry_operation
 
 
 @dataclass
@@ -83,7 +84,8 @@ class MakeDegeneracy:
                        structure_info: DefectStructureInfo):
         spin = self.mag_to_spin_degeneracy(calc_results.magnetization)
         site = (self._primitive_num_sym_opt
-                / num_symmetry_operation(structure_info.final_site_sym))
+                / num_symmetry_operation(
+                    unique_point_group(structure_info.final_site_sym)))
 
         degeneracy = Degeneracy(int(site), spin,
                                 structure_info.initial_site_sym,
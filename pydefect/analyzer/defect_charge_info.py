@@ -4,7 +4,6 @@ from dataclasses import dataclass
 from typing import List
 
 import numpy as np
-from matplotlib import pyplot as plt
 from monty.json import MSONable
 from pydefect.defaults import defaults
 from pydefect.util.coords import pretty_coords
@@ -89,6 +88,7 @@ class DefectChargeInfo(MSONable, ToJsonFileMixIn):
         return result
 
     def show_dist(self):
+        from matplotlib import pyplot as plt
         plt.xlim([0, self.distance_bins[-1]])
         for charge_dist, _idx in zip(self.charge_dists, self.band_idxs):
             for dist, spin in zip(charge_dist, ["up", "down"]):
@@ -1,12 +1,14 @@
 # -*- coding: utf-8 -*-
 #  Copyright (c) 2020 Kumagai group.
 from dataclasses import dataclass
-from typing import List, Tuple
+from types import MappingProxyType
+from typing import List, Tuple, Optional, Mapping
 
 import numpy as np
 from monty.json import MSONable
 from pydefect.defaults import defaults
-from pydefect.util.structure_tools import Distances
+from pydefect.util.structure_tools import Distances, \
+    nearest_site_indices
 from pymatgen.core import IStructure, Structure
 from vise.util.typing import Coords
 
@@ -26,21 +28,37 @@ class DefectStructureComparator:
         self.dist_tol = dist_tol
         self.p_to_d = self.make_p_to_d()
         self.d_to_p = self.make_d_to_p()
+        self._removed_indices = self._unmapped_indices(self.p_to_d,
+                                                       self.d_to_p)
+        self._inserted_indices = self._unmapped_indices(self.d_to_p,
+                                                        self.p_to_d)
+        mapped = np.ones(len(self.d_to_p), dtype=bool)
+        mapped[list(self._inserted_indices)] = False
+        self._atom_mapping = MappingProxyType(
+            {d: self.d_to_p[d] for d in np.flatnonzero(mapped).tolist()})
+
+    @staticmethod
+    def _unmapped_indices(a_to_b: List[Optional[int]],
+                          b_to_a: List[Optional[int]]) -> Tuple[int, ...]:
+        """Indices that are not mapped back to themselves via a_to_b, b_to_a.
+        """
+        a_to_b = np.array([-1 if i is None else i for i in a_to_b], dtype=int)
+        b_to_a = np.array([-1 if i is None else i for i in b_to_a], dtype=int)
+        round_trip = np.full(len(a_to_b), -1)
+        mapped = a_to_b >= 0
+        round_trip[mapped] = b_to_a[a_to_b[mapped]]
+        return tuple(np.flatnonzero(round_trip != np.arange(len(a_to_b)))
+                     .tolist())
 
     @property
-    def atom_mapping(self):
-        return {d: p for d, p in enumerate(self.d_to_p)
-                if d not in self.inserted_indices}
+    def atom_mapping(self) -> Mapping[int, int]:
+        """Read-only mapping from defect to perfect atom indices."""
+        return self._atom_mapping
 
     def _atom_projection(self, structure_from, structure_to, specie=True):
-        result = []
-        for site in structure_from:
-            distances = Distances(structure_to,
-                                  site.frac_coords,
-                                  self.dist_tol)
-            specie = site.specie if specie else None
-            result.append(distances.atom_idx_at_center(specie=specie))
-        return result
+        species = structure_from.species if specie else None
+        return nearest_site_indices(structure_to, structure_from.frac_coords,
+                                    self.dist_tol, species)
 
     def make_p_to_d(self):
         return self._atom_projection(
@@ -51,33 +69,19 @@ class DefectStructureComparator:
             self._defect_structure, self._perfect_structure)
 
     @property
-    def removed_indices(self):
-        result = []
-        for p, d in enumerate(self.p_to_d):
-            try:
-                if self.d_to_p[d] != p:
-                    result.append(p)
-            except (IndexError, TypeError):
-                result.append(p)
-        return sorted(result)
+    def removed_indices(self) -> List[int]:
+        return list(self._removed_indices)
 
     @property
-    def inserted_indices(self):
-        result = []
-        for d, p in enumerate(self.d_to_p):
-            try:
-                if self.p_to_d[p] != d:
-                    result.append(d)
-            except (IndexError, TypeError):
-                result.append(d)
-        return sorted(result)
+    def inserted_indices(self) -> List[int]:
+        return list(self._inserted_indices)
 
     @property
     def defect_center_coord(self):
         coords = []
-        for v in self.removed_indices:
+        for v in self._removed_indices:
             coords.append(self._perfect_structure[v].frac_coords)
-        for i in self.inserted_indices:
+        for i in self._inserted_indices:
             coords.append(self._defect_structure[i].frac_coords)
 
         lattice = self._perfect_structure.lattice
@@ -89,15 +93,12 @@ class DefectStructureComparator:
         return np.average(translated_coords, axis=0) % 1
 
     def neighboring_atom_indices(self, cutoff_factor=None):
-        distances = []
-        for v in self.removed_indices:
-            distances.append(Distances(self._defect_structure,
-                                       self._perfect_structure[v].frac_coords,
-                                       self.dist_tol))
-        for i in self.inserted_indices:
-            distances.append(Distances(self._defect_structure,
-                                       self._defect_structure[i].frac_coords,
-                                       self.dist_tol))
+        centers = [self._perfect_structure[v].frac_coords
+                   for v in self._removed_indices]
+        centers.extend(self._defect_structure[i].frac_coords
+                       for i in self._inserted_indices)
+        distances = Distances.many(self._defect_structure, centers,
+                                   self.dist_tol) if centers else []
         result = set()
         for d in distances:
             result.update(d.coordination(cutoff_factor=cutoff_factor)
@@ -106,9 +107,9 @@ class DefectStructureComparator:
 
     def make_site_diff(self):
         removed_sites = [self._perfect_structure[x]
-                         for x in self.removed_indices]
+                         for x in self._removed_indices]
         inserted_sites = [self._defect_structure[x]
-                          for x in self.inserted_indices]
+                          for x in self._inserted_indices]
 
         try:
             removed_str = Structure.from_sites(removed_sites)
@@ -127,15 +128,15 @@ class DefectStructureComparator:
             r_to_i = [None]*len(removed_sites)
             i_to_r = [None]*len(inserted_sites)
 
-        mapping, removed_mapping, inserted_mapping = [], [], []
+        mapping, removed_mapping, inserted_mapping = [], set(), set()
         for x, y in enumerate(r_to_i):
             if y and x == i_to_r[y]:
-                mapping.append((self.removed_indices[x], self.inserted_indices[y]))
-                removed_mapping.append(self.removed_indices[x])
-                inserted_mapping.append(self.inserted_indices[y])
+                mapping.append((self._removed_indices[x], self._inserted_indices[y]))
+                removed_mapping.add(self._removed_indices[x])
+                inserted_mapping.add(self._inserted_indices[y])
 
         removed, removed_by_sub = [], []
-        for idx in self.removed_indices:
+        for idx in self._removed_indices:
             site = self._perfect_structure[idx]
             frac_coords = tuple([float(fc) for fc in site.frac_coords])
             val = idx, site.species_string, frac_coords
@@ -145,7 +146,7 @@ class DefectStructureComparator:
                 removed.append(val)
 
         inserted, inserted_by_sub = [], []
-        for idx in self.inserted_indices:
+        for idx in self._inserted_indices:
             site = self._defect_structure[idx]
             frac_coords = tuple([float(fc) for fc in site.frac_coords])
             val = idx, site.species_string, frac_coords
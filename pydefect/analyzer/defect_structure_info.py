@@ -6,10 +6,10 @@ from typing import Optional, List, Tuple
 from monty.json import MSONable
 from pydefect.analyzer.defect_structure_comparator import \
     SiteDiff, SiteInfo
+from pydefect.database.database import is_proper_subgroup
 from pydefect.defaults import defaults
 from pydefect.util.coords import pretty_coords
 from pymatgen.core import Structure
-from pymatgen.symmetry.groups import SpaceGroup
 from tabulate import tabulate
 from vise.util.enum import ExtendedEnum
 from vise.util.logger import get_logger
@@ -58,6 +58,8 @@ def unique_point_group(pg):
         return "mm2"
     if result == "-4m2":
         return "-42m"
+    if result == "-62m":
+        return "-6m2"
     if result == "m3":
         return "m-3"
     return result
@@ -82,21 +84,17 @@ class Displacement(MSONable):
 
 
 def symmetry_relation(initial_point_group, final_point_group):
-    """ Check the point group symmetry relation using the space group relation
-    implemented in pymatgen.
+    """ Check the point group symmetry relation using the subgroup table in
+    pydefect/database/point_group.yaml, which is the same as the space group
+    relation implemented in pymatgen.
     """
-    if initial_point_group in ["3m", "-3m"]:
-        initial_point_group += "1"
-    if final_point_group in ["3m", "-3m"]:
-        final_point_group += "1"
-
-    initial = SpaceGroup(f"P{initial_point_group}")
-    final = SpaceGroup(f"P{final_point_group}")
+    initial = unique_point_group(initial_point_group)
+    final = unique_point_group(final_point_group)
     if initial == final:
         return SymmRelation.same
-    elif final.is_subgroup(initial):
+    elif is_proper_subgroup(final, initial):
         return SymmRelation.subgroup
-    elif final.is_supergroup(initial):
+    elif is_proper_subgroup(initial, final):
         return SymmRelation.supergroup
     else:
         return SymmRelation.another
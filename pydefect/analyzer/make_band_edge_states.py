@@ -2,106 +2,128 @@
 #  Copyright (c) 2020. Distributed under the terms of the MIT License.
 from collections import defaultdict
 from itertools import zip_longest
-from typing import List, Tuple
+from typing import Dict, List, Tuple
 
 import numpy as np
 from pydefect.analyzer.band_edge_states import BandEdgeOrbitalInfos, \
-    PerfectBandEdgeState, BandEdgeStates, EdgeInfo, OrbitalInfo, \
-    LocalizedOrbital, BandEdgeState
+    PerfectBandEdgeState, BandEdgeStates, EdgeInfo, LocalizedOrbital, \
+    BandEdgeState
 from pydefect.analyzer.defect_charge_info import DefectChargeInfo
 from pydefect.defaults import defaults
 
 
-def get_similar_orb_idx(orbs: List[OrbitalInfo],
+def orbital_diffs(orbitals: np.ndarray,
+                  elements: List[str],
+                  orbital: Dict[str, List[float]]) -> np.ndarray:
+    """Sums of absolute differences of orbital weights from those of orbital.
+
+    orbitals: [band-idx, element-idx, l]
+    The result is the same as that of orbital_diff for each band.
+    """
+    extra = [e for e in orbital if e not in elements]
+    num_l = max([orbitals.shape[-1]] + [len(v) for v in orbital.values()])
+    padded = np.zeros((len(orbitals), len(elements) + len(extra), num_l))
+    padded[:, :len(elements), :orbitals.shape[-1]] = orbitals
+
+    reference = np.zeros(padded.shape[1:])
+    for i, e in enumerate(elements + extra):
+        weights = orbital.get(e, [])
+        reference[i, :len(weights)] = weights
+    return np.abs(padded - reference).sum(axis=(1, 2))
+
+
+def get_similar_orb_idx(energies: np.ndarray,
+                        orbitals: np.ndarray,
+                        elements: List[str],
                         edge_info: EdgeInfo,
                         localized_orbs: List[int] = None,
                         _reversed: bool = False) -> Tuple[int, float]:
-    if _reversed:
-        orbs = orbs[::-1]  # by band
+    """Index of the band similar to the edge at a k-point.
 
-    de = defaults.similar_energy_criterion
+    energies: [band-idx]
+    orbitals: [band-idx, element-idx, l]
 
-    if localized_orbs:
-        if _reversed:
-            localized_orbs = [len(orbs) - i for i in localized_orbs]
+    Bands are searched upward, or downward when _reversed, and the first
+    band of which the energy is beyond that of the edge minus (plus)
+    similar_energy_criterion and the orbital difference is less than
+    similar_orb_criterion is returned. Bands on the other side of the
+    localized orbitals are not considered.
+    """
+    de = defaults.similar_energy_criterion
+    diffs = orbital_diffs(orbitals, elements, edge_info.orbitals)
+    band_indices = np.arange(len(energies))
 
-        def is_passed(idx):
-            return idx <= max(localized_orbs) - 1
+    if _reversed:
+        candidates = energies - de < edge_info.energy
+        if localized_orbs:
+            candidates &= band_indices < min(localized_orbs)
     else:
-        def is_passed(idx):
-            return False
-
-    for i, orb in enumerate(orbs):
-        if is_passed(i):
-            continue
-
-        if ((_reversed is False and orb.energy > edge_info.energy - de) or
-                (_reversed and orb.energy - de < edge_info.energy)):
-
-            orb_diff = orbital_diff(orb.orbitals, edge_info.orbitals)
-            if orb_diff < defaults.similar_orb_criterion:
-                orb_idx = len(orbs) - i - 1 if _reversed else i
-                return orb_idx, orb_diff
-    raise ValueError(f"Similar orbital to the edge are not found.\n"
-                     f"Energy criterion: {defaults.similar_energy_criterion}\n"
-                     f"Orbital criterion: {defaults.similar_orb_criterion}\n"
-                     f"Try to lower the criterion.")
-
-
-def get_localized_orbs(orb_info_by_spin: List[List[OrbitalInfo]],
-                       loc_band_index_range: List[int],
-                       lowest_band_idx: int,
-                       weights: List[float]):
-    start = loc_band_index_range[0] - lowest_band_idx
-    end = loc_band_index_range[1] + 1 - lowest_band_idx
-    orbs_by_band_by_kpt = np.array(orb_info_by_spin)[:, start: end].T
+        candidates = energies > edge_info.energy - de
+        if localized_orbs:
+            candidates &= band_indices >= max(localized_orbs)
+    candidates &= diffs < defaults.similar_orb_criterion
+
+    found = np.flatnonzero(candidates)
+    if len(found) == 0:
+        raise ValueError(
+            f"Similar orbital to the edge are not found.\n"
+            f"Energy criterion: {defaults.similar_energy_criterion}\n"
+            f"Orbital criterion: {defaults.similar_orb_criterion}\n"
+            f"Try to lower the criterion.")
+    orb_idx = int(found[-1] if _reversed else found[0])
+    return orb_idx, float(diffs[orb_idx])
+
+
+def get_localized_orbs(orbital_infos: BandEdgeOrbitalInfos,
+                       spin_idx: int,
+                       loc_band_index_range: List[int]
+                       ) -> List[LocalizedOrbital]:
+    """Localized orbitals with the quantities averaged over k-points. """
+    lowest_band_idx = orbital_infos.lowest_band_index
+    bands = slice(loc_band_index_range[0] - lowest_band_idx,
+                  loc_band_index_range[1] + 1 - lowest_band_idx)
+    weights = np.array(orbital_infos.kpt_weights, dtype=float)
+
+    energies = orbital_infos.energies[spin_idx, :, bands] \
+        + orbital_infos.eigval_shift
+    ave_energies = weights @ energies
+    occupations = weights @ orbital_infos.occupations[spin_idx, :, bands]
+    orbitals = np.einsum("k,kbel->bel", weights,
+                         orbital_infos.orbitals[spin_idx, :, bands])
+    p_ratios = [None] * len(ave_energies)
+    if orbital_infos.participation_ratios is not None:
+        p_ratios = [None if np.isnan(p) else float(p) for p in
+                    weights @ orbital_infos.participation_ratios[spin_idx,
+                                                                 :, bands]]
 
     result = []
-    for i, orbs_by_kpt in enumerate(orbs_by_band_by_kpt, loc_band_index_range[0]):
-        def get_ave(key):
-            try:
-                return sum([getattr(orb, key) * w for orb, w in zip(orbs_by_kpt, weights)])
-            except TypeError:
-                return None
-
-        orbs = defaultdict(list)
-        for orb, w in zip(orbs_by_kpt, weights):
-            for elem, contrb in orb.orbitals.items():
-                for y, c in enumerate(contrb):
-                    try:
-                        orbs[elem][y] += c*w
-                    except IndexError:
-                        orbs[elem].append(0.0)
-                        orbs[elem][y] += c*w
-
+    for i, band_idx in enumerate(range(loc_band_index_range[0],
+                                       loc_band_index_range[1] + 1)):
         result.append(LocalizedOrbital(
-            band_idx=i,
-            ave_energy=get_ave("energy"),
-            occupation=get_ave("occupation"),
-            orbitals=dict(orbs),
-            participation_ratio=get_ave("participation_ratio")))
+            band_idx=band_idx,
+            ave_energy=float(ave_energies[i]),
+            occupation=float(occupations[i]),
+            orbitals={e: o.tolist()
+                      for e, o in zip(orbital_infos.elements, orbitals[i])},
+            participation_ratio=p_ratios[i]))
     return result
 
 
-def num_electron_in_cbm(orb_info_by_spin: List[List[OrbitalInfo]],
+def num_electron_in_cbm(occupations: np.ndarray,
                         cbm_idx: int,
-                        weights: List[float]):
-    result = 0.0
-    orbs_by_band_by_kpt = np.array(orb_info_by_spin)[:, cbm_idx:].T
-    for orbs_by_kpt in orbs_by_band_by_kpt:
-        result += sum([o.occupation * w for o, w in zip(orbs_by_kpt, weights)])
-    return result
+                        weights: List[float]) -> float:
+    """occupations: [k-idx, band-idx] """
+    occupations = np.asarray(occupations)
+    return float(np.dot(weights, occupations[:, cbm_idx:].sum(axis=1)))
 
 
-def num_hole_in_vbm(orb_info_by_spin: List[List[OrbitalInfo]],
+def num_hole_in_vbm(occupations: np.ndarray,
                     vbm_idx: int,
-                    weights: List[float]):
-    result = 0.0
-    orbs_by_band_by_kpt = np.array(orb_info_by_spin)[:, :vbm_idx + 1].T
-    for orbs_by_kpt in orbs_by_band_by_kpt:
-        result += sum([(1 - o.occupation) * w
-                       for o, w in zip(orbs_by_kpt, weights)])
-    return result
+                    weights: List[float]) -> float:
+    """occupations: [k-idx, band-idx] """
+    occupations = np.asarray(occupations)
+    return float(np.dot(weights,
+                        (1 - occupations[:, :vbm_idx + 1]).sum(axis=1)))
 
 
 def make_band_edge_states(orbital_infos: BandEdgeOrbitalInfos,
@@ -117,38 +139,43 @@ def make_band_edge_states(orbital_infos: BandEdgeOrbitalInfos,
 
     states = []
     lowest_idx = orbital_infos.lowest_band_index
+    energies = orbital_infos.energies + orbital_infos.eigval_shift
+    elements = orbital_infos.elements
 
-    for spin_idx, orb_info_by_spin \
-            in enumerate(orbital_infos.shifted_orbital_infos):
+    for spin_idx in range(len(energies)):
         if defect_charge_info:
             localized_orbs = defect_charge_info.localized_orbitals()[spin_idx]
             localized_orbs = [i - lowest_idx for i in localized_orbs]
         else:
             localized_orbs = None
 
-        vbm_idx, vbm_diff = get_similar_orb_idx(orb_info_by_spin[vbm_k_idx],
-                                                p_vbm_info, localized_orbs,
-                                                _reversed=True)
+        vbm_idx, vbm_diff = get_similar_orb_idx(
+            energies[spin_idx, vbm_k_idx],
+            orbital_infos.orbitals[spin_idx, vbm_k_idx], elements,
+            p_vbm_info, localized_orbs, _reversed=True)
         vbm_info = EdgeInfo(band_idx=vbm_idx + lowest_idx,
                             kpt_coord=p_vbm_info.kpt_coord,
-                            orbital_info=orb_info_by_spin[vbm_k_idx][vbm_idx])
+                            orbital_info=orbital_infos.orbital_info(
+                                spin_idx, vbm_k_idx, vbm_idx, shifted=True))
 
-        cbm_idx, cbm_diff = get_similar_orb_idx(orb_info_by_spin[cbm_k_idx],
-                                                p_cbm_info, localized_orbs)
+        cbm_idx, cbm_diff = get_similar_orb_idx(
+            energies[spin_idx, cbm_k_idx],
+            orbital_infos.orbitals[spin_idx, cbm_k_idx], elements,
+            p_cbm_info, localized_orbs)
         cbm_info = EdgeInfo(band_idx=cbm_idx + lowest_idx,
                             kpt_coord=p_cbm_info.kpt_coord,
-                            orbital_info=orb_info_by_spin[cbm_k_idx][cbm_idx])
+                            orbital_info=orbital_infos.orbital_info(
+                                spin_idx, cbm_k_idx, cbm_idx, shifted=True))
 
         loc_idx_range = [vbm_info.band_idx + 1, cbm_info.band_idx - 1]
-        localized_orbs = get_localized_orbs(orb_info_by_spin,
-                                            loc_idx_range,
-                                            orbital_infos.lowest_band_index,
-                                            orbital_infos.kpt_weights)
+        localized_orbs = get_localized_orbs(orbital_infos, spin_idx,
+                                            loc_idx_range)
 
-        vbm_hole = num_hole_in_vbm(orb_info_by_spin,
+        occupations = orbital_infos.occupations[spin_idx]
+        vbm_hole = num_hole_in_vbm(occupations,
                                    vbm_idx=vbm_idx,
                                    weights=orbital_infos.kpt_weights)
-        cbm_electron = num_electron_in_cbm(orb_info_by_spin,
+        cbm_electron = num_electron_in_cbm(occupations,
                                            cbm_idx=cbm_idx,
                                            weights=orbital_infos.kpt_weights)
 
@@ -1,9 +1,16 @@
-from typing import List, Tuple
+import json
+from collections import Counter
+from pathlib import Path
+from typing import List, Tuple, Dict
 
-from pydefect.analyzer.calc_results import CalcResults
+from monty.serialization import loadfn, dumpfn
+from pydefect.analyzer.calc_results import CalcResults, check_convergence
 from pydefect.analyzer.calc_summary import CalcSummary, SingleCalcSummary
-from pydefect.analyzer.defect_structure_info import DefectStructureInfo
-from pydefect.analyzer.make_defect_energy_info import num_atom_differences
+from pydefect.analyzer.defect_structure_comparator import SiteDiff
+from pydefect.analyzer.defect_structure_info import DefectStructureInfo, \
+    symmetry_relation, judge_defect_type
+from pydefect.analyzer.make_defect_energy_info import num_atom_differences, \
+    num_atom_differences_from_compositions
 from pydefect.defaults import defaults
 from pydefect.input_maker.defect_entry import DefectEntry
 
@@ -35,3 +42,127 @@ def make_single_calc_summary(calc_results, entry, p_calc_results, str_info):
         defect_type=str(str_info.defect_type),
         symm_relation=str(str_info.symm_relation))
 
+
+input_filenames = ["calc_results.json", "defect_entry.json",
+                   "defect_structure_info.json"]
+
+
+def input_stamp(_dir: Path) -> List[List[int]]:
+    """Modification times and sizes of the input files in a directory. """
+    result = []
+    for filename in input_filenames:
+        stat = (_dir / filename).stat()
+        result.append([stat.st_mtime_ns, stat.st_size])
+    return result
+
+
+def _load_json(filename: Path) -> dict:
+    """Raw dict of a json file without constructing the objects. """
+    with open(filename) as f:
+        return json.load(f)
+
+
+def _composition(structure_dict: dict) -> Dict[str, float]:
+    result = Counter()
+    for site in structure_dict["sites"]:
+        for specie in site["species"]:
+            result[specie["element"]] += specie["occu"]
+    return dict(result)
+
+
+def make_single_calc_summary_from_dir(_dir: Path,
+                                      p_calc_results: CalcResults
+                                      ) -> Tuple[str, SingleCalcSummary]:
+    """Same as make_single_calc_summary, but only the required fields are
+    read from the json files, e.g., structures are not constructed.
+    """
+    calc_results = _load_json(_dir / "calc_results.json")
+    entry = _load_json(_dir / "defect_entry.json")
+    str_info = _load_json(_dir / "defect_structure_info.json")
+
+    atom_io = num_atom_differences_from_compositions(
+        _composition(calc_results["structure"]),
+        p_calc_results.structure.composition.as_dict())
+
+    relative_energy = calc_results["energy"] - p_calc_results.energy
+    is_energy_strange = abs(relative_energy) > defaults.abs_strange_energy
+    site_diff = SiteDiff.from_dict(str_info["site_diff"])
+    site_diff_from_initial = SiteDiff.from_dict(
+        str_info["site_diff_from_initial"])
+    symm_relation = symmetry_relation(str_info["initial_site_sym"],
+                                      str_info["final_site_sym"])
+    full_name = "_".join([entry["name"], str(entry["charge"])])
+    return full_name, SingleCalcSummary(
+        charge=entry["charge"],
+        atom_io=atom_io,
+        electronic_conv=calc_results["electronic_conv"],
+        ionic_conv=calc_results["ionic_conv"],
+        is_energy_strange=is_energy_strange,
+        same_config_from_init=site_diff_from_initial.is_no_diff,
+        defect_type=str(judge_defect_type(site_diff)),
+        symm_relation=str(symm_relation))
+
+
+class CalcSummaryBuilder:
+    """Build CalcSummary directory by directory.
+
+    The summaries of the directories whose input files are unchanged since
+    the last run are reused, which is judged from the modification times
+    and sizes stored in the stamp file next to the calc summary file. All the
+    summaries are rebuilt when the perfect supercell or the defaults used in
+    the summaries, e.g., abs_strange_energy, are changed.
+    """
+    def __init__(self,
+                 p_calc_results: CalcResults,
+                 filename: str = "calc_summary.json",
+                 check_calc_results: bool = False):
+        self.p_calc_results = p_calc_results
+        self.filename = Path(filename)
+        self.stamp_filename = \
+            self.filename.with_name(f"{self.filename.stem}_stamps.json")
+        self.check_calc_results = check_calc_results
+        self.single_summaries: Dict[str, SingleCalcSummary] = {}
+        self._stamps = {}
+        self._perfect_key = \
+            [p_calc_results.energy,
+             sorted(p_calc_results.structure.composition.as_dict().items())]
+        self._defaults_key = \
+            {"abs_strange_energy": defaults.abs_strange_energy}
+        self._prev_summaries, self._prev_stamps = self._load_previous()
+
+    def _load_previous(self):
+        try:
+            stamps = _load_json(self.stamp_filename)
+            summaries = loadfn(self.filename).single_summaries
+        except FileNotFoundError:
+            return {}, {}
+        # tuples are stored as lists in json.
+        if stamps.get("perfect") != json.loads(json.dumps(self._perfect_key)) \
+                or stamps.get("defaults") != self._defaults_key:
+            return {}, {}
+        return summaries, stamps["dirs"]
+
+    def add_dir(self, _dir: Path) -> str:
+        stamp = input_stamp(_dir)
+        prev = self._prev_stamps.get(str(_dir))
+        if prev and prev["stamp"] == stamp \
+                and prev["name"] in self._prev_summaries:
+            name, summary = prev["name"], self._prev_summaries[prev["name"]]
+        else:
+            name, summary = make_single_calc_summary_from_dir(
+                _dir, self.p_calc_results)
+        check_convergence(summary, _dir, self.check_calc_results)
+        self.single_summaries[name] = summary
+        self._stamps[str(_dir)] = {"name": name, "stamp": stamp}
+        return name
+
+    @property
+    def calc_summary(self) -> CalcSummary:
+        return CalcSummary(single_summaries=self.single_summaries)
+
+    def to_json_files(self) -> None:
+        self.calc_summary.to_json_file(str(self.filename))
+        dumpfn({"perfect": self._perfect_key,
+                "defaults": self._defaults_key,
+                "dirs": self._stamps},
+               self.stamp_filename)
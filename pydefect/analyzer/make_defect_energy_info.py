@@ -41,9 +41,15 @@ def make_defect_energy_info(defect_entry: DefectEntry,
 def num_atom_differences(structure: IStructure,
                          ref_structure: IStructure,
                          ) -> Dict[str, int]:
-    target_composition = defaultdict(float, **structure.composition.as_dict())
-    reference_composition = defaultdict(float,
-                                        **ref_structure.composition.as_dict())
+    return num_atom_differences_from_compositions(
+        structure.composition.as_dict(), ref_structure.composition.as_dict())
+
+
+def num_atom_differences_from_compositions(composition: Dict[str, float],
+                                           ref_composition: Dict[str, float]
+                                           ) -> Dict[str, int]:
+    target_composition = defaultdict(float, **composition)
+    reference_composition = defaultdict(float, **ref_composition)
     result = {}
     for k in set(target_composition.keys()) | set(reference_composition.keys()):
         n_atom_diff = int(target_composition[k] - reference_composition[k])
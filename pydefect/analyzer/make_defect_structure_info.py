@@ -1,8 +1,7 @@
 # -*- coding: utf-8 -*-
 #  Copyright (c) 2020 Kumagai group.
 import math
-import warnings
-from typing import List, Tuple
+from typing import List, Optional
 
 import numpy as np
 from pydefect.analyzer.defect_structure_comparator import \
@@ -10,22 +9,15 @@ from pydefect.analyzer.defect_structure_comparator import \
 from pydefect.analyzer.defect_structure_info import Displacement, \
     DefectStructureInfo, unique_point_group
 from pydefect.defaults import defaults
-from pymatgen.core import PeriodicSite, Structure
+from pydefect.util.structure_tools import min_image_vectors
+from pydefect.util.symmetry_cache import get_symmetry_data
+from pymatgen.core import Structure
 from vise.util.logger import get_logger
-from vise.util.structure_symmetrizer import StructureSymmetrizer
-from vise.util.typing import GenCoords
 
 
 logger = get_logger(__name__)
 
 
-def folded_coords(site: PeriodicSite,
-                  center: GenCoords
-                  ) -> GenCoords:
-    _, image = site.distance_and_image_from_frac_coords(center)
-    return tuple(site.frac_coords - image)
-
-
 class MakeDefectStructureInfo:
     def __init__(self,
                  perfect: Structure,
@@ -86,14 +78,12 @@ class MakeDefectStructureInfo:
         return self._unique_point_group(self.final)
 
     def _unique_point_group(self, structure):
-        symmetrizer = StructureSymmetrizer(structure, self.symprec)
-        return unique_point_group(symmetrizer.point_group)
+        point_group = get_symmetry_data(structure, self.symprec).point_group
+        return unique_point_group(point_group)
 
     def _calc_drift(self) -> None:
-        distances = []
-        for site in self.final:
-            distances.append(
-                site.distance_and_image_from_frac_coords(self._orig_center)[0])
+        _, distances, _ = min_image_vectors(
+            self.lattice, self.final.frac_coords, self._orig_center)
 
         self._anchor_atom_idx = int(np.argmax(distances))
         p_anchor_atom_idx = self._orig_comp.d_to_p[self._anchor_atom_idx]
@@ -111,51 +101,60 @@ class MakeDefectStructureInfo:
         self._drift_vector = tuple(d_site.frac_coords - p_coords - image)
 
     def calc_displacements(self):
-        result = []
         atom_mapping = self.comp_w_init.atom_mapping
-        for d in range(len(self.shifted_final)):
-            if d not in atom_mapping:
-                result.append(None)
-            else:
-                p = atom_mapping[d]
-                p_elem = str(self.initial[p].specie)
-                d_elem = str(self.shifted_final[d].specie)
-                if p_elem != d_elem:
-                    result.append(None)
-                    continue
-                initial_pos = folded_coords(self.initial[p], self.center)
-                final_pos = folded_coords(self.shifted_final[d], initial_pos)
-
-                initial_pos_vec = self.lattice.get_cartesian_coords(
-                    np.array(initial_pos) - self.center)
-                initial_dist = np.linalg.norm(initial_pos_vec)
-
-                disp_dist, t = self.lattice.get_distance_and_image(
-                    self.shifted_final.frac_coords[d], self.initial.frac_coords[p])
-                disp_vec = self.lattice.get_cartesian_coords(
-                    self.shifted_final.frac_coords[d] - self.initial.frac_coords[p] - t)
-
-                angle = self.calc_disp_angle(disp_dist, disp_vec, initial_dist,
-                                             initial_pos_vec)
-
-                result.append(Displacement(specie=p_elem,
-                                           original_pos=initial_pos,
-                                           final_pos=final_pos,
-                                           distance_from_defect=initial_dist,
-                                           disp_vector=tuple(disp_vec),
-                                           displace_distance=disp_dist,
-                                           angle=angle))
+        ds, ps = [], []
+        for d, p in atom_mapping.items():
+            if str(self.initial[p].specie) == str(self.shifted_final[d].specie):
+                ds.append(d)
+                ps.append(p)
+        result = [None] * len(self.shifted_final)
+        if not ds:
+            return result
+
+        initial_coords = self.initial.frac_coords[ps]
+        final_coords = self.shifted_final.frac_coords[ds]
+        _, _, images = min_image_vectors(self.lattice, initial_coords,
+                                         self.center)
+        initial_pos = initial_coords - images
+        _, _, images = min_image_vectors(self.lattice, final_coords,
+                                         initial_pos)
+        final_pos = final_coords - images
+
+        initial_pos_vecs = self.lattice.get_cartesian_coords(
+            initial_pos - self.center)
+        initial_dists = np.linalg.norm(initial_pos_vecs, axis=1)
+
+        _, disp_dists, t = min_image_vectors(self.lattice, final_coords,
+                                             initial_coords)
+        disp_vecs = self.lattice.get_cartesian_coords(
+            final_coords - initial_coords - t)
+        angles = self.calc_disp_angles(disp_dists, disp_vecs, initial_dists,
+                                       initial_pos_vecs)
+
+        for i, (d, p) in enumerate(zip(ds, ps)):
+            result[d] = Displacement(specie=str(self.initial[p].specie),
+                                     original_pos=tuple(initial_pos[i]),
+                                     final_pos=tuple(final_pos[i]),
+                                     distance_from_defect=initial_dists[i],
+                                     disp_vector=tuple(disp_vecs[i]),
+                                     displace_distance=disp_dists[i],
+                                     angle=angles[i])
         return result
 
     @staticmethod
-    def calc_disp_angle(disp_dist, disp_vec, ini_dist, initial_pos_vec):
-        inner_prod = sum(initial_pos_vec * disp_vec)
-        with warnings.catch_warnings():
-            warnings.simplefilter("ignore")
-            # ignore "RuntimeWarning: invalid value encountered in double_scalars"
-            cos = round(inner_prod / (ini_dist * disp_dist), 10)
-        result = float(round(180 * (1 - np.arccos(cos) / np.pi), 1))
-        if math.isnan(result):
-            result = None
-        return result
+    def calc_disp_angles(disp_dists, disp_vecs, ini_dists, initial_pos_vecs
+                         ) -> List[Optional[float]]:
+        inner_prods = np.sum(initial_pos_vecs * disp_vecs, axis=1)
+        # ignore "RuntimeWarning: invalid value encountered in divide"
+        with np.errstate(invalid="ignore", divide="ignore"):
+            cos = np.round(inner_prods / (ini_dists * disp_dists), 10)
+            angles = np.round(180 * (1 - np.arccos(cos) / np.pi), 1)
+        return [None if math.isnan(a) else float(a) for a in angles]
 
+    @staticmethod
+    def calc_disp_angle(disp_dist, disp_vec, ini_dist, initial_pos_vec
+                        ) -> Optional[float]:
+        """calc_disp_angles for a single site. """
+        return MakeDefectStructureInfo.calc_disp_angles(
+            np.array([disp_dist]), np.array([disp_vec]), np.array([ini_dist]),
+            np.array([initial_pos_vec]))[0]
@@ -6,15 +6,15 @@ from numpy.linalg import inv
 from pydefect.analyzer.defect_structure_info import logger
 from pydefect.defaults import defaults
 from pymatgen.core import Structure
-from vise.util.structure_symmetrizer import StructureSymmetrizer
+from pydefect.util.symmetry_cache import get_symmetrizer
 
 
 def refine_defect_structure(structure: Structure,
                             anchor_atom_index: int = None,
                             anchor_atom_coords: np.ndarray = None):
-    symmetrizer = StructureSymmetrizer(structure,
-                                       defaults.symmetry_length_tolerance,
-                                       defaults.symmetry_angle_tolerance)
+    symmetrizer = get_symmetrizer(structure,
+                                  defaults.symmetry_length_tolerance,
+                                  defaults.symmetry_angle_tolerance)
     result = structure.copy()
     spglib_data = symmetrizer.spglib_sym_data
 
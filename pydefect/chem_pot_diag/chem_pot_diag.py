@@ -12,7 +12,6 @@ import yaml
 from monty.json import MSONable
 from monty.serialization import loadfn
 from pydefect.error import PydefectError
-from pymatgen.analysis.phase_diagram import PhaseDiagram, PDEntry
 from pymatgen.core import Composition
 from scipy.spatial.qhull import HalfspaceIntersection
 from tabulate import tabulate
@@ -99,7 +98,9 @@ class CompositionEnergies(ToYamlFileMixIn, dict):
 
         return std, rel
 
-    def to_phase_diagram(self, elements=None):
+    def to_phase_diagram(self, elements=None) -> "PhaseDiagram":
+        # phase_diagram module imports matplotlib, so imported here.
+        from pymatgen.analysis.phase_diagram import PhaseDiagram, PDEntry
         entries = []
         for k, v in self.items():
             entries.append(PDEntry(k, v.energy))
@@ -153,7 +154,8 @@ def target_element_chem_pot(comp: Union[Composition, str],
 
 class RelativeEnergies(CpdAbstractEnergies):
     @property
-    def phase_diagram(self) -> PhaseDiagram:
+    def phase_diagram(self) -> "PhaseDiagram":
+        from pymatgen.analysis.phase_diagram import PhaseDiagram, PDEntry
         entries = [PDEntry(Composition(comp_name), e)
                    for comp_name, e in self.items()]
         return PhaseDiagram(entries=entries)
@@ -3,26 +3,21 @@
 
 import argparse
 import sys
-import warnings
 from pathlib import Path
 
-from monty.serialization import loadfn
 from pydefect import __version__
-from pydefect.analyzer.unitcell import Unitcell
-from pydefect.chem_pot_diag.chem_pot_diag import StandardEnergies
-from pydefect.cli.main_functions import plot_defect_energy, \
-    make_standard_and_relative_energies, make_cpd_and_vertices, \
-    plot_chem_pot_diag, make_supercell, append_interstitial_to_supercell_info, \
-    pop_interstitial_from_supercell_info, make_defect_set, \
-    make_efnv_correction_main_func, make_band_edge_states_main_func, \
-    make_defect_energy_infos_main_func, make_defect_energy_summary_main_func, \
-    calc_defect_structure_info, make_calc_summary_main_func
-from pydefect.cli.main_tools import str_int_to_int
+from pydefect.cli.main_tools import str_int_to_int, LazyFunction, \
+    LazyVaspFileReader
 from pydefect.defaults import defaults
-from pymatgen.core import IStructure, Structure
-from pymatgen.io.vasp.inputs import UnknownPotcarWarning
 
-warnings.simplefilter('ignore', UnknownPotcarWarning)
+
+# The sub-command functions and the argument converters are imported only
+# when used, to keep the start-up time short.
+loadfn = LazyFunction("monty.serialization:loadfn")
+
+
+def main_func(name: str) -> LazyFunction:
+    return LazyFunction(f"pydefect.cli.main_functions:{name}")
 
 
 description = """pydefect is a package that helps researchers to 
@@ -43,7 +38,8 @@ def add_sub_parser(_argparse, name: str):
             help="Directory paths to be parsed.")
     elif name == "unitcell":
         result.add_argument(
-            "-u", "--unitcell", type=Unitcell.from_yaml, required=True,
+            "-u", "--unitcell", required=True,
+            type=LazyFunction("pydefect.analyzer.unitcell:Unitcell.from_yaml"),
             help="Path to the unitcell.yaml file.")
     elif name == "supercell_info":
         result.add_argument(
@@ -114,7 +110,7 @@ def parse_args_main(args):
         default="composition_energies.yaml",
         help="composition_energies.yaml file name.")
     parser_make_standard_and_relative_energies.set_defaults(
-        func=make_standard_and_relative_energies)
+        func=main_func("make_standard_and_relative_energies"))
 
     # -- make_cpd_and_vertices -------------------------------------------------
     parser_cv = subparsers.add_parser(
@@ -134,7 +130,7 @@ def parse_args_main(args):
         "-e", "--elements", type=str, nargs="+",
         help="Element names considered in chemical potential diagram. Used for "
              "creating the diagram.")
-    parser_cv.set_defaults(func=make_cpd_and_vertices)
+    parser_cv.set_defaults(func=main_func("make_cpd_and_vertices"))
 
     # -- plot_cpd ------------------------------------------------
     parser_pcpd = subparsers.add_parser(
@@ -145,7 +141,7 @@ def parse_args_main(args):
     parser_pcpd.add_argument(
         "-cpd", "--chem_pot_diag", default="chem_pot_diag.json", type=loadfn,
         help="Path to the chem_pot_diag.json file.")
-    parser_pcpd.set_defaults(func=plot_chem_pot_diag)
+    parser_pcpd.set_defaults(func=main_func("plot_chem_pot_diag"))
 
     # -- supercell ------------------------------------------------
     parser_supercell = subparsers.add_parser(
@@ -155,7 +151,8 @@ def parse_args_main(args):
         aliases=['s'])
 
     parser_supercell.add_argument(
-        "-p", "--unitcell", type=IStructure.from_file, required=True,
+        "-p", "--unitcell", required=True,
+        type=LazyVaspFileReader("pymatgen.core:IStructure.from_file"),
         help="Base structure file, which must be the standardized primitive "
              "cell.")
     parser_supercell.add_argument(
@@ -185,7 +182,7 @@ O1:
 Here site_index is based on the given structure.
 """)
 
-    parser_supercell.set_defaults(func=make_supercell)
+    parser_supercell.set_defaults(func=main_func("make_supercell"))
 
     # -- append_interstitial ------------------------------------------------
     parser_append_interstitial = subparsers.add_parser(
@@ -196,7 +193,8 @@ Here site_index is based on the given structure.
         aliases=['ai'])
 
     parser_append_interstitial.add_argument(
-        "-p", "--base_structure", required=True, type=Structure.from_file,
+        "-p", "--base_structure", required=True,
+        type=LazyVaspFileReader("pymatgen.core:Structure.from_file"),
         help="Structure file defining the fractional coordinates such as the "
              "standardized primitive cell.")
     parser_append_interstitial.add_argument(
@@ -208,7 +206,7 @@ Here site_index is based on the given structure.
         help="Information related to the appended interstitial site if exists.")
 
     parser_append_interstitial.set_defaults(
-        func=append_interstitial_to_supercell_info)
+        func=main_func("append_interstitial_to_supercell_info"))
 
     # -- pop_interstitial ------------------------------------------------
     parser_pop_interstitial = subparsers.add_parser(
@@ -226,7 +224,7 @@ Here site_index is based on the given structure.
         help="Pop all interstitials. If this is set, index option is ignored.")
 
     parser_pop_interstitial.set_defaults(
-        func=pop_interstitial_from_supercell_info)
+        func=main_func("pop_interstitial_from_supercell_info"))
 
     # -- defect_set ------------------------------------------------
     parser_defect_set = subparsers.add_parser(
@@ -246,7 +244,7 @@ Here site_index is based on the given structure.
         help="Keywords used to screen the target defects. Since, the re.search "
              "is used inside, Regular expression can be used. ")
 
-    parser_defect_set.set_defaults(func=make_defect_set)
+    parser_defect_set.set_defaults(func=main_func("make_defect_set"))
 
     # -- defect structure info ------------------------------------------------
     parser_defect_structure_info = subparsers.add_parser(
@@ -265,7 +263,8 @@ Here site_index is based on the given structure.
         help="Tolerance for determining point groups in the final "
              "structures. Note that point groups in the initial structures are "
              "set via defect_entry.json files.")
-    parser_defect_structure_info.set_defaults(func=calc_defect_structure_info)
+    parser_defect_structure_info.set_defaults(
+        func=main_func("calc_defect_structure_info"))
 
     # -- efnv correction ------------------------------------------------
     parser_efnv = subparsers.add_parser(
@@ -283,7 +282,18 @@ Here site_index is based on the given structure.
     parser_efnv.add_argument(
         "--calc_all_sites", action="store_true",
         help="Set if one wants to calculate the potential at all the sites.")
-    parser_efnv.set_defaults(func=make_efnv_correction_main_func)
+    parser_efnv.add_argument(
+        "--ewald_cache_dir", type=Path,
+        help="Directory where the Ewald parameters are stored and reused, "
+             "e.g., the one containing supercell_info.json.")
+    parser_efnv.add_argument(
+        "-j", "--jobs", type=int, default=1,
+        help="Number of processes used for parsing the directories.")
+    parser_efnv.add_argument(
+        "--no_plot", dest="plot", action="store_false",
+        help="Set when correction.pdf is not plotted. It can be plotted later "
+             "with plot_batch.")
+    parser_efnv.set_defaults(func=main_func("make_efnv_correction_main_func"))
 
     # -- band edge states ------------------------------------------------
     parser_band_edge_states = subparsers.add_parser(
@@ -293,7 +303,8 @@ Here site_index is based on the given structure.
         formatter_class=argparse.ArgumentDefaultsHelpFormatter,
         aliases=['bes'])
 
-    parser_band_edge_states.set_defaults(func=make_band_edge_states_main_func)
+    parser_band_edge_states.set_defaults(
+        func=main_func("make_band_edge_states_main_func"))
 
     # -- defect energy infos ---------------------------------------------------
     parser_defect_energy_infos = subparsers.add_parser(
@@ -303,11 +314,12 @@ Here site_index is based on the given structure.
         formatter_class=argparse.ArgumentDefaultsHelpFormatter,
         aliases=['dei'])
     parser_defect_energy_infos.add_argument(
-        "-s", "--std_energies", required=True, type=StandardEnergies.from_yaml,
+        "-s", "--std_energies", required=True, type=LazyFunction(
+            "pydefect.chem_pot_diag.chem_pot_diag:StandardEnergies.from_yaml"),
         help="Path to the StandardEnergies.yaml file.")
 
     parser_defect_energy_infos.set_defaults(
-        func=make_defect_energy_infos_main_func)
+        func=main_func("make_defect_energy_infos_main_func"))
 
     # -- defect energy summary -------------------------------------------------
     parser_defect_energy_summary = subparsers.add_parser(
@@ -321,7 +333,7 @@ Here site_index is based on the given structure.
         help="Path to the target_vertices.yaml file.")
 
     parser_defect_energy_summary.set_defaults(
-        func=make_defect_energy_summary_main_func)
+        func=main_func("make_defect_energy_summary_main_func"))
 
     # -- calc summary -------------------------------------------------
     parser_calc_summary = subparsers.add_parser(
@@ -332,7 +344,7 @@ Here site_index is based on the given structure.
         aliases=['cs'])
 
     parser_calc_summary.set_defaults(
-        func=make_calc_summary_main_func)
+        func=main_func("make_calc_summary_main_func"))
 
     # -- plot defect formation energy ------------------------------------------
     parser_plot_energy = subparsers.add_parser(
@@ -354,7 +366,29 @@ Here site_index is based on the given structure.
     parser_plot_energy.add_argument(
         "--plot_all_energies", dest="plot_all_energies", action="store_true",
         help="Plot energies of all charge states including unstable ones.")
-    parser_plot_energy.set_defaults(func=plot_defect_energy)
+    parser_plot_energy.set_defaults(func=main_func("plot_defect_energy"))
+
+    # -- plot batch ------------------------------------------------------------
+    parser_plot_batch = subparsers.add_parser(
+        name="plot_batch",
+        description="Plot correction.pdf and eigenvalues.pdf from "
+                    "correction.json and band_edge_orbital_infos.json "
+                    "in the directories.",
+        parents=dirs_parsers,
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+        aliases=['pb'])
+
+    parser_plot_batch.add_argument(
+        "-pbes", "--p_state", type=loadfn,
+        help="Path to the perfect_band_edge_state.json. Required for plotting "
+             "eigenvalues.")
+    parser_plot_batch.add_argument(
+        "-y", "--y_range", nargs=2, type=float,
+        help="Energy range in y-axis for eigenvalue.pdf")
+    parser_plot_batch.add_argument(
+        "-j", "--jobs", type=int, default=1,
+        help="Number of processes used for plotting.")
+    parser_plot_batch.set_defaults(func=main_func("plot_batch"))
     # ------------------------------------------------------------------------
     return parser.parse_args(args)
 
@@ -1,16 +1,15 @@
 # -*- coding: utf-8 -*-
 #  Copyright (c) 2020 Kumagai group.
+import warnings
+from functools import partial
 from pathlib import Path
 from typing import Union
 
-from matplotlib import pyplot as plt
 from monty.serialization import loadfn
-from pydefect.analyzer.calc_results import CalcResults, NoElectronicConvError, \
-    NoIonicConvError
+from pydefect.analyzer.calc_results import CalcResults, check_convergence
 from pydefect.analyzer.defect_energy import DefectEnergyInfo
-from pydefect.analyzer.defect_energy_plotter import DefectEnergyMplPlotter
 from pydefect.analyzer.make_band_edge_states import make_band_edge_states
-from pydefect.analyzer.make_calc_summary import make_calc_summary
+from pydefect.analyzer.make_calc_summary import CalcSummaryBuilder
 from pydefect.analyzer.make_defect_energy_info import make_defect_energy_info
 from pydefect.analyzer.make_defect_energy_summary import \
     make_defect_energy_summary
@@ -18,24 +17,23 @@ from pydefect.analyzer.make_defect_structure_info import \
     MakeDefectStructureInfo
 from pydefect.chem_pot_diag.chem_pot_diag import CompositionEnergies, \
     RelativeEnergies, ChemPotDiagMaker, TargetVertices, change_element_sequence
-from pydefect.chem_pot_diag.cpd_plotter import ChemPotDiag2DMplPlotter, \
-    ChemPotDiag3DMplPlotter
 from pydefect.cli.main_tools import sanitize_matrix, parse_dirs
 from pydefect.cli.vasp.make_efnv_correction import make_efnv_correction
 from pydefect.corrections.defect_region import FixedDistanceDefectRegion
 from pydefect.corrections.no_correction import NoCorrection
-from pydefect.corrections.site_potential_plotter import SitePotentialMplPlotter
 from pydefect.input_maker.append_interstitial import append_interstitial
 from pydefect.input_maker.defect_set_maker import DefectSetMaker
 from pydefect.input_maker.manual_supercell_maker import ManualSupercellMaker, \
     make_sites_from_yaml_file
 from pydefect.input_maker.supercell_maker import SupercellMaker
-from pymatgen.analysis.phase_diagram import PDPlotter
 from pymatgen.core import Composition
+from pymatgen.io.vasp.inputs import UnknownPotcarWarning
 from vise.util.logger import get_logger
 
 logger = get_logger(__name__)
 
+warnings.simplefilter('ignore', UnknownPotcarWarning)
+
 
 def get_calc_results(d: Path, check: bool) -> Union[CalcResults, bool]:
     try:
@@ -44,16 +42,7 @@ def get_calc_results(d: Path, check: bool) -> Union[CalcResults, bool]:
         logger.warning(f"calc_results.json doesn't exist in {d}.")
         raise
 
-    if calc_results.electronic_conv is False:
-        logger.warning(f"SCF in {d} is not reached.")
-        if check:
-            raise NoElectronicConvError
-
-    elif calc_results.ionic_conv is False:
-        logger.warning(f"Ionic convergence in {d} is not reached.")
-        if check:
-            raise NoIonicConvError
-
+    check_convergence(calc_results, d, check)
     return calc_results
 
 
@@ -64,6 +53,8 @@ def make_standard_and_relative_energies(args):
     std_energies.to_yaml_file()
     rel_energies.to_yaml_file()
     try:
+        from matplotlib import pyplot as plt
+        from pymatgen.analysis.phase_diagram import PDPlotter
         pd = comp_energies.to_phase_diagram()
         plotter = PDPlotter(pd, backend="matplotlib", show_unstable=float("inf"))
         plotter.get_plot(plt=plt)
@@ -95,6 +86,8 @@ def make_cpd_and_vertices(args):
 
 
 def plot_chem_pot_diag(args):
+    from pydefect.chem_pot_diag.cpd_plotter import ChemPotDiag2DMplPlotter, \
+        ChemPotDiag3DMplPlotter
     cpd = args.chem_pot_diag
     cpd = change_element_sequence(cpd)
     if cpd.dim == 2:
@@ -187,28 +180,53 @@ def calc_defect_structure_info(args):
     parse_dirs(args.dirs, _inner, args.verbose, file_name)
 
 
+# Inputs shared by all the directories in make_efnv_correction_main_func,
+# set once per process by _init_efnv_worker.
+_efnv_shared_inputs = {}
+
+
+def _init_efnv_worker(perfect_calc_results: CalcResults,
+                      dielectric_tensor,
+                      **options):
+    _efnv_shared_inputs.update(perfect_calc_results=perfect_calc_results,
+                               dielectric_tensor=dielectric_tensor,
+                               **options)
+
+
+def _make_efnv_correction_in_dir(_dir: Path):
+    inputs = _efnv_shared_inputs
+    calc_results = get_calc_results(_dir, inputs["check_calc_results"])
+    defect_entry = loadfn(_dir / "defect_entry.json")
+    radius = inputs["radius"]
+    defect_region = FixedDistanceDefectRegion(radius) if radius else None
+    efnv = make_efnv_correction(defect_entry.charge,
+                                calc_results,
+                                inputs["perfect_calc_results"],
+                                inputs["dielectric_tensor"],
+                                defect_region=defect_region,
+                                calc_all_sites=inputs["calc_all_sites"],
+                                ewald_cache_dir=inputs["ewald_cache_dir"])
+    efnv.to_json_file(_dir / "correction.json")
+
+    if inputs["plot"]:
+        from pydefect.cli.plot_functions import plot_efnv_correction
+        plot_efnv_correction(efnv, defect_entry.full_name,
+                             _dir / "correction.pdf")
+
+
 def make_efnv_correction_main_func(args):
     file_name = "correction.json"
-    def _inner(_dir: Path):
-        calc_results = get_calc_results(_dir, args.check_calc_results)
-        defect_entry = loadfn(_dir / "defect_entry.json")
-        defect_region = FixedDistanceDefectRegion if args.radius else None
-        efnv = make_efnv_correction(defect_entry.charge,
-                                    calc_results,
-                                    args.perfect_calc_results,
-                                    args.unitcell.dielectric_constant,
-                                    defect_region=defect_region,
-                                    calc_all_sites=args.calc_all_sites)
-        efnv.to_json_file(_dir / file_name)
-
-        title = defect_entry.full_name
-        plotter = SitePotentialMplPlotter.from_efnv_corr(
-            title=title, efnv_correction=efnv)
-        plotter.construct_plot()
-        plotter.plt.savefig(fname=_dir / "correction.pdf")
-        plotter.plt.clf()
-
-    parse_dirs(args.dirs, _inner, args.verbose, file_name)
+    options = dict(check_calc_results=args.check_calc_results,
+                   radius=args.radius,
+                   calc_all_sites=args.calc_all_sites,
+                   ewald_cache_dir=args.ewald_cache_dir,
+                   plot=args.plot)
+    parse_dirs(args.dirs, _make_efnv_correction_in_dir, args.verbose,
+               file_name,
+               jobs=args.jobs,
+               initializer=partial(_init_efnv_worker, **options),
+               initargs=(args.perfect_calc_results,
+                         args.unitcell.dielectric_constant))
 
 
 def make_band_edge_states_main_func(args):
@@ -277,18 +295,14 @@ def make_defect_energy_summary_main_func(args):
 
 
 def make_calc_summary_main_func(args):
-    def _inner(_dir: Path):
-        calc_results = get_calc_results(_dir, args.check_calc_results)
-        defect_entry = loadfn(_dir / "defect_entry.json")
-        str_info = loadfn(_dir / "defect_structure_info.json")
-        return calc_results, defect_entry, str_info
-
-    _infos = parse_dirs(args.dirs, _inner, args.verbose)
-    calc_summary = make_calc_summary(_infos, args.perfect_calc_results)
-    calc_summary.to_json_file()
+    builder = CalcSummaryBuilder(args.perfect_calc_results,
+                                 check_calc_results=args.check_calc_results)
+    parse_dirs(args.dirs, builder.add_dir, args.verbose)
+    builder.to_json_files()
 
 
 def plot_defect_energy(args):
+    from pydefect.analyzer.defect_energy_plotter import DefectEnergyMplPlotter
     plotter = DefectEnergyMplPlotter(
         defect_energy_summary=args.defect_energy_summary,
         chem_pot_label=args.label,
@@ -301,3 +315,11 @@ def plot_defect_energy(args):
 
     plotter.construct_plot()
     plotter.plt.savefig(f"energy_{args.label}.pdf")
+
+
+def plot_batch(args):
+    from pydefect.cli.plot_functions import plot_dir, init_plot_batch_worker
+    parse_dirs(args.dirs, plot_dir, args.verbose,
+               jobs=args.jobs,
+               initializer=init_plot_batch_worker,
+               initargs=(args.p_state, args.y_range))
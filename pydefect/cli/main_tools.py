@@ -1,8 +1,12 @@
 # -*- coding: utf-8 -*-
 #  Copyright (c) 2020. Distributed under the terms of the MIT License.
 import traceback
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from importlib import import_module
+from itertools import repeat
 from pathlib import Path
-from typing import List, Callable, Any
+from typing import List, Callable, Any, Tuple
 
 import numpy as np
 from vise.util.logger import get_logger
@@ -35,12 +39,65 @@ def str_int_to_int(x):
         return x
 
 
+class LazyFunction:
+    """Function specified by a path like "package.module:Class.method".
+
+    The module is imported when the function is called for the first time,
+    so that the heavy modules are imported only when the sub-command is
+    dispatched or the argument is converted.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.__name__ = path.split(":")[-1].split(".")[-1]
+        self._func = None
+
+    def __call__(self, *args, **kwargs):
+        if self._func is None:
+            module_name, attr_names = self.path.split(":")
+            func = import_module(module_name)
+            for attr_name in attr_names.split("."):
+                func = getattr(func, attr_name)
+            self._func = func
+        return self._func(*args, **kwargs)
+
+    def __repr__(self):
+        return f"LazyFunction({self.path})"
+
+
+class LazyVaspFileReader(LazyFunction):
+    """LazyFunction reading VASP files without UnknownPotcarWarning.
+
+    The warning filter is installed here because the parsers are called by
+    argparse before the modules of the sub-command functions, which ignore
+    the warning, are imported.
+    """
+
+    def __call__(self, *args, **kwargs):
+        from pymatgen.io.vasp.inputs import UnknownPotcarWarning
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", UnknownPotcarWarning)
+            return super().__call__(*args, **kwargs)
+
+    def __repr__(self):
+        return f"LazyVaspFileReader({self.path})"
+
+
 def parse_dirs(dirs: List[Path],
                _inner_function: Callable[[Path], Any],
                verbose: bool = False,
-               output_filename: str = None):
-    failed_directories = []
-    parsed_results = []
+               output_filename: str = None,
+               jobs: int = 1,
+               initializer: Callable[..., None] = None,
+               initargs: tuple = ()):
+    """Apply _inner_function to directories and report the failed ones.
+
+    When jobs > 1, directories are parsed with a process pool, where
+    _inner_function must be picklable, i.e., defined at module level.
+    initializer(*initargs) is called once in each worker, or once in this
+    process when jobs == 1, to share data among directories.
+    """
+    target_dirs = []
     for _dir in dirs:
         if _dir.is_file():
             logger.info(f"{_dir} is a file, so skipped.")
@@ -48,24 +105,30 @@ def parse_dirs(dirs: List[Path],
         if output_filename and (_dir / output_filename).exists():
             logger.info(f"In {_dir}, {output_filename} already exists.")
             continue
+        target_dirs.append(_dir)
+
+    if jobs > 1 and len(target_dirs) > 1:
+        with ProcessPoolExecutor(max_workers=jobs,
+                                 initializer=initializer,
+                                 initargs=initargs) as executor:
+            outcomes = list(executor.map(_parse_dir,
+                                         target_dirs,
+                                         repeat(_inner_function),
+                                         repeat(verbose)))
+    else:
+        if initializer:
+            initializer(*initargs)
+        outcomes = [_parse_dir(_dir, _inner_function, verbose)
+                    for _dir in target_dirs]
 
-        logger.info(f"Parsing data in {_dir} ...")
-        try:
-            _return = _inner_function(_dir)
-            if _return:
-                parsed_results.append(_return)
-        except Exception as e:
-            if verbose:
-                print(traceback.print_exc())
-            else:
-                try:
-                    print(e.args[1])
-                except IndexError:
-                    pass
-
-            logger.warning(f"Failing parsing {_dir} ...")
+    failed_directories = []
+    parsed_results = []
+    for _dir, (succeeded, _return) in zip(target_dirs, outcomes):
+        if not succeeded:
             failed_directories.append(str(_dir))
-            continue
+        elif _return:
+            parsed_results.append(_return)
+
     if failed_directories:
         failed_dir_string = '\n'.join(failed_directories)
         logger.warning(f"Failed directories are:\n{failed_dir_string}")
@@ -74,4 +137,23 @@ def parse_dirs(dirs: List[Path],
     else:
         logger.info("Parsing all the directories succeeded.")
 
-    return parsed_results or None
\ No newline at end of file
+    return parsed_results or None
+
+
+def _parse_dir(_dir: Path,
+               _inner_function: Callable[[Path], Any],
+               verbose: bool) -> Tuple[bool, Any]:
+    logger.info(f"Parsing data in {_dir} ...")
+    try:
+        return True, _inner_function(_dir)
+    except Exception as e:
+        if verbose:
+            print(traceback.print_exc())
+        else:
+            try:
+                print(e.args[1])
+            except IndexError:
+                pass
+
+        logger.warning(f"Failing parsing {_dir} ...")
+        return False, None
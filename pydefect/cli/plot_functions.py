@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+#  Copyright (c) 2020 Kumagai group.
+"""Plot functions used in the CLI.
+
+Matplotlib is imported via this module, so the other CLI modules import it
+only when the figures are actually drawn.
+"""
+from pathlib import Path
+from typing import Optional, List
+
+import matplotlib
+from monty.serialization import loadfn
+from pydefect.analyzer.band_edge_states import BandEdgeOrbitalInfos, \
+    PerfectBandEdgeState
+from pydefect.analyzer.eigenvalue_plotter import EigenvalueMplPlotter
+from pydefect.corrections.efnv_correction import ExtendedFnvCorrection
+from pydefect.corrections.site_potential_plotter import SitePotentialMplPlotter
+from vise.util.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def use_non_interactive_backend():
+    matplotlib.use("Agg")
+
+
+def plot_efnv_correction(efnv_correction: ExtendedFnvCorrection,
+                         title: str,
+                         filename: Path):
+    plotter = SitePotentialMplPlotter.from_efnv_corr(
+        title=title, efnv_correction=efnv_correction)
+    plotter.construct_plot()
+    plotter.plt.savefig(fname=filename)
+    plotter.plt.clf()
+
+
+def plot_eigenvalues(band_edge_orb_infos: BandEdgeOrbitalInfos,
+                     title: str,
+                     supercell_vbm: float,
+                     supercell_cbm: float,
+                     filename: Path,
+                     y_range: Optional[List[float]] = None):
+    plotter = EigenvalueMplPlotter(
+        title=title, band_edge_orb_infos=band_edge_orb_infos,
+        supercell_vbm=supercell_vbm, supercell_cbm=supercell_cbm,
+        y_range=y_range)
+    plotter.construct_plot()
+    plotter.plt.savefig(fname=filename)
+    plotter.plt.clf()
+
+
+# Inputs shared by all the directories in plot_batch, set once per process.
+_plot_batch_inputs = {}
+
+
+def init_plot_batch_worker(p_state: Optional[PerfectBandEdgeState],
+                            y_range: Optional[List[float]]):
+    use_non_interactive_backend()
+    _plot_batch_inputs.update(p_state=p_state, y_range=y_range)
+
+
+def _defect_entry_or_none(_dir: Path):
+    try:
+        return loadfn(_dir / "defect_entry.json")
+    except FileNotFoundError:
+        return None
+
+
+def plot_dir(_dir: Path):
+    """Render the figures from the json files existing in a directory.
+
+    correction.json -> correction.pdf
+    band_edge_orbital_infos.json -> eigenvalues.pdf, when the perfect band
+    edge state is given.
+    """
+    defect_entry = _defect_entry_or_none(_dir)
+
+    if (_dir / "correction.json").exists():
+        correction = loadfn(_dir / "correction.json")
+        if isinstance(correction, ExtendedFnvCorrection):
+            title = defect_entry.full_name if defect_entry else _dir.name
+            plot_efnv_correction(correction, title, _dir / "correction.pdf")
+
+    p_state = _plot_batch_inputs["p_state"]
+    if (_dir / "band_edge_orbital_infos.json").exists() and p_state:
+        band_edge_orb_infos = loadfn(_dir / "band_edge_orbital_infos.json")
+        title = defect_entry.name if defect_entry else "No name"
+        plot_eigenvalues(band_edge_orb_infos, title,
+                         p_state.vbm_info.energy, p_state.cbm_info.energy,
+                         _dir / "eigenvalues.pdf",
+                         _plot_batch_inputs["y_range"])
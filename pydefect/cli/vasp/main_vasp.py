@@ -4,20 +4,20 @@
 
 import argparse
 import sys
-import warnings
 from pathlib import Path
 
 from pydefect.cli.main import epilog, description, add_sub_parser, dirs_parsers
-from pydefect.cli.vasp.main_vasp_functions import make_defect_entries, \
-    make_unitcell, make_competing_phase_dirs, \
-    make_calc_results, \
-    make_band_edge_orb_infos_and_eigval_plot, make_perfect_band_edge_state, \
-    make_local_extrema, make_composition_energies
+from pydefect.cli.main_tools import LazyFunction, LazyVaspFileReader
 from pydefect.defaults import defaults
-from pymatgen.io.vasp import Vasprun, Outcar, Chgcar
-from pymatgen.io.vasp.inputs import UnknownPotcarWarning
 
-warnings.simplefilter('ignore', UnknownPotcarWarning)
+
+# VASP files are parsed with pymatgen, which is imported only when used.
+vasprun = LazyVaspFileReader("pymatgen.io.vasp:Vasprun")
+outcar = LazyVaspFileReader("pymatgen.io.vasp:Outcar")
+
+
+def main_vasp_func(name: str) -> LazyFunction:
+    return LazyFunction(f"pydefect.cli.vasp.main_vasp_functions:{name}")
 
 
 def parse_args_main_vasp(args):
@@ -40,22 +40,24 @@ def parse_args_main_vasp(args):
         aliases=['u'])
 
     parser_unitcell.add_argument(
-        "-vb", "--vasprun_band", required=True, type=Vasprun,
+        "-vb", "--vasprun_band", required=True, type=vasprun,
         help="vasprun.xml file of band structure calculation.")
     parser_unitcell.add_argument(
-        "-ob", "--outcar_band", required=True, type=Outcar,
+        "-ob", "--outcar_band", required=True, type=outcar,
         help="OUTCAR file of band structure calculation.")
     parser_unitcell.add_argument(
-        "-odc", "--outcar_dielectric_clamped", required=True, type=Outcar,
+        "-odc", "--outcar_dielectric_clamped", required=True,
+        type=outcar,
         help="OUTCAR file of ion-clamped dielectric constant calculation.")
     parser_unitcell.add_argument(
-        "-odi", "--outcar_dielectric_ionic", required=True, type=Outcar,
+        "-odi", "--outcar_dielectric_ionic", required=True,
+        type=outcar,
         help="OUTCAR file for calculating dielectric constant of ionic "
              "contribution.")
     parser_unitcell.add_argument(
         "-n", "--name", type=str,
         help="System name used for plotting defect formation energies.")
-    parser_unitcell.set_defaults(func=make_unitcell)
+    parser_unitcell.set_defaults(func=main_vasp_func("make_unitcell"))
 
     # -- make_poscars ------------------------------------------------
     parser_make_poscars = subparsers.add_parser(
@@ -72,7 +74,8 @@ def parse_args_main_vasp(args):
         "--e_above_hull", default=defaults.e_above_hull, type=float,
         help="Allowed energy above hull in eV/atom.")
 
-    parser_make_poscars.set_defaults(func=make_competing_phase_dirs)
+    parser_make_poscars.set_defaults(
+        func=main_vasp_func("make_competing_phase_dirs"))
 
     # -- make_composition_energies ---------------------------------------------
     parser_make_composition_energies = subparsers.add_parser(
@@ -88,7 +91,7 @@ def parse_args_main_vasp(args):
         help="composition_energies.yaml to be overwritten.")
 
     parser_make_composition_energies.set_defaults(
-        func=make_composition_energies)
+        func=main_vasp_func("make_composition_energies"))
 
     # -- make_local_extrema ----------------------------------------------------
     parser_make_local_extrema = subparsers.add_parser(
@@ -98,11 +101,14 @@ def parse_args_main_vasp(args):
         aliases=['le'])
 
     parser_make_local_extrema.add_argument(
-        "-v", "--volumetric_data", type=Chgcar.from_file, required=True,
-        nargs="+",
+        "-v", "--volumetric_data", type=str, required=True, nargs="+",
         help="File names such as CHGCAR or LOCPOT. When multiple files are "
              "provided, the summed data (e.g., AECCAR0 + AECCAR2) will be "
              "parsed.")
+    parser_make_local_extrema.add_argument(
+        "--no_cache", dest="cache", action="store_false",
+        help="Set when the grid data are not stored in nor read from the "
+             ".npy files next to the volumetric data files, e.g., CHGCAR.npy.")
     parser_make_local_extrema.add_argument(
         "--find_max", dest="find_max", action="store_true",
         help="Set when local maxima are searched instead of local minima.")
@@ -140,7 +146,8 @@ def parse_args_main_vasp(args):
         help="Radius of sphere around each site to evaluate the average "
              "quantity.")
 
-    parser_make_local_extrema.set_defaults(func=make_local_extrema)
+    parser_make_local_extrema.set_defaults(
+        func=main_vasp_func("make_local_extrema"))
     # -- defect_entries ------------------------------------------------
     parser_defect_entries = subparsers.add_parser(
         name="defect_entries",
@@ -149,7 +156,8 @@ def parse_args_main_vasp(args):
         formatter_class=argparse.ArgumentDefaultsHelpFormatter,
         aliases=['de'])
 
-    parser_defect_entries.set_defaults(func=make_defect_entries)
+    parser_defect_entries.set_defaults(
+        func=main_vasp_func("make_defect_entries"))
 
     # -- calc_results ------------------------------------------------
     parser_calc_results = subparsers.add_parser(
@@ -159,7 +167,7 @@ def parse_args_main_vasp(args):
         parents=dirs_parsers,
         formatter_class=argparse.ArgumentDefaultsHelpFormatter,
         aliases=['cr'])
-    parser_calc_results.set_defaults(func=make_calc_results)
+    parser_calc_results.set_defaults(func=main_vasp_func("make_calc_results"))
 
     # -- perfect band edge state  ----------------------------------------------
     parser_perf_band_edge_state = subparsers.add_parser(
@@ -171,8 +179,12 @@ def parse_args_main_vasp(args):
     parser_perf_band_edge_state.add_argument(
         "-d", "--dir", type=Path,
         help="Directory path to the perfect supercell calculation.")
+    parser_perf_band_edge_state.add_argument(
+        "--no_plot", dest="plot", action="store_false",
+        help="Set when eigenvalues.pdf is not plotted.")
 
-    parser_perf_band_edge_state.set_defaults(func=make_perfect_band_edge_state)
+    parser_perf_band_edge_state.set_defaults(
+        func=main_vasp_func("make_perfect_band_edge_state"))
 
     # -- band edge orbital infos  ----------------------------------------------
     parser_band_edge_orb_infos = subparsers.add_parser(
@@ -188,9 +200,17 @@ def parse_args_main_vasp(args):
     parser_band_edge_orb_infos.add_argument(
         "--no_participation_ratio", action="store_true",
         help="Set when structure_info.json is not available.")
+    parser_band_edge_orb_infos.add_argument(
+        "--no_plot", dest="plot", action="store_false",
+        help="Set when eigenvalues.pdf is not plotted. It can be plotted "
+             "later with pydefect plot_batch.")
+    parser_band_edge_orb_infos.add_argument(
+        "--no_cache", dest="cache", action="store_false",
+        help="Set when the projections are not stored in nor read from the "
+             "PROCAR.npz files.")
 
     parser_band_edge_orb_infos.set_defaults(
-        func=make_band_edge_orb_infos_and_eigval_plot)
+        func=main_vasp_func("make_band_edge_orb_infos_and_eigval_plot"))
 
     # ------------------------------------------------------------------------
     return parser.parse_args(args)
@@ -1,33 +1,40 @@
 # -*- coding: utf-8 -*-
 #  Copyright (c) 2020. Distributed under the terms of the MIT License.
+import warnings
 from pathlib import Path
 
 from monty.serialization import loadfn
-from pydefect.analyzer.eigenvalue_plotter import EigenvalueMplPlotter
 from pydefect.chem_pot_diag.chem_pot_diag import CompositionEnergy, \
     CompositionEnergies
 from pydefect.cli.main_tools import parse_dirs
 from pydefect.cli.vasp.make_local_extrema import \
     make_local_extrema_from_volumetric_data
 from pydefect.cli.vasp.make_band_edge_orbital_infos import \
-    make_band_edge_orbital_infos
+    make_band_edge_orbital_infos, band_edge_index_range
 from pydefect.cli.vasp.make_calc_results import make_calc_results_from_vasp
 from pydefect.cli.vasp.make_perfect_band_edge_state import \
     make_perfect_band_edge_state_from_vasp
 from pydefect.cli.vasp.make_poscars_from_query import make_poscars_from_query
 from pydefect.cli.vasp.make_unitcell import make_unitcell_from_vasp
+from pydefect.cli.vasp.read_procar import read_procar
+from pydefect.cli.vasp.read_vasprun import read_vasprun
+from pydefect.cli.vasp.read_volumetric_data import read_volumetric_data, \
+    sum_volumetric_data
 from pydefect.input_maker.defect_entries_maker import DefectEntriesMaker
 from pydefect.input_maker.defect_set import DefectSet
 from pydefect.input_maker.local_extrema import VolumetricDataAnalyzeParams
 from pydefect.input_maker.supercell_info import SupercellInfo
 from pydefect.util.mp_tools import MpQuery
 from pymatgen.core import Structure
-from pymatgen.io.vasp import Vasprun, Outcar, Procar
+from pymatgen.io.vasp import Outcar, Procar
+from pymatgen.io.vasp.inputs import UnknownPotcarWarning
 from vise.defaults import defaults
 from vise.util.logger import get_logger
 
 logger = get_logger(__name__)
 
+warnings.simplefilter('ignore', UnknownPotcarWarning)
+
 
 def make_unitcell(args):
     unitcell = make_unitcell_from_vasp(
@@ -72,10 +79,13 @@ def make_composition_energies(args):
 
 
 def make_local_extrema(args):
-    volumetric_data = args.volumetric_data[0]
-    if len(args.volumetric_data) > 1:
-        for i in args.volumetric_data[1:]:
-            volumetric_data += i
+    if len(args.volumetric_data) == 1:
+        volumetric_data = read_volumetric_data(args.volumetric_data[0],
+                                               use_sidecar=args.cache)
+    else:
+        volumetric_data = sum_volumetric_data(
+            read_volumetric_data(f, use_sidecar=args.cache)
+            for f in args.volumetric_data)
 
     params = VolumetricDataAnalyzeParams(args.threshold_frac,
                                          args.threshold_abs,
@@ -128,7 +138,7 @@ def make_calc_results(args):
 
     def _inner(_dir: Path):
         calc_results = make_calc_results_from_vasp(
-            vasprun=Vasprun(_dir / defaults.vasprun, parse_potcar_file=False),
+            vasprun=read_vasprun(_dir / defaults.vasprun),
             outcar=Outcar(_dir / defaults.outcar))
         calc_results.to_json_file(str(_dir / file_name))
 
@@ -137,7 +147,7 @@ def make_calc_results(args):
 
 def make_perfect_band_edge_state(args):
     procar = Procar(args.dir / defaults.procar)
-    vasprun = Vasprun(args.dir / defaults.vasprun, parse_potcar_file=False)
+    vasprun = read_vasprun(args.dir / defaults.vasprun)
     outcar = Outcar(args.dir / defaults.outcar)
     perfect_band_edge_state = \
         make_perfect_band_edge_state_from_vasp(procar, vasprun, outcar)
@@ -150,12 +160,10 @@ def make_perfect_band_edge_state(args):
         procar, vasprun, vbm, cbm)
     band_edge_orb_infos.to_json_file(args.dir / "band_edge_orbital_infos.json")
 
-    plotter = EigenvalueMplPlotter(
-        title="perfect", band_edge_orb_infos=band_edge_orb_infos,
-        supercell_vbm=vbm, supercell_cbm=cbm)
-    plotter.construct_plot()
-    plotter.plt.savefig(fname=args.dir / "eigenvalues.pdf")
-    plotter.plt.clf()
+    if args.plot:
+        from pydefect.cli.plot_functions import plot_eigenvalues
+        plot_eigenvalues(band_edge_orb_infos, "perfect", vbm, cbm,
+                         args.dir / "eigenvalues.pdf")
 
 
 def make_band_edge_orb_infos_and_eigval_plot(args):
@@ -170,8 +178,11 @@ def make_band_edge_orb_infos_and_eigval_plot(args):
             title = defect_entry.name
         except FileNotFoundError:
             title = "No name"
-        procar = Procar(_dir / defaults.procar)
-        vasprun = Vasprun(_dir / defaults.vasprun, parse_potcar_file=False)
+        vasprun = read_vasprun(_dir / defaults.vasprun)
+        band_range = band_edge_index_range(vasprun.eigenvalues,
+                                           supercell_vbm, supercell_cbm)
+        procar = read_procar(_dir / defaults.procar, band_range,
+                             use_sidecar=args.cache)
 
         str_info = None
         if args.no_participation_ratio is False:
@@ -187,12 +198,10 @@ def make_band_edge_orb_infos_and_eigval_plot(args):
             eigval_shift=eigval_shift)
         band_edge_orb_infos.to_json_file(_dir / file_name)
 
-        plotter = EigenvalueMplPlotter(
-            title=title, band_edge_orb_infos=band_edge_orb_infos,
-            supercell_vbm=supercell_vbm, supercell_cbm=supercell_cbm,
-            y_range=args.y_range)
-        plotter.construct_plot()
-        plotter.plt.savefig(fname=_dir / "eigenvalues.pdf")
-        plotter.plt.clf()
+        if args.plot:
+            from pydefect.cli.plot_functions import plot_eigenvalues
+            plot_eigenvalues(band_edge_orb_infos, title, supercell_vbm,
+                             supercell_cbm, _dir / "eigenvalues.pdf",
+                             args.y_range)
 
     parse_dirs(args.dirs, _inner, args.verbose, file_name)
\ No newline at end of file
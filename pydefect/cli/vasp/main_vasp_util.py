@@ -14,7 +14,7 @@ from pydefect.cli.vasp.main_vasp_util_functions import \
     calc_charge_state, make_defect_entry_main, calc_grids, \
     make_defect_charge_info_main, make_total_dos
 from pymatgen.core import Structure
-from pymatgen.io.vasp import Chgcar, Vasprun, Outcar
+from pymatgen.io.vasp import Vasprun, Outcar
 from pymatgen.io.vasp.inputs import UnknownPotcarWarning
 from vise.defaults import defaults
 
@@ -96,7 +96,11 @@ def parse_args_main_vasp_util(args):
         aliases=['cg'])
 
     parser_calc_grids.add_argument(
-        "-c", "--chgcar", type=Chgcar.from_file, required=True)
+        "-c", "--chgcar", type=str, required=True)
+    parser_calc_grids.add_argument(
+        "--no_cache", dest="cache", action="store_false",
+        help="Set when the grid data are not stored in nor read from the "
+             "CHGCAR.npy file.")
     parser_calc_grids.set_defaults(func=calc_grids)
 
     # -- calc defect charge info -----------------------------------------------
@@ -113,6 +117,10 @@ def parse_args_main_vasp_util(args):
         "-b", "--bin_interval", type=float, default=0.2)
     parser_calc_def_charge_info.add_argument(
         "-g", "--grids", type=Grids.from_file, required=True)
+    parser_calc_def_charge_info.add_argument(
+        "--no_cache", dest="cache", action="store_false",
+        help="Set when the grid data are not stored in nor read from the "
+             ".npy files next to the PARCHG files.")
 
     parser_calc_def_charge_info.set_defaults(func=make_defect_charge_info_main)
 
@@ -9,11 +9,11 @@ from pydefect.analyzer.concentration.make_concentration import TotalDos
 from pydefect.analyzer.grids import Grids
 from pydefect.analyzer.refine_defect_structure import refine_defect_structure
 from pydefect.cli.vasp.make_defect_charge_info import make_defect_charge_info
+from pydefect.cli.vasp.read_volumetric_data import read_volumetric_data
 from pydefect.cli.vasp.get_defect_charge_state import get_defect_charge_state
 from pydefect.input_maker.defect_entry import make_defect_entry
 from pymatgen.core import Structure
 from pymatgen.electronic_structure.core import Spin
-from pymatgen.io.vasp import Chgcar
 from vise.analyzer.vasp.band_edge_properties import VaspBandEdgeProperties
 from vise.input_set.incar import ViseIncar
 from vise.util.file_transfer import FileLink
@@ -87,13 +87,15 @@ def make_refine_defect_poscar(args):
 
 
 def calc_grids(args):
-    grids = Grids.from_chgcar(args.chgcar)
+    chgcar = read_volumetric_data(args.chgcar, use_sidecar=args.cache)
+    grids = Grids.from_chgcar(chgcar)
     grids.dump()
 
 
 def make_defect_charge_info_main(args):
     band_idxs = [int(parchg.split(".")[-2]) - 1 for parchg in args.parchgs]
-    parchgs = [Chgcar.from_file(parchg) for parchg in args.parchgs]
+    parchgs = [read_volumetric_data(parchg, use_sidecar=args.cache)
+               for parchg in args.parchgs]
     defect_charge_info = make_defect_charge_info(
         parchgs, band_idxs, args.bin_interval, args.grids)
     defect_charge_info.to_json_file()
@@ -1,59 +1,73 @@
 # -*- coding: utf-8 -*-
 #  Copyright (c) 2020 Kumagai group.
-from typing import Dict
+from typing import Dict, List, Optional, Tuple, Union
 
 import numpy as np
-from pydefect.analyzer.band_edge_states import OrbitalInfo, \
-    BandEdgeOrbitalInfos
+from pydefect.analyzer.band_edge_states import BandEdgeOrbitalInfos
 from pydefect.analyzer.defect_structure_info import DefectStructureInfo
+from pydefect.cli.vasp.read_procar import ProcarProjections
+from pydefect.cli.vasp.read_vasprun import VasprunSummary
 from pydefect.defaults import defaults
 from pymatgen.core import Structure
 from pymatgen.electronic_structure.core import Spin
 from pymatgen.io.vasp import Procar, Vasprun
 
 
-def make_band_edge_orbital_infos(procar: Procar,
-                                 vasprun: Vasprun,
-                                 vbm: float, cbm: float,
-                                 str_info: DefectStructureInfo = None,
-                                 eigval_shift: float = 0.0):
-    eigval_range = defaults.eigval_range
-    kpt_coords = [tuple(coord) for coord in vasprun.actual_kpoints]
-    max_energy_by_spin, min_energy_by_spin = [], []
-    neighbors = str_info.neighbor_atom_indices if str_info else None
-
-    for e in vasprun.eigenvalues.values():
-        max_energy_by_spin.append(np.amax(e[:, :, 0], axis=0))
-        min_energy_by_spin.append(np.amin(e[:, :, 0], axis=0))
+def band_edge_index_range(eigenvalues: Dict[Spin, np.ndarray],
+                          vbm: float, cbm: float) -> Tuple[int, int]:
+    """Lowest and highest band indices of which the eigenvalues lie within
+    eigval_range from the band edges at any k-point and spin.
 
-    max_energy_by_band = np.amax(np.vstack(max_energy_by_spin), axis=0)
-    min_energy_by_band = np.amin(np.vstack(min_energy_by_spin), axis=0)
+    eigenvalues: {spin: np.ndarray of [k-idx, band-idx, (energy, occupation)]}
+    """
+    eigval_range = defaults.eigval_range
+    energies = np.concatenate([e[:, :, 0] for e in eigenvalues.values()])
+    max_energy_by_band = np.amax(energies, axis=0)
+    min_energy_by_band = np.amin(energies, axis=0)
 
     lower_idx = np.argwhere(max_energy_by_band > vbm - eigval_range)[0][0]
     upper_idx = np.argwhere(min_energy_by_band < cbm + eigval_range)[-1][-1]
+    return int(lower_idx), int(upper_idx)
 
-    orbs, s = procar.data, vasprun.final_structure
-    orb_infos = []
+
+def make_band_edge_orbital_infos(procar: Union[Procar, ProcarProjections],
+                                 vasprun: Union[Vasprun, VasprunSummary],
+                                 vbm: float, cbm: float,
+                                 str_info: DefectStructureInfo = None,
+                                 eigval_shift: float = 0.0):
+    kpt_coords = [tuple(coord) for coord in vasprun.actual_kpoints]
+    neighbors = str_info.neighbor_atom_indices if str_info else None
+    lower_idx, upper_idx = band_edge_index_range(vasprun.eigenvalues,
+                                                 vbm, cbm)
+    first_idx = 0
+    if isinstance(procar, ProcarProjections):
+        first_idx = procar.lowest_band_index
+        if lower_idx < first_idx or upper_idx > procar.highest_band_index:
+            raise ValueError(f"Projections of bands {lower_idx}-{upper_idx} "
+                             f"are not included in the PROCAR data.")
+
+    s = vasprun.final_structure
+    elements = list(s.symbol_set)
+    bands = slice(lower_idx, upper_idx + 1)
+    proj_bands = slice(lower_idx - first_idx, upper_idx + 1 - first_idx)
+    energies, occupations, orbitals, p_ratios = [], [], [], []
     for spin, eigvals in vasprun.eigenvalues.items():
-        orb_infos.append([])
-        for k_idx in range(len(kpt_coords)):
-            orb_infos[-1].append([])
-            for b_idx in range(lower_idx, upper_idx + 1):
-                e, occ = eigvals[k_idx, b_idx, :]
-                orbitals = calc_orbital_character(orbs, s, spin, k_idx, b_idx)
-                if neighbors:
-                    p_ratio = calc_participation_ratio(
-                        orbs, spin, k_idx, b_idx, neighbors)
-                else:
-                    p_ratio = None
-                orb_infos[-1][-1].append(OrbitalInfo(e, orbitals, occ, p_ratio))
+        energies.append(eigvals[:, bands, 0])
+        occupations.append(eigvals[:, bands, 1])
+        chars, p_ratio = calc_orbital_characters(
+            procar.data[spin][:, proj_bands], s, elements, neighbors)
+        orbitals.append(chars)
+        p_ratios.append(p_ratio)
 
     return BandEdgeOrbitalInfos(
-        orbital_infos=orb_infos,
+        energies=energies,
+        occupations=occupations,
+        orbitals=orbitals,
+        elements=elements,
+        participation_ratios=p_ratios if neighbors else None,
         kpt_coords=kpt_coords,
         kpt_weights=vasprun.actual_kpoints_weights,
-        # need to convert numpy.int64 to int for mongoDB.
-        lowest_band_index=int(lower_idx),
+        lowest_band_index=lower_idx,
         fermi_level=vasprun.efermi,
         eigval_shift=eigval_shift)
 
@@ -80,42 +94,77 @@ def calc_participation_ratio(orbitals: Dict[Spin, np.ndarray],
     return np.sum(sum_per_atom[atom_indices]) / np.sum(sum_per_atom)
 
 
+def l_grouping_matrix(num_orbitals: int) -> np.ndarray:
+    """Matrix summing up the PROCAR orbital components by angular momentum.
+
+    LORBIT 10 -> consider only "s", "p", "d" orbitals
+    LORBIT >=11 -> consider "s", "px", "py", "pz",.. orbitals, which are
+                   grouped into s, p, d and f.
+
+    Return (np.ndarray):
+        [orbital index, l] = 1.0 when the orbital belongs to l, else 0.0.
+    """
+    if num_orbitals > 5:
+        l_by_orbital = [0] + [1] * 3 + [2] * 5 + [3] * 7
+        return np.eye(4)[l_by_orbital[:num_orbitals]]
+    return np.eye(num_orbitals, 3)
+
+
+def element_indicator_matrix(structure: Structure,
+                             elements: List[str]) -> np.ndarray:
+    """[atom index, element index] = 1.0 when the atom is the element. """
+    result = np.zeros((len(structure), len(elements)))
+    for i, element in enumerate(elements):
+        result[structure.indices_from_symbol(element), i] = 1.0
+    return result
+
+
+def calc_orbital_characters(orbitals: np.ndarray,
+                            structure: Structure,
+                            elements: List[str],
+                            atom_indices: Optional[list] = None
+                            ) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """Orbital characters and participation ratios of a set of bands.
+
+    The PROCAR data of [k-idx, band-idx, ion-idx, orbital-idx] are contracted
+    at once with the element indicator and l grouping matrices. The
+    indicator is extended with the columns of the atom_indices sites and of
+    all the sites, and the grouping with the column of all the orbitals, so
+    that the participation ratios come out of the same contraction.
+
+    Return (Tuple):
+        orbital characters of [k-idx, band-idx, element-idx, l] rounded to
+        three decimal places, and participation ratios of [k-idx, band-idx]
+        when atom_indices are given.
+    """
+    atom_weights = np.zeros((len(structure), len(elements) + 2))
+    atom_weights[:, :-2] = element_indicator_matrix(structure, elements)
+    if atom_indices:
+        atom_weights[atom_indices, -2] = 1.0
+    atom_weights[:, -1] = 1.0
+
+    l_grouping = l_grouping_matrix(orbitals.shape[-1])
+    orbital_weights = np.hstack([l_grouping,
+                                 np.ones((len(l_grouping), 1))])
+
+    projected = np.einsum("kbio,ie,ol->kbel", orbitals, atom_weights,
+                          orbital_weights, optimize=True)
+    characters = np.round(projected[:, :, :-2, :-1], 3)
+    if not atom_indices:
+        return characters, None
+    return characters, projected[:, :, -2, -1] / projected[:, :, -1, -1]
+
+
 def calc_orbital_character(orbitals,
                            structure: Structure,
                            spin: Spin,
                            kpt_index: int,
-                           band_index: int):
-    """ Consider the two pattern of orbitals.
-
-    LORBIT 10 -> consider only "s", "p", "d" orbitals
-    LORBIT >=11 -> consider "s", "px", "py", "pz",.. orbitals
+                           band_index: int) -> Dict[str, List[float]]:
+    """Orbital character of a band at a k-point by element.
 
+    See calc_orbital_characters for details.
     """
-
-    def projection_sum(atom_indices: tuple, first: int, last: int):
-        end = last + 1
-        procar_sum = np.sum(orbitals[spin]
-                            [kpt_index, band_index, atom_indices, first:end])
-        return float(procar_sum)
-
-    orbital_components = {}
-    azimuthal = len(orbitals[Spin.up][0, 0, 0]) > 5
-
-    for element in structure.symbol_set:
-        # get list of index
-        indices = structure.indices_from_symbol(element)
-        if azimuthal:
-            orbital_components[element] = \
-                [round(projection_sum(indices, 0, 0), 3),
-                 round(projection_sum(indices, 1, 3), 3),
-                 round(projection_sum(indices, 4, 8), 3)]
-            try:
-                orbital_components[element].append(round(projection_sum(indices, 9, 16), 3))
-            except KeyError:
-                pass
-        else:
-            orbital_components[element] = \
-                [round(projection_sum(indices, 0, 0), 3),
-                 round(projection_sum(indices, 1, 1), 3),
-                 round(projection_sum(indices, 2, 2), 3)]
-    return orbital_components
\ No newline at end of file
+    elements = list(structure.symbol_set)
+    data = orbitals[spin][kpt_index, band_index][np.newaxis, np.newaxis]
+    characters, _ = calc_orbital_characters(data, structure, elements)
+    return {e: c.tolist() for e, c in zip(elements, characters[0, 0])}
@@ -1,10 +1,13 @@
 # -*- coding: utf-8 -*-
 #  Copyright (c) 2020. Distributed under the terms of the MIT License.
+from typing import Union
+
 from pydefect.analyzer.calc_results import CalcResults
+from pydefect.cli.vasp.read_vasprun import VasprunSummary
 from pymatgen.io.vasp import Vasprun, Outcar
 
 
-def make_calc_results_from_vasp(vasprun: Vasprun,
+def make_calc_results_from_vasp(vasprun: Union[Vasprun, VasprunSummary],
                                 outcar: Outcar) -> CalcResults:
     return CalcResults(structure=vasprun.final_structure,
                        energy=outcar.final_energy,
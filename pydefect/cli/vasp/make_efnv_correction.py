@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 #  Copyright (c) 2020. Distributed under the terms of the MIT License.
+from pathlib import Path
 from typing import Optional, Tuple
 
 import numpy as np
@@ -10,7 +11,8 @@ from pydefect.analyzer.defect_structure_comparator import \
 from pydefect.corrections.defect_region import HalfMaxFaceDistanceDefectRegion, DefectRegion
 from pydefect.corrections.efnv_correction import \
     ExtendedFnvCorrection, PotentialSite
-from pydefect.corrections.ewald import Ewald
+from pydefect.corrections.ewald import get_ewald
+from pydefect.corrections.pc_potential_grid import PointChargePotentialGrid
 from pydefect.defaults import defaults
 from pydefect.util.error_classes import SupercellError, \
     NoCalculatedPotentialSiteError
@@ -27,7 +29,11 @@ def make_efnv_correction(charge: float,
                          accuracy: float = defaults.ewald_accuracy,
                          defect_region: DefectRegion = None,
                          calc_all_sites: bool = False,
-                         unit_conversion: float = 180.95128169876497):
+                         unit_conversion: float = 180.95128169876497,
+                         ewald_cache_dir: Optional[Path] = None,
+                         optimize_ewald_param: bool = False,
+                         pc_potential_grid: Optional[
+                             PointChargePotentialGrid] = None):
     """
     Notes:
     (1) The formula written in YK2014 need to be divided by 4pi in the SI unit.
@@ -35,6 +41,12 @@ def make_efnv_correction(charge: float,
         angstrom for length, relative dielectric tensor, Multiply
         elementary_charge * 1e10 / epsilon_0 = 180.95128169876497
         to make potential in V.
+    (3) The Ewald object is shared among the calls with the same lattice and
+        dielectric tensor, and also stored in ewald_cache_dir if given.
+        If optimize_ewald_param is True, the Ewald parameter is tuned to
+        minimize the number of the real and reciprocal lattice vectors.
+    (4) When pc_potential_grid is given, the point-charge potentials are
+        interpolated from it instead of being calculated with the Ewald sum.
     """
     if defect_region is None:
         defect_region = HalfMaxFaceDistanceDefectRegion(sample_radius_ratio=1.0)
@@ -46,21 +58,33 @@ def make_efnv_correction(charge: float,
 
     radius = defect_region.defect_region_radius(lattice.matrix)
 
-    ewald = Ewald(lattice.matrix, dielectric_tensor, accuracy=accuracy)
+    if pc_potential_grid:
+        ewald = pc_potential_grid.ewald
+        if not np.allclose(ewald.lattice, lattice.matrix) or \
+                not np.allclose(ewald.dielectric_tensor, dielectric_tensor):
+            raise ValueError("The lattice or dielectric tensor of the "
+                             "point-charge potential grid is different.")
+        calc_pc_potentials = pc_potential_grid.potentials
+    else:
+        ewald = get_ewald(lattice.matrix, dielectric_tensor, accuracy=accuracy,
+                          cache_dir=ewald_cache_dir,
+                          optimize_param=optimize_ewald_param)
+        calc_pc_potentials = ewald.atomic_site_potentials
     point_charge_correction = \
         0.0 if not charge else - ewald.lattice_energy * charge ** 2
 
-    has_calculated_sites = False
-    for site, rel_coord in zip(sites, rel_coords):
-        if calc_all_sites is True or site.distance > radius:
-            has_calculated_sites = True
-            if charge == 0:
-                site.pc_potential = 0
-            else:
-                site.pc_potential = (ewald.atomic_site_potential(rel_coord)
-                                     * charge * unit_conversion)
-
-    if has_calculated_sites is False:
+    calc_indices = [i for i, site in enumerate(sites)
+                    if calc_all_sites is True or site.distance > radius]
+    if calc_indices and charge != 0:
+        pc_potentials = calc_pc_potentials(
+            [rel_coords[i] for i in calc_indices]) * charge * unit_conversion
+    else:
+        pc_potentials = [0] * len(calc_indices)
+
+    for i, pc_potential in zip(calc_indices, pc_potentials):
+        sites[i].pc_potential = float(pc_potential)
+
+    if not calc_indices:
         raise NoCalculatedPotentialSiteError(
             "Change the spherical radius of defect region. "
             f"Now {radius:4.2f}Å is set.")
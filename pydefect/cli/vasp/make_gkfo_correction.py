@@ -7,7 +7,7 @@ from vise.util.logger import get_logger
 from pydefect.analyzer.calc_results import CalcResults
 from pydefect.corrections.efnv_correction import \
     ExtendedFnvCorrection, PotentialSite
-from pydefect.corrections.ewald import Ewald
+from pydefect.corrections.ewald import get_ewald
 from pydefect.corrections.gkfo_correction import GkfoCorrection
 from pydefect.defaults import defaults
 
@@ -33,27 +33,29 @@ def make_gkfo_correction(efnv_correction: ExtendedFnvCorrection,
 
     defect_coords = efnv_correction.defect_coords
     lattice = initial_calc_results.structure.lattice
-    ewald_ele = Ewald(lattice.matrix, ion_clamped_diele_tensor,
-                      accuracy=accuracy)
+    ewald_ele = get_ewald(lattice.matrix, ion_clamped_diele_tensor,
+                          accuracy=accuracy)
     defect_region_radius = efnv_correction.defect_region_radius
 
     pc_2nd_term = - ewald_ele.lattice_energy
 
-    gkfo_sites = []
+    gkfo_sites, rel_coords = [], []
     for index, site in enumerate(initial_calc_results.structure):
         specie = site.specie
         dist, _ = lattice.get_distance_and_image(site.frac_coords, defect_coords)
         pot = (final_calc_results.potentials[index]
                - initial_calc_results.potentials[index])
+        gkfo_sites.append(PotentialSite(specie, dist, pot, None))
+        rel_coords.append([x - y for x, y in zip(site.frac_coords, defect_coords)])
 
-        rel_coord = [x - y for x, y in zip(site.frac_coords, defect_coords)]
-        if dist <= defect_region_radius:
-            pc_potential = None
-        else:
-            pc_potential = (ewald_ele.atomic_site_potential(rel_coord)
-                            * additional_charge * unit_conversion)
-
-        gkfo_sites.append(PotentialSite(specie, dist, pot, pc_potential))
+    calc_indices = [i for i, site in enumerate(gkfo_sites)
+                    if site.distance > defect_region_radius]
+    if calc_indices:
+        pc_potentials = ewald_ele.atomic_site_potentials(
+            [rel_coords[i] for i in calc_indices])
+        for i, pc_potential in zip(calc_indices, pc_potentials):
+            gkfo_sites[i].pc_potential = \
+                float(pc_potential) * additional_charge * unit_conversion
 
     return GkfoCorrection(
         init_efnv_correction=efnv_correction,
@@ -1,8 +1,9 @@
 # -*- coding: utf-8 -*-
 #  Copyright (c) 2020 Kumagai group.
 import itertools
+from collections import OrderedDict
 from itertools import groupby
-from typing import List
+from typing import List, Tuple
 
 import numpy as np
 import pandas as pd
@@ -10,13 +11,13 @@ from pandas import DataFrame
 from pydefect.analyzer.defect_structure_info import remove_dot
 from pydefect.input_maker.local_extrema import VolumetricDataLocalExtrema, \
     CoordInfo, VolumetricDataAnalyzeParams
-from pydefect.util.structure_tools import Distances
-from pymatgen.core import Element, Structure
+from pydefect.util.structure_tools import Distances, min_image_vectors, \
+    periodic_cluster_labels
+from pydefect.util.symmetry_cache import get_symmetry_data
+from pymatgen.core import Element, Structure, Lattice
 from pymatgen.io.vasp import VolumetricData, Chgcar
-from scipy.cluster.hierarchy import linkage, fcluster
-from scipy.spatial.distance import squareform
+from scipy.ndimage import maximum_filter
 from vise.util.logger import get_logger
-from vise.util.structure_symmetrizer import StructureSymmetrizer
 
 logger = get_logger(__name__)
 
@@ -39,7 +40,7 @@ def make_local_extrema_from_volumetric_data(
 def find_inequivalent_coords(structure: Structure,
                              df: DataFrame) -> List[CoordInfo]:
     result = []
-    initial_sg = StructureSymmetrizer(structure).sg_number
+    initial_sg = get_symmetry_data(structure).sg_number
     added_structure = Structure.from_dict(structure.as_dict())
     start_index = len(structure)
     for _, column in df.iterrows():
@@ -48,15 +49,15 @@ def find_inequivalent_coords(structure: Structure,
         added_structure.append(Element.Og, coords)
     end_index = len(added_structure)
 
-    symmetrizer = StructureSymmetrizer(added_structure)
+    sym_data = get_symmetry_data(added_structure)
 
-    if initial_sg != symmetrizer.sg_number:
+    if initial_sg != sym_data.sg_number:
         logger.warning("The symmetry has changed, meaning all the symmetry "
                        "equivalent sites do not exist.")
 
-    sym_data = symmetrizer.spglib_sym_data
     _indices = [i for i in range(start_index, end_index)]
-    repr_atom_pairs = zip(sym_data.equivalent_atoms[_indices], _indices)
+    repr_atom_pairs = zip(sym_data.equivalent_atoms[start_index:end_index],
+                          _indices)
 
     key = lambda x: x[0]
     for _, equiv_sites in groupby(sorted(repr_atom_pairs, key=key), key=key):
@@ -79,6 +80,26 @@ def find_inequivalent_coords(structure: Structure,
     return result
 
 
+def periodic_peak_indices(data: np.ndarray) -> np.ndarray:
+    """Grid indices of local maxima in periodic volumetric data.
+
+    A grid point is a peak when its value is the maximum among the 3x3x3
+    neighboring points with the periodic boundary condition and larger than
+    the minimum value, as skimage.feature.peak_local_max(min_distance=1) does.
+
+    Returns:
+        (N, 3) array of indices sorted by the values in descending order.
+    """
+    is_peak = maximum_filter(data, size=3, mode="wrap") == data
+    if np.all(is_peak):  # no peak for a constant data
+        return np.empty((0, 3), dtype=int)
+    is_peak &= data > data.min()
+
+    indices = np.argwhere(is_peak)
+    order = np.argsort(-data[tuple(indices.T)], kind="stable")
+    return indices[order]
+
+
 class ChargeDensityAnalyzer:
     """
     Analyzer to find potential interstitial sites based on charge density. The
@@ -131,21 +152,21 @@ class ChargeDensityAnalyzer:
     def _get_charge_distribution_df(self):
         """
         Return a complete table of fractional coordinates - charge density.
-        """
-        # Fraction coordinates and corresponding indices
-        axis_grid = np.array([np.array(self.chgcar.get_axis_grid(i)) / self.structure.lattice.abc[i] for i in range(3)])
-        axis_index = np.array([range(len(axis_grid[i])) for i in range(3)])
-
-        data = {}
 
-        for index in itertools.product(*axis_index):
-            a, b, c = index
-            f_coords = (axis_grid[0][a], axis_grid[1][b], axis_grid[2][c])
-            data[f_coords] = self.chgcar.data["total"][a][b][c]
+        The rows are in the C order of the volumetric data, i.e., the same as
+        iterating the a, b, and c indices in this order.
+        """
+        total = self.chgcar.data["total"]
+        # Fraction coordinates along each axis
+        axis_grid = [np.array(self.chgcar.get_axis_grid(i))
+                     / self.structure.lattice.abc[i] for i in range(3)]
+        indices = np.unravel_index(np.arange(total.size), total.shape)
 
         # Fraction coordinates - charge density table
-        df = pd.Series(data).reset_index()
-        df.columns = ["a", "b", "c", "Charge Density"]
+        df = pd.DataFrame({"a": axis_grid[0][indices[0]],
+                           "b": axis_grid[1][indices[1]],
+                           "c": axis_grid[2][indices[2]],
+                           "Charge Density": total.ravel()})
         self._charge_distribution_df = df
 
         return df
@@ -168,15 +189,18 @@ class ChargeDensityAnalyzer:
             logger.info(f"Find {len(df)} {extrema_type}.")
             return
 
-        data = {}
         unit = 1 / np.array(self.chgcar.dim)  # pixel along a, b, c
-
-        for fc in f_coords:
-            a, b, c = tuple(map(int, fc / unit))
-            data[tuple(fc)] = self.chgcar.data["total"][a][b][c]
-
-        df = pd.Series(data).reset_index()
-        df.columns = ["a", "b", "c", "Charge Density"]
+        coords = np.array(f_coords, dtype=float).reshape(-1, 3)
+        # The small shift avoids picking up the lower neighboring grid point
+        # for the coordinates on the grid points due to the rounding error.
+        a, b, c = (np.floor(coords / unit + 1e-6).astype(int)
+                   % self.chgcar.dim).T
+
+        df = pd.DataFrame({"a": coords[:, 0],
+                           "b": coords[:, 1],
+                           "c": coords[:, 2],
+                           "Charge Density": self.chgcar.data["total"][a, b, c]})
+        df = df.drop_duplicates(subset=["a", "b", "c"], ignore_index=True)
         ascending = extrema_type == "local minima"
 
         if threshold_abs is None:
@@ -188,10 +212,7 @@ class ChargeDensityAnalyzer:
             df = df.sort_values(by="Charge Density", ascending=ascending)
             df = df[df["Charge Density"] <= threshold_abs] if ascending else df[df["Charge Density"] >= threshold_abs]
 
-        extrema_coords = []
-        for row in df.iterrows():
-            fc = np.array(row[1]["a":"c"])
-            extrema_coords.append(fc)
+        extrema_coords = list(df[["a", "b", "c"]].to_numpy())
 
         self._extrema_df = df
         self.extrema_type = extrema_type
@@ -229,27 +250,13 @@ class ChargeDensityAnalyzer:
             extrema_coords (list): list of fractional coordinates corresponding
                 to local extrema.
         """
-        try:
-            from skimage.feature import peak_local_max
-        except ImportError:
-            logger.warning("To find the extrema of the coordinates, "
-                           "install scikit-image.")
-            raise
-
         sign, extrema_type = 1, "local maxima"
 
         if find_min:
             sign, extrema_type = -1, "local minima"
 
-        # Make 3x3x3 supercell
-        # This is a trick to resolve the periodical boundary issue.
         total_chg = sign * self.chgcar.data["total"]
-        total_chg = np.tile(total_chg, reps=(3, 3, 3))
-        coordinates = peak_local_max(total_chg, min_distance=1)
-
-        # Remove duplicated sites introduced by supercell.
-        f_coords = [coord / total_chg.shape * 3 for coord in coordinates]
-        f_coords = [f - 1 for f in f_coords if all(np.array(f) < 2) and all(np.array(f) >= 1)]
+        f_coords = list(periodic_peak_indices(total_chg) / total_chg.shape)
 
         # Update information
         self._update_extrema(
@@ -279,29 +286,17 @@ class ChargeDensityAnalyzer:
             self._update_extrema(new_f_coords, self.extrema_type)
             return new_f_coords
 
-        # Manually generate the distance matrix (which needs to take into
-        # account PBC.
-        dist_matrix = np.array(lattice.get_all_distances(vf_coords, vf_coords))
-        dist_matrix = (dist_matrix + dist_matrix.T) / 2
-
-        for i in range(len(dist_matrix)):
-            dist_matrix[i, i] = 0
-        condensed_m = squareform(dist_matrix)
-        z = linkage(condensed_m)
-        cn = fcluster(z, tol, criterion="distance")
-        merged_fcoords = []
-
-        for n in set(cn):
-            frac_coords = []
-            for i, j in enumerate(np.where(cn == n)[0]):
-                if i == 0:
-                    frac_coords.append(self.extrema_coords[j])
-                else:
-                    f_coords = self.extrema_coords[j]
-                    # We need the image to combine the frac_coords properly.
-                    d, image = lattice.get_distance_and_image(frac_coords[0], f_coords)
-                    frac_coords.append(f_coords + image)
-            merged_fcoords.append(np.average(frac_coords, axis=0))
+        vf_coords = np.array(vf_coords, dtype=float)
+        labels = periodic_cluster_labels(lattice, vf_coords, tol)
+        # The first members of clusters are the references of the images.
+        _, first_members = np.unique(labels, return_index=True)
+        ref_coords = vf_coords[first_members][labels]
+        # We need the image to combine the frac_coords properly.
+        _, _, images = min_image_vectors(lattice, ref_coords, vf_coords)
+
+        sums = np.zeros((len(first_members), 3))
+        np.add.at(sums, labels, vf_coords + images)
+        merged_fcoords = list(sums / np.bincount(labels)[:, np.newaxis])
 
         merged_fcoords = [f - np.floor(f) for f in merged_fcoords]
         merged_fcoords = [f * (np.abs(f - 1) > 1e-15) for f in merged_fcoords]
@@ -413,27 +408,79 @@ class ChargeDensityAnalyzer:
 
         if self.extrema_type is None:
             self.get_local_extrema()
+        sphere = get_grid_sphere(self.structure.lattice, self.chgcar.dim, r)
+        total = self.chgcar.data["total"]
+        volume = self.structure.volume
         int_den = []
         for isite in self.extrema_coords:
-            mask = self._dist_mat(isite) < r
-            vol_sphere = self.chgcar.structure.volume * (mask.sum() / self.chgcar.ngridpts)
-            chg_in_sphere = np.sum(self.chgcar.data["total"] * mask) / mask.size / vol_sphere
-            int_den.append(chg_in_sphere)
+            indices = sphere.grid_indices(isite)
+            int_den.append(total.flat[indices].sum() / (volume * len(indices)))
         self._extrema_df["avg_charge_den"] = int_den
         self._extrema_df.sort_values(by=["avg_charge_den"], inplace=True)
         self._extrema_df.reset_index(drop=True, inplace=True)
 
-    def _dist_mat(self, pos_frac):
-        # return a matrix that contains the distances
-        aa = np.linspace(0, 1, len(self.chgcar.get_axis_grid(0)), endpoint=False)
-        bb = np.linspace(0, 1, len(self.chgcar.get_axis_grid(1)), endpoint=False)
-        cc = np.linspace(0, 1, len(self.chgcar.get_axis_grid(2)), endpoint=False)
-        AA, BB, CC = np.meshgrid(aa, bb, cc, indexing="ij")
-        dist_from_pos = self.chgcar.structure.lattice.get_all_distances(
-            np.vstack([AA.flatten(), BB.flatten(), CC.flatten()]).T,
-            pos_frac,
-        )
-        return dist_from_pos.reshape(AA.shape)
+
+class GridSphere:
+    """
+    Grid points of volumetric data inside a sphere with the periodic boundary
+    condition.
+
+    The integer offsets of the grid points that can be inside the sphere
+    around any point in a grid cell are prepared once, so that the grid
+    points around each center are obtained from those offsets only.
+    """
+
+    def __init__(self, lattice: Lattice, dim: Tuple[int, int, int],
+                 radius: float):
+        self.dim = np.array(dim)
+        self.radius = radius
+        self._matrix = lattice.matrix / self.dim[:, None]  # grid vectors
+        # Any point in a grid cell is within this distance from its corner.
+        corners = np.array(list(itertools.product([0, 1], repeat=3)))
+        max_shift = np.max(np.linalg.norm(corners @ self._matrix, axis=1))
+
+        rec_lengths = np.linalg.norm(lattice.inv_matrix, axis=0)
+        n_max = np.ceil((radius + max_shift) * rec_lengths * self.dim)
+        box = np.array(list(itertools.product(
+            *[range(-int(n), int(n) + 2) for n in n_max])))
+        lengths = np.linalg.norm(box @ self._matrix, axis=1)
+        self.offsets = box[lengths < radius + max_shift + 1e-8]
+        self._offset_cart = self.offsets @ self._matrix
+
+    def grid_indices(self, frac_coords) -> np.ndarray:
+        """Flat indices of the grid points within the radius from a point.
+
+        Each grid point appears once even when the sphere overlaps with its
+        periodic images.
+        """
+        grid_coords = np.array(frac_coords, dtype=float) * self.dim
+        origin = np.floor(grid_coords)
+        shift = (grid_coords - origin) @ self._matrix
+        distances = np.linalg.norm(self._offset_cart - shift, axis=1)
+        indices = (self.offsets[distances < self.radius]
+                   + origin.astype(int)) % self.dim
+        return np.unique(np.ravel_multi_index(indices.T, self.dim))
+
+
+_grid_sphere_cache: "OrderedDict[tuple, GridSphere]" = OrderedDict()
+_grid_sphere_cache_size = 8
+
+
+def get_grid_sphere(lattice: Lattice, dim: Tuple[int, int, int],
+                    radius: float) -> GridSphere:
+    """Return a GridSphere shared among the volumetric data on the same grid,
+    e.g., CHGCAR, LOCPOT, and ELFCAR of a calculation.
+    """
+    key = (np.round(lattice.matrix, 8).tobytes(), tuple(dim), float(radius))
+    if key in _grid_sphere_cache:
+        _grid_sphere_cache.move_to_end(key)
+        return _grid_sphere_cache[key]
+
+    result = GridSphere(lattice, dim, radius)
+    _grid_sphere_cache[key] = result
+    if len(_grid_sphere_cache) > _grid_sphere_cache_size:
+        _grid_sphere_cache.popitem(last=False)
+    return result
 
 
 def extrema_coords(volumetric_data: VolumetricData,
@@ -446,9 +493,6 @@ def extrema_coords(volumetric_data: VolumetricData,
     #                    "install pymatgen-analysis-defects code.")
     #     raise
 
-    logger.info("When using this code, cite the paper related to skimage. "
-                "see https://peerj.com/articles/453")
-
     result = ChargeDensityAnalyzer(chgcar=volumetric_data)
     result.get_local_extrema(threshold_frac=params.threshold_frac,
                              threshold_abs=params.threshold_abs,
@@ -1,9 +1,12 @@
 # -*- coding: utf-8 -*-
 #  Copyright (c) 2020 Kumagai group.
+from typing import Union
+
 from pydefect.analyzer.band_edge_states import PerfectBandEdgeState, EdgeInfo, \
     OrbitalInfo
 from pydefect.cli.vasp.make_band_edge_orbital_infos import \
     calc_orbital_character
+from pydefect.cli.vasp.read_vasprun import VasprunSummary
 from pymatgen.electronic_structure.core import Spin
 from vise.defaults import defaults as v_defaults
 from pymatgen.io.vasp import Procar, Vasprun, Outcar
@@ -11,7 +14,8 @@ from vise.analyzer.vasp.band_edge_properties import VaspBandEdgeProperties
 
 
 def make_perfect_band_edge_state_from_vasp(
-        procar: Procar, vasprun: Vasprun, outcar: Outcar
+        procar: Procar, vasprun: Union[Vasprun, VasprunSummary],
+        outcar: Outcar
 ) -> PerfectBandEdgeState:
 
     band_edge_prop = VaspBandEdgeProperties(vasprun, outcar,
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+#  Copyright (c) 2020 Kumagai group.
+"""Reader of the PROCAR projections within a band window.
+
+Only the blocks of the bands in the window are parsed while streaming the
+file, and the projections are stored in a binary sidecar file, e.g.,
+PROCAR.npz, which is used when the same file is read again.
+"""
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from monty.io import zopen
+from pymatgen.electronic_structure.core import Spin
+from vise.util.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class ProcarProjections:
+    """Projections on the ions and orbitals of the bands in a window.
+
+    data: {spin: np.ndarray of [k-idx, band-idx, ion-idx, orbital-idx]},
+          where band-idx is counted from lowest_band_index.
+    """
+    data: Dict[Spin, np.ndarray]
+    lowest_band_index: int  # python convention starting from 0.
+    orbitals: List[str]
+
+    @property
+    def highest_band_index(self) -> int:
+        return self.lowest_band_index + self.data[Spin.up].shape[1] - 1
+
+
+def sidecar_filename(filename: str) -> Path:
+    filename = Path(filename)
+    return filename.with_name(filename.name + ".npz")
+
+
+def _read_sidecar(filename: Path, band_range: Tuple[int, int]
+                  ) -> Optional[ProcarProjections]:
+    """Projections in the sidecar when it is up to date and covers the range.
+    """
+    sidecar = sidecar_filename(filename)
+    try:
+        if sidecar.stat().st_mtime_ns < filename.stat().st_mtime_ns:
+            return None
+        with np.load(sidecar) as npz:
+            lower, upper = npz["band_range"]
+            if band_range[0] < lower or upper < band_range[1]:
+                return None
+            bands = slice(band_range[0] - lower, band_range[1] + 1 - lower)
+            data = npz["data"][:, :, bands]
+            orbitals = npz["orbitals"].tolist()
+    except (OSError, ValueError, KeyError):
+        return None
+
+    logger.info(f"Projections of {filename} are read from {sidecar}.")
+    return ProcarProjections(data=dict(zip([Spin.up, Spin.down], data)),
+                             lowest_band_index=band_range[0],
+                             orbitals=orbitals)
+
+
+def _write_sidecar(filename: Path, projections: ProcarProjections) -> None:
+    sidecar = sidecar_filename(filename)
+    band_range = [projections.lowest_band_index,
+                  projections.highest_band_index]
+    try:
+        with open(sidecar, "wb") as f:
+            np.savez(f, data=np.stack(list(projections.data.values())),
+                     band_range=band_range,
+                     orbitals=projections.orbitals)
+    except OSError as e:
+        logger.warning(f"{sidecar} could not be written: {e}")
+
+
+def _parse_procar(filename: Path, band_range: Tuple[int, int]
+                  ) -> ProcarProjections:
+    """Stream the PROCAR and parse the first projection block of the bands
+    in the range, i.e., the absolute values for the phase-resolved or
+    noncollinear files. The blocks of the other bands are skipped.
+    """
+    lower, upper = band_range
+    data, orbitals = [], None
+    shape, num_ions, k_idx = None, None, None
+
+    with zopen(filename, mode="rb") as f:
+        for line in f:
+            if line.startswith(b"band"):
+                b_idx = int(line.split()[1]) - 1
+                if b_idx < lower or upper < b_idx:
+                    continue
+                header = next(f)
+                while not header.startswith(b"ion"):
+                    header = next(f)
+                if orbitals is None:
+                    orbitals = [o.decode() for o in header.split()[1:-1]]
+                if data[-1] is None:
+                    data[-1] = np.zeros(shape + (len(orbitals),),
+                                        dtype=np.float32)
+                values = np.array(b"".join(islice(f, num_ions)).split(),
+                                  dtype=np.float32)
+                # columns are the ion index, orbitals and total.
+                data[-1][k_idx, b_idx - lower] = \
+                    values.reshape(num_ions, -1)[:, 1:len(orbitals) + 1]
+            elif line.startswith(b" k-point"):
+                k_idx = int(line.split()[1]) - 1
+            elif line.startswith(b"# of k-points"):
+                num_k, total_bands, num_ions = \
+                    [int(i.split()[0]) for i in line.split(b":")[1:]]
+                if upper >= total_bands:
+                    raise ValueError(f"Band index {upper} is out of range of "
+                                     f"{total_bands} bands in {filename}.")
+                shape = (num_k, upper + 1 - lower, num_ions)
+                data.append(None)
+
+    if not data or data[0] is None:
+        raise ValueError(f"Projections are not found in {filename}.")
+    return ProcarProjections(data=dict(zip([Spin.up, Spin.down], data)),
+                             lowest_band_index=lower,
+                             orbitals=orbitals)
+
+
+def read_procar(filename: str,
+                band_range: Tuple[int, int],
+                use_sidecar: bool = True) -> ProcarProjections:
+    """Read the projections of the bands in band_range from a PROCAR file.
+
+    band_range: lowest and highest band indices (0-based) to be read, which
+                are usually determined from the eigenvalues in vasprun.xml.
+
+    When use_sidecar is True, the projections are read from the sidecar file
+    if it is up to date and covers the band range, and written in it
+    otherwise. The projections are stored in single precision.
+    """
+    filename = Path(filename)
+    band_range = (int(band_range[0]), int(band_range[1]))
+    if use_sidecar:
+        result = _read_sidecar(filename, band_range)
+        if result is not None:
+            return result
+
+    result = _parse_procar(filename, band_range)
+    if use_sidecar:
+        _write_sidecar(filename, result)
+    return result
@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+#  Copyright (c) 2020 Kumagai group.
+"""Lightweight reader of vasprun.xml.
+
+Only the quantities used in pydefect, namely the final structure, the
+eigenvalues and occupations, the k-points and their weights, the Fermi level
+and the information on the convergence, are extracted while the file is
+parsed incrementally. The blocks of the ionic and electronic steps, the
+density of states and the projected eigenvalues are discarded as soon as
+they are read, so the memory usage does not grow with the number of steps.
+"""
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple, FrozenSet
+
+import numpy as np
+from lxml import etree
+from monty.io import zopen
+from pymatgen.core import Structure, Element
+from pymatgen.electronic_structure.core import Spin
+from vise.util.logger import get_logger
+
+logger = get_logger(__name__)
+
+_tags = ["atominfo", "calculation", "dos", "eigenvalues",
+         "eigenvalues_kpoints_opt", "incar", "kpoints", "parameters",
+         "projected", "projected_kpoints_opt", "scstep", "set", "structure"]
+# Blocks of which the contents are not used.
+_skipped_tags = {"dos", "eigenvalues_kpoints_opt", "projected",
+                 "projected_kpoints_opt"}
+
+
+@dataclass
+class VasprunSummary:
+    """Subset of pymatgen.io.vasp.Vasprun used in pydefect.
+
+    The attribute names are the same as those of Vasprun, so that this can
+    be passed where the Vasprun is used for these quantities.
+    """
+    final_structure: Structure
+    eigenvalues: Dict[Spin, np.ndarray]  # [k-idx, band-idx, (e, occupation)]
+    actual_kpoints: List[Tuple[float, float, float]]
+    actual_kpoints_weights: List[float]
+    efermi: Optional[float]
+    incar: dict
+    parameters: dict
+    num_ionic_steps: int
+    # names of energies in each electronic step of the final ionic step.
+    final_electronic_steps: List[FrozenSet[str]] = field(default_factory=list)
+
+    @property
+    def converged_electronic(self) -> bool:
+        """Same as Vasprun.converged_electronic. """
+        if self.incar.get("ML_LMLFF"):
+            return True
+        steps = self.final_electronic_steps
+        if str(self.incar.get("ALGO", "")).lower() == "chi":
+            steps = []
+        if self.incar.get("LEPSILON"):
+            idx = 1
+            to_check = {"e_wo_entrp", "e_fr_energy", "e_0_energy"}
+            while set(steps[idx]) == to_check:
+                idx += 1
+            return idx + 1 != self.parameters["NELM"]
+        if str(self.incar.get("ALGO", "")).lower() == "exact" \
+                and self.incar.get("NELM") == 1:
+            return True
+        return len(steps) < self.parameters["NELM"]
+
+    @property
+    def converged_ionic(self) -> bool:
+        """Same as Vasprun.converged_ionic. """
+        nsw = self.parameters.get("NSW", 0)
+        ibrion = self.parameters.get("IBRION", -1 if nsw in (-1, 0) else 0)
+        if ibrion == 0:
+            return nsw <= 1 or self.num_ionic_steps == nsw
+        if ibrion in {1, 2} and self.parameters.get("EDIFFG", 1) == 0:
+            return nsw <= 1 or nsw == self.num_ionic_steps
+        return nsw <= 1 or self.num_ionic_steps < nsw
+
+
+def _parse_value(val_type: str, text: Optional[str]):
+    text = text.strip() if text else ""
+    if val_type == "string":
+        return text
+    if val_type == "logical":
+        return text == "T"
+    try:
+        return int(text) if val_type == "int" else float(text)
+    except ValueError:  # e.g., ***** for an overflowed integer.
+        return None
+
+
+def _parse_params(elem) -> dict:
+    result = {}
+    for c in elem.iter("i", "v"):
+        name = c.attrib.get("name", "").strip()
+        val_type = c.attrib.get("type", "")
+        if c.tag == "i":
+            value = _parse_value(val_type, c.text)
+        elif val_type == "string":
+            value = (c.text or "").split()
+        else:
+            value = [_parse_value(val_type, i) for i in (c.text or "").split()]
+        # The duplicated parameters in the later blocks, e.g., those in
+        # "response functions", do not override the former ones.
+        result.setdefault(name, value)
+    return result
+
+
+def _parse_array(varray) -> np.ndarray:
+    return np.array(" ".join(v.text for v in varray).split(),
+                    dtype=float).reshape(len(varray), -1)
+
+
+def _parse_atomic_symbols(elem) -> List[str]:
+    def parse_atomic_symbol(symbol: str) -> str:
+        try:
+            return str(Element(symbol))
+        # vasprun.xml uses "X" instead of "Xe" for Xenon
+        except ValueError:
+            return {"X": "Xe", "r": "Zr"}[symbol]
+
+    atoms = elem.find("array[@name='atoms']/set")
+    return [parse_atomic_symbol(rc.find("c").text.strip()) for rc in atoms]
+
+
+def _parse_structure(elem, symbols: List[str]) -> Structure:
+    lattice = _parse_array(elem.find("crystal/varray[@name='basis']"))
+    positions = _parse_array(elem.find("varray[@name='positions']"))
+    structure = Structure(lattice, symbols, positions)
+    selective = elem.find("varray[@name='selective']")
+    if selective is not None:
+        structure.add_site_property(
+            "selective_dynamics",
+            [[i == "T" for i in v.text.split()] for v in selective])
+    return structure
+
+
+def _parse_kpoints(elem) -> Tuple[List[Tuple[float, float, float]],
+                                  List[float]]:
+    kpoints = _parse_array(elem.find("varray[@name='kpointlist']"))
+    weights = _parse_array(elem.find("varray[@name='weights']"))
+    return [tuple(k) for k in kpoints.tolist()], weights.flatten().tolist()
+
+
+def _parse_eigenvalues(elem) -> Dict[Spin, np.ndarray]:
+    result = {}
+    for spin_set in elem.find("array/set").findall("set"):
+        spin = Spin.up if spin_set.attrib["comment"] == "spin 1" else Spin.down
+        by_kpt = [np.array(" ".join(r.text for r in k_set).split(),
+                           dtype=float).reshape(-1, 2)
+                  for k_set in spin_set.findall("set")]
+        result[spin] = np.array(by_kpt)
+    return result
+
+
+def _clear(elem) -> None:
+    elem.clear()
+    while elem.getprevious() is not None:
+        del elem.getparent()[0]
+
+
+def read_vasprun(filename: str) -> VasprunSummary:
+    """Extract the quantities used in pydefect from vasprun.xml.
+
+    When the file is truncated, e.g., the calculation is still running, the
+    quantities read until then are returned, as in Vasprun.
+    """
+    symbols, final_structure = None, None
+    kpoints, weights, eigenvalues, efermi = None, None, None, None
+    incar, parameters = {}, {}
+    num_ionic_steps, electronic_steps, final_electronic_steps = 0, [], []
+    skip_depth = 0
+
+    with zopen(filename, mode="rb") as f:
+        try:
+            for event, elem in etree.iterparse(f, events=("start", "end"),
+                                               tag=_tags):
+                tag = elem.tag
+                if event == "start":
+                    if tag in _skipped_tags:
+                        skip_depth += 1
+                    elif tag == "calculation":
+                        electronic_steps = []
+                    continue
+
+                if tag in _skipped_tags:
+                    skip_depth -= 1
+                    if tag == "dos":
+                        e = elem.find("i[@name='efermi']")
+                        efermi = float(e.text) if e is not None else None
+                    _clear(elem)
+                elif skip_depth:
+                    if tag == "set":
+                        elem.clear()
+                elif tag == "eigenvalues":
+                    eigenvalues = _parse_eigenvalues(elem)
+                    _clear(elem)
+                elif tag == "scstep":
+                    electronic_steps.append(frozenset(
+                        i.attrib["name"] for i in elem.findall("energy/i")))
+                    _clear(elem)
+                elif tag == "calculation":
+                    num_ionic_steps += 1
+                    final_electronic_steps = electronic_steps
+                    _clear(elem)
+                elif tag == "structure":
+                    name = elem.attrib.get("name")
+                    if name == "initialpos" and final_structure is None \
+                            or name == "finalpos":
+                        final_structure = _parse_structure(elem, symbols)
+                elif tag == "kpoints" and kpoints is None:
+                    kpoints, weights = _parse_kpoints(elem)
+                elif tag == "atominfo":
+                    symbols = _parse_atomic_symbols(elem)
+                elif tag == "incar":
+                    incar = _parse_params(elem)
+                elif tag == "parameters":
+                    parameters = _parse_params(elem)
+                    _clear(elem)
+        except etree.XMLSyntaxError:
+            logger.warning(f"{filename} is malformed. Parsing has stopped but "
+                           f"partial data is available.")
+
+    return VasprunSummary(final_structure=final_structure,
+                          eigenvalues=eigenvalues,
+                          actual_kpoints=kpoints,
+                          actual_kpoints_weights=weights,
+                          efermi=efermi,
+                          incar=incar,
+                          parameters=parameters,
+                          num_ionic_steps=num_ionic_steps,
+                          final_electronic_steps=final_electronic_steps)
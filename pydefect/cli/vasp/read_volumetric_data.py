@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+#  Copyright (c) 2020 Kumagai group.
+"""Reader of volumetric data files such as CHGCAR and LOCPOT.
+
+Once a file is parsed, its grid values are stored in a binary sidecar file,
+e.g., CHGCAR.npy, which is memory-mapped when the same file is read again.
+"""
+import warnings
+from pathlib import Path
+from typing import Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+from monty.io import zopen
+from pymatgen.io.vasp import Chgcar, Poscar, VolumetricData
+from vise.util.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Keys of the data in pymatgen.io.vasp.VolumetricData by the number of sets.
+data_keys = {1: ["total"],
+             2: ["total", "diff"],
+             5: ["total", "diff_x", "diff_y", "diff_z", "diff"]}
+
+
+def sidecar_filename(filename: str) -> Path:
+    filename = Path(filename)
+    return filename.with_name(filename.name + ".npy")
+
+
+def _read_poscar(file) -> Poscar:
+    lines = []
+    while True:
+        line = file.readline()
+        if not line:
+            raise ValueError("Couldn't parse Poscar from volumetric data file.")
+        line = line.strip()
+        if not line and lines:
+            return Poscar.from_str(b"\n".join(lines).decode("utf-8"))
+        lines.append(line)
+
+
+def _read_grid_dims(file) -> Optional[Tuple[int, ...]]:
+    line = file.readline()
+    while line and not line.strip():
+        line = file.readline()
+    return tuple(int(i) for i in line.split()) if line else None
+
+
+def _read_sidecar(filename: Path) -> Optional[Chgcar]:
+    """Chgcar with the memory-mapped data when the sidecar is up to date.
+
+    The sidecar must not be older than the file, and the grid written in the
+    file must be the same as that of the sidecar.
+    """
+    sidecar = sidecar_filename(filename)
+    try:
+        if sidecar.stat().st_mtime_ns < filename.stat().st_mtime_ns:
+            return None
+        stacked = np.load(sidecar, mmap_mode="r")
+    except (OSError, ValueError):
+        return None
+
+    with zopen(filename, mode="rb") as f:
+        poscar = _read_poscar(f)
+        dims = _read_grid_dims(f)
+    if stacked.shape[1:] != dims or len(stacked) not in data_keys:
+        return None
+
+    logger.info(f"Data of {filename} are read from {sidecar}.")
+    data = dict(zip(data_keys[len(stacked)], stacked))
+    return Chgcar(poscar, data)
+
+
+def _write_sidecar(filename: Path, data: dict) -> None:
+    sidecar = sidecar_filename(filename)
+    try:
+        np.save(sidecar, np.stack(list(data.values())))
+    except OSError as e:
+        logger.warning(f"{sidecar} could not be written: {e}")
+
+
+def read_volumetric_data(filename: str, use_sidecar: bool = True) -> Chgcar:
+    """Read a volumetric data file written in the CHGCAR format.
+
+    When use_sidecar is True, the grid values are memory-mapped from the
+    sidecar file if it is up to date, and written in it otherwise. The data
+    read from the sidecar do not contain the augmentation occupancies.
+    """
+    filename = Path(filename)
+    if use_sidecar:
+        result = _read_sidecar(filename)
+        if result is not None:
+            return result
+
+    poscar, data, data_aug = VolumetricData.parse_file(str(filename))
+    if use_sidecar:
+        _write_sidecar(filename, data)
+    return Chgcar(poscar, data, data_aug=data_aug)
+
+
+def sum_volumetric_data(volumetric_data: Iterable[VolumetricData]
+                        ) -> VolumetricData:
+    """Sum up the volumetric data, e.g., AECCAR0 and AECCAR2.
+
+    Unlike the + operator of VolumetricData, the sum is accumulated in place
+    in one set of arrays. The data are pulled one by one, so a generator that
+    reads the files keeps at most one of them in memory besides the sum.
+    """
+    if isinstance(volumetric_data, Sequence) and len(volumetric_data) == 1:
+        return volumetric_data[0]
+
+    iterator = iter(volumetric_data)
+    first = next(iterator)
+    structure = first.structure
+    data = {k: np.array(v, dtype=float) for k, v in first.data.items()}
+    del first
+
+    for other in iterator:
+        if structure != other.structure:
+            warnings.warn("Structures are different. Make sure you know "
+                          "what you are doing...")
+        if list(data) != list(other.data):
+            raise ValueError("Data have different keys! Maybe one is "
+                             "spin-polarized and the other is not?")
+        for k, v in data.items():
+            v += other.data[k]
+        del other
+    return Chgcar(Poscar(structure), data)
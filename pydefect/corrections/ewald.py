@@ -1,7 +1,10 @@
 # -*- coding: utf-8 -*-
 #  Copyright (c) 2020. Distributed under the terms of the MIT License.
-from functools import reduce
+import hashlib
+import time
+from collections import OrderedDict
 from math import sqrt, pow, ceil
+from pathlib import Path
 from typing import List, Optional
 
 import numpy as np
@@ -11,6 +14,13 @@ from numpy.linalg import norm, inv, det
 from pydefect.defaults import defaults
 from scipy.special import erfc
 from scipy.stats import mstats
+from vise.util.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+# Maximum number of (site, vector) pairs evaluated at once in batched sums.
+_max_chunk_elements = 2 ** 21
 
 
 def grid_number(lattice_vectors: np.ndarray, max_length: float):
@@ -55,38 +65,111 @@ class Ewald(MSONable):
         self.mod_ewald_param = self.ewald_param / self.cube_root_vol * self.root_epsilon
         # 2nd term in Eq.(14) in YK2014, caused by finite gaussian charge.
         self.diff_pot = -0.25 / self.volume / self.mod_ewald_param ** 2
+        self._rec_weights = None
+        self._lattice_energy = None
+
+    @classmethod
+    def from_optimized_param(cls,
+                             lattice: np.ndarray,
+                             dielectric_tensor: np.ndarray,
+                             accuracy: float = defaults.ewald_accuracy,
+                             num_trials: int = 201) -> "Ewald":
+        """Ewald object with the parameter minimizing the number of vectors.
+
+        The cutoffs of both sums are determined by accuracy, so the error
+        level is kept, while the balance between the real and reciprocal
+        sums is scanned from 1/10 to 10 times the default parameter.
+        """
+        default = cls(lattice, dielectric_tensor, accuracy)
+        params = default.ewald_param * np.logspace(-1, 1, num_trials)
+        trials = [default] + [cls(lattice, dielectric_tensor, accuracy, p)
+                              for p in params]
+        result = min(trials, key=lambda x: x.num_r_vectors + x.num_g_vectors)
+        logger.info(
+            f"Ewald parameter is optimized from {default.ewald_param:.4f} to "
+            f"{result.ewald_param:.4f}. Number of vectors: "
+            f"{default.num_r_vectors + default.num_g_vectors} -> "
+            f"{result.num_r_vectors + result.num_g_vectors}.")
+        return result
 
     def atomic_site_potential(self, rel_coord):
         real_part = self.ewald_real(include_self=True, shift=rel_coord)
         rec_part = self.ewald_rec(rel_coord)
         return real_part + rec_part + self.diff_pot
 
+    def atomic_site_potentials(self, rel_coords) -> np.ndarray:
+        """Potentials at many sites caused by a point charge at the origin.
+
+        rel_coords: (N, 3) fractional coordinates relative to the point charge.
+
+        The real-space part is evaluated for blocks of sites at once and the
+        reciprocal part is obtained as a structure factor, i.e., a product of
+        the cosine phase matrix and the G-vector weights computed only once.
+        """
+        rel_coords = np.array(rel_coords, dtype=float).reshape(-1, 3)
+        cart_coords = dot(rel_coords, self.lattice)
+        lattice_points = dot(self.xyz(self.r_vector_nums), self.lattice)
+        g_vectors, weights = self.g_lattice_set(), self.rec_weights
+
+        result = np.empty(len(rel_coords))
+        chunk = max(1, _max_chunk_elements // max(len(lattice_points),
+                                                   len(g_vectors)))
+        for i in range(0, len(rel_coords), chunk):
+            c = cart_coords[i:i + chunk]
+            r = lattice_points[np.newaxis, :, :] - c[:, np.newaxis, :]
+            root_r_inv_epsilon_r = sqrt(np.einsum("nmi,ij,nmj->nm",
+                                                  r, self.epsilon_inv, r))
+            real_part = np.sum(erfc(self.mod_ewald_param * root_r_inv_epsilon_r)
+                               / root_r_inv_epsilon_r, axis=1)
+            rec_part = dot(cos(dot(c, g_vectors.T)), weights)
+            result[i:i + chunk] = (real_part / (4 * pi * self.root_epsilon)
+                                   + rec_part / self.volume)
+        return result + self.diff_pot
+
     @property
     def lattice_energy(self):
-        real_part = self.ewald_real(include_self=False, shift=[0, 0, 0])
-        rec_part = self.ewald_rec([0, 0, 0])
-        return (real_part + rec_part + self.diff_pot + self.self_pot) / 2
+        if self._lattice_energy is None:
+            real_part = self.ewald_real(include_self=False, shift=[0, 0, 0])
+            rec_part = self.ewald_rec([0, 0, 0])
+            self._lattice_energy = \
+                (real_part + rec_part + self.diff_pot + self.self_pot) / 2
+        return self._lattice_energy
 
     @property
     def self_pot(self):
         return - self.mod_ewald_param / (2.0 * pi * sqrt(pi * self.det_epsilon))
 
     def ewald_real(self, include_self: bool, shift: List[float]) -> float:
-        summed = 0
-        for r in self.r_lattice_set(include_self, shift):
-            root_r_inv_epsilon_r = sqrt(reduce(dot, [r.T, self.epsilon_inv, r]))
-            summed += erfc(self.mod_ewald_param * root_r_inv_epsilon_r) / root_r_inv_epsilon_r
+        r = self.r_lattice_set(include_self, shift)
+        root_r_inv_epsilon_r = sqrt(self._quadratic_form(r, self.epsilon_inv))
+        summed = np.sum(erfc(self.mod_ewald_param * root_r_inv_epsilon_r)
+                        / root_r_inv_epsilon_r)
         return summed / (4 * pi * self.root_epsilon)
 
     def ewald_rec(self, coord) -> float:
         cart_coord = dot(coord, self.lattice)
-        summed = 0
-        for g in self.g_lattice_set():
-            g_epsilon_g = reduce(dot, [g.T, self.dielectric_tensor, g])
-            summed += (exp(- g_epsilon_g / 4 / self.mod_ewald_param ** 2)
-                       / g_epsilon_g * cos(dot(g, cart_coord)))
+        summed = np.sum(self.rec_weights
+                        * cos(dot(self.g_lattice_set(), cart_coord)))
         return summed / self.volume
 
+    @property
+    def rec_weights(self) -> np.ndarray:
+        """Gaussian weights of G-vectors, exp(-GεG / 4γ^2) / GεG.
+
+        Computed once and reused for all the sites.
+        """
+        if self._rec_weights is None:
+            g = self.g_lattice_set()
+            g_epsilon_g = self._quadratic_form(g, self.dielectric_tensor)
+            self._rec_weights = (exp(- g_epsilon_g / 4 / self.mod_ewald_param ** 2)
+                                 / g_epsilon_g)
+        return self._rec_weights
+
+    @staticmethod
+    def _quadratic_form(vectors: np.ndarray, tensor: np.ndarray) -> np.ndarray:
+        """Return v.T @ tensor @ v for each row vector v in vectors."""
+        return np.einsum("ij,jk,ik->i", vectors, tensor, vectors)
+
     def r_lattice_set(self,
                       include_self: bool = True,
                       shift: List[float] = None) -> np.ndarray:
@@ -108,6 +191,26 @@ class Ewald(MSONable):
         z = np.arange(-nums[2], nums[2] + 1, 1) - shift[2]
         return np.array(np.meshgrid(x, y, z)).T.reshape(-1, 3)
 
+    @property
+    def num_r_vectors(self) -> int:
+        return int(np.prod([2 * n + 1 for n in self.r_vector_nums]))
+
+    @property
+    def num_g_vectors(self) -> int:
+        return int(np.prod([2 * n + 1 for n in self.g_vector_nums])) - 1
+
+    def sum_statistics(self) -> dict:
+        """Numbers of vectors and timings in sec of the real and rec sums."""
+        t0 = time.perf_counter()
+        self.ewald_real(include_self=False, shift=[0, 0, 0])
+        t1 = time.perf_counter()
+        self.ewald_rec([0, 0, 0])
+        t2 = time.perf_counter()
+        return {"num_r_vectors": self.num_r_vectors,
+                "num_g_vectors": self.num_g_vectors,
+                "real_time": t1 - t0,
+                "rec_time": t2 - t1}
+
     @property
     def r_vector_nums(self) -> List[int]:
         max_length = self.accuracy / self.mod_ewald_param
@@ -118,3 +221,88 @@ class Ewald(MSONable):
         max_length = 2 * self.mod_ewald_param * self.accuracy
         return [ceil(max_length / norm(self.rec_lattice[i])) for i in range(3)]
 
+    @property
+    def cache_key(self) -> str:
+        return ewald_cache_key(self.lattice, self.dielectric_tensor,
+                               self.accuracy, self.ewald_param)
+
+    def to_npz_file(self, filename: Path) -> None:
+        np.savez(filename,
+                 lattice=self.lattice,
+                 dielectric_tensor=self.dielectric_tensor,
+                 accuracy=self.accuracy,
+                 ewald_param=self.ewald_param,
+                 lattice_energy=self.lattice_energy,
+                 rec_weights=self.rec_weights)
+
+    @classmethod
+    def from_npz_file(cls, filename: Path) -> "Ewald":
+        with np.load(filename) as d:
+            result = cls(d["lattice"], d["dielectric_tensor"],
+                         accuracy=float(d["accuracy"]),
+                         ewald_param=float(d["ewald_param"]))
+            result._lattice_energy = float(d["lattice_energy"])
+            result._rec_weights = d["rec_weights"]
+        return result
+
+
+def ewald_cache_key(lattice: np.ndarray,
+                    dielectric_tensor: np.ndarray,
+                    accuracy: float,
+                    ewald_param: Optional[float] = None) -> str:
+    """Content hash of the quantities that determine the Ewald sums.
+
+    The lattice and dielectric tensor are rounded so that the tiny numerical
+    noise of those written in different json files does not matter.
+    """
+    h = hashlib.sha256()
+    for array in (lattice, dielectric_tensor):
+        h.update(np.round(np.array(array, dtype=float), 8).tobytes())
+    h.update(repr((float(accuracy), ewald_param and float(ewald_param)))
+             .encode())
+    return h.hexdigest()
+
+
+_ewald_cache: "OrderedDict[str, Ewald]" = OrderedDict()
+_ewald_cache_size = 16
+
+
+def get_ewald(lattice: np.ndarray,
+              dielectric_tensor: np.ndarray,
+              accuracy: float = defaults.ewald_accuracy,
+              ewald_param: Optional[float] = None,
+              cache_dir: Optional[Path] = None,
+              optimize_param: bool = False) -> Ewald:
+    """Return an Ewald object shared among the calls with the same inputs.
+
+    Objects are kept in an in-process LRU cache. When cache_dir is given,
+    the Ewald parameter, lattice energy and G-vector weights are also stored
+    in an ewald_*.npz file there, so that they are reused over processes,
+    e.g., the directory containing supercell_info.json.
+
+    When optimize_param is True and ewald_param is not given, the parameter
+    is chosen with Ewald.from_optimized_param.
+    """
+    if optimize_param and ewald_param is None:
+        ewald_param = Ewald.from_optimized_param(
+            lattice, dielectric_tensor, accuracy).ewald_param
+
+    key = ewald_cache_key(lattice, dielectric_tensor, accuracy, ewald_param)
+    if key in _ewald_cache:
+        _ewald_cache.move_to_end(key)
+        return _ewald_cache[key]
+
+    filename = Path(cache_dir) / f"ewald_{key[:16]}.npz" if cache_dir else None
+    if filename and filename.exists():
+        logger.info(f"Ewald parameters are read from {filename}.")
+        ewald = Ewald.from_npz_file(filename)
+    else:
+        ewald = Ewald(lattice, dielectric_tensor, accuracy, ewald_param)
+        if filename:
+            logger.info(f"Ewald parameters are written to {filename}.")
+            ewald.to_npz_file(filename)
+
+    _ewald_cache[key] = ewald
+    if len(_ewald_cache) > _ewald_cache_size:
+        _ewald_cache.popitem(last=False)
+    return ewald
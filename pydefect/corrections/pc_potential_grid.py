@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+#  Copyright (c) 2020. Distributed under the terms of the MIT License.
+from itertools import product
+from math import ceil
+from typing import Optional, Tuple
+
+import numpy as np
+from numpy import dot, pi, sqrt
+from numpy.linalg import norm
+from scipy.ndimage import map_coordinates, spline_filter
+from scipy.special import erfc
+from vise.util.logger import get_logger
+
+from pydefect.corrections.ewald import Ewald
+
+logger = get_logger(__name__)
+
+# Range of periodic images in which the short-range part is evaluated.
+_image_range = 2
+
+
+class PointChargePotentialGrid:
+    """Tabulated periodic potential of a point charge for fast interpolation.
+
+    The potential caused by a point charge at the origin is written as
+    V(x) = V_smooth(x) + s(x), where
+    s(x) = sum_R erfc(γ' q_R) / q_R / (4π sqrt(det ε)) with q_R the
+    anisotropic distance to the image R. γ' is chosen such that s is
+    negligible beyond the neighboring images, so that V_smooth is smooth and
+    periodic. V_smooth is tabulated once on a fractional-coordinate grid and
+    interpolated with a periodic tricubic spline, while s is evaluated
+    exactly from the neighboring images.
+
+    error_estimate:
+        Maximum absolute deviation of interpolated potentials from the exact
+        ones, estimated at the centers of grid cells, where the
+        interpolation error is the largest.
+    """
+
+    def __init__(self,
+                 ewald: Ewald,
+                 grid_size: Optional[Tuple[int, int, int]] = None,
+                 grid_spacing: float = 0.5,
+                 num_check_points: int = 128):
+        self.ewald = ewald
+        lattice = np.array(ewald.lattice, dtype=float)
+        self.grid_size = tuple(grid_size or
+                               [ceil(norm(v) / grid_spacing) for v in lattice])
+        self._images = dot(np.array(list(product(range(-_image_range,
+                                                       _image_range + 1),
+                                                 repeat=3))), lattice)
+        # Images outside the range are farther than (range + 1/2) times the
+        # shortest interplanar distance measured with the dielectric metric,
+        # where erfc(γ'q) is less than erfc(4) ~ 1.5e-8.
+        rec_lattice = np.linalg.inv(lattice).T
+        plane_distances = 1 / sqrt(np.einsum("ij,jk,ik->i", rec_lattice,
+                                             ewald.dielectric_tensor,
+                                             rec_lattice))
+        self.short_range_param = \
+            4.0 / ((_image_range + 0.5) * min(plane_distances))
+
+        grid_coords = np.array(list(product(*[np.arange(n) / n
+                                              for n in self.grid_size])))
+        # potential is singular at the origin, where only the limit of the
+        # smooth part is needed.
+        pot = ewald.atomic_site_potentials(grid_coords[1:])
+        smooth = pot - self._short_range_potentials(grid_coords[1:])
+        smooth_at_origin = self._smooth_potential_at_origin()
+        self.data = np.concatenate([[smooth_at_origin], smooth]).reshape(
+            self.grid_size)
+        self._coeffs = spline_filter(self.data, order=3, mode="grid-wrap")
+        self.error_estimate = self._estimate_error(num_check_points)
+        logger.info(f"Point-charge potential grid {self.grid_size} is built. "
+                    f"Estimated error is {self.error_estimate:.2e}.")
+
+    def potentials(self, rel_coords) -> np.ndarray:
+        """Interpolated potentials at sites relative to the point charge.
+
+        rel_coords: (N, 3) fractional coordinates; must not be at the origin.
+        """
+        rel_coords = np.array(rel_coords, dtype=float).reshape(-1, 3)
+        indices = (rel_coords % 1.0 * self.grid_size).T
+        smooth = map_coordinates(self._coeffs, indices, order=3,
+                                 mode="grid-wrap", prefilter=False)
+        return smooth + self._short_range_potentials(rel_coords)
+
+    def _quadratic_form(self, vectors: np.ndarray) -> np.ndarray:
+        return np.einsum("...i,ij,...j->...", vectors, self.ewald.epsilon_inv,
+                         vectors)
+
+    def _short_range_potentials(self, rel_coords: np.ndarray) -> np.ndarray:
+        wrapped = rel_coords - np.round(rel_coords)
+        cart = dot(wrapped, self.ewald.lattice)
+        q = sqrt(self._quadratic_form(cart[:, np.newaxis, :]
+                                      - self._images[np.newaxis, :, :]))
+        summed = np.sum(erfc(self.short_range_param * q) / q, axis=1)
+        return summed / (4 * pi * self.ewald.root_epsilon)
+
+    def _smooth_potential_at_origin(self) -> float:
+        """Limit of V(x) - s(x) at x -> 0.
+
+        The contribution of the image at the origin is
+        (erfc(γq) - erfc(γ'q)) / q -> 2 (γ' - γ) / sqrt(π).
+        """
+        e = self.ewald
+        images = self._images[np.any(self._images != 0, axis=1)]
+        q = sqrt(self._quadratic_form(images))
+        real_part = e.ewald_real(include_self=False, shift=[0, 0, 0])
+        real_part += ((2 * (self.short_range_param - e.mod_ewald_param)
+                       / sqrt(pi) - np.sum(erfc(self.short_range_param * q) / q))
+                      / (4 * pi * e.root_epsilon))
+        return real_part + e.ewald_rec([0, 0, 0]) + e.diff_pot
+
+    def _estimate_error(self, num_check_points: int) -> float:
+        rng = np.random.default_rng(0)
+        cells = rng.integers(0, self.grid_size, size=(num_check_points, 3))
+        coords = (cells + 0.5) / self.grid_size
+        exact = self.ewald.atomic_site_potentials(coords)
+        return float(np.max(np.abs(self.potentials(coords) - exact)))
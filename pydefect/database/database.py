@@ -10,6 +10,9 @@ logger = get_logger(__name__)
 
 electroneg_data = loadfn(Path(__file__).parent / "electronegativity.yaml")
 oxi_state_data = loadfn(Path(__file__).parent / "oxidation_state.yaml")
+point_group_data = loadfn(Path(__file__).parent / "point_group.yaml")
+_subgroups = {pg: frozenset(v["subgroups"])
+              for pg, v in point_group_data.items()}
 
 
 def electronegativity(element):
@@ -25,3 +28,15 @@ def oxidation_state(element):
         oxi_state_data[element] = 0
     return oxi_state_data[element]
 
+
+def num_symmetry_operation(point_group: str) -> int:
+    """Number of symmetry operations of a point group, e.g., 48 for m-3m.
+
+    "." is removed from the given point group, e.g., ..6 -> 6.
+    """
+    point_group = point_group.replace(".", "")
+    return point_group_data[point_group]["num_sym_ops"]
+
+
+def is_proper_subgroup(subgroup: str, group: str) -> bool:
+    return subgroup in _subgroups[group]
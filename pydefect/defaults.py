@@ -29,6 +29,7 @@ class Defaults(DefaultsBase):
         self._abs_strange_energy = 100.0
         self._localized_orbital_radius = 3.0
         self._localized_orbital_fraction_wrt_uniform = 0.7
+        self._symmetry_cache_dir = None
 
         self.set_user_settings(yaml_filename="pydefect.yaml")
 
@@ -104,5 +105,9 @@ class Defaults(DefaultsBase):
     def localized_orbital_fraction_wrt_uniform(self):
         return self._localized_orbital_fraction_wrt_uniform
 
+    @property
+    def symmetry_cache_dir(self):
+        return self._symmetry_cache_dir
+
 
 defaults = Defaults()
@@ -6,8 +6,8 @@ import numpy as np
 from numpy.linalg import inv
 from pydefect.input_maker.supercell_info import SupercellInfo, Interstitial
 from pydefect.util.error_classes import NotPrimitiveError
+from pydefect.util.symmetry_cache import get_symmetry_data
 from pymatgen.core import Structure, Element, IStructure
-from vise.util.structure_symmetrizer import StructureSymmetrizer
 from vise.util.typing import Coords
 
 
@@ -41,8 +41,7 @@ def append_interstitial(supercell_info: SupercellInfo,
     for fcoord, info in zip(frac_coords, infos):
         us = Structure.from_dict(unitcell_structure.as_dict())
         us.append(species=Element.H, coords=fcoord)
-        symmetrizer = StructureSymmetrizer(us)
-        site_symm = symmetrizer.spglib_sym_data.site_symmetry_symbols[-1]
+        site_symm = get_symmetry_data(us).site_symmetry_symbols[-1]
 
         inv_matrix = inv(np.array(supercell_info.transformation_matrix))
         new_coords = np.dot(fcoord, inv_matrix).tolist()
@@ -8,9 +8,9 @@ from pydefect.input_maker.defect import SimpleDefect
 from pydefect.input_maker.defect_entry import DefectEntry, PerturbedSite
 from pydefect.input_maker.defect_set import DefectSet
 from pydefect.input_maker.supercell_info import SupercellInfo
+from pydefect.util.symmetry_cache import get_symmetry_data
 from pymatgen.core import Structure, IStructure
 from pymatgen.core.structure import PeriodicNeighbor
-from vise.util.structure_symmetrizer import StructureSymmetrizer
 from vise.util.typing import Coords
 
 
@@ -56,7 +56,7 @@ class DefectEntriesMaker:
         if defaults.displace_distance:
             p_structure, p_sites = perturb_structure(structure, coords, cutoff)
 
-            p_site_symmetry = StructureSymmetrizer(
+            p_site_symmetry = get_symmetry_data(
                 p_structure,
                 defaults.symmetry_length_tolerance,
                 defaults.symmetry_angle_tolerance).point_group
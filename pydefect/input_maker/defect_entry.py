@@ -10,9 +10,9 @@ from monty.json import MSONable, MontyDecoder
 from pydefect.analyzer.defect_structure_comparator import \
     DefectStructureComparator
 from pydefect.util.coords import pretty_coords
+from pydefect.util.symmetry_cache import get_symmetry_data
 from pymatgen.core import IStructure
 from vise.util.mix_in import ToJsonFileMixIn
-from vise.util.structure_symmetrizer import StructureSymmetrizer
 from vise.util.typing import Coords
 
 
@@ -126,10 +126,10 @@ def make_defect_entry(name: str,
 
     initial_structure = IStructure(perfect_structure.lattice,
                                    species, frac_coords)
-    symmetrizer = StructureSymmetrizer(initial_structure)
+    symmetry_data = get_symmetry_data(initial_structure)
 
     return DefectEntry(name=name,
                        charge=charge,
                        structure=initial_structure,
-                       site_symmetry=symmetrizer.point_group,
+                       site_symmetry=symmetry_data.point_group,
                        defect_center=tuple(analyzer.defect_center_coord))
@@ -3,6 +3,7 @@
 from copy import deepcopy
 from pathlib import Path
 
+import numpy as np
 import pytest
 from pydefect.analyzer.band_edge_states import BandEdgeEigenvalues, \
     BandEdgeStates, OrbitalInfo, BandEdgeOrbitalInfos, PerfectBandEdgeState, \
@@ -44,12 +45,13 @@ def test_pretty_orbital(orbital_info):
 
 @pytest.fixture
 def band_edge_orbital_infos(orbital_info):
-    return BandEdgeOrbitalInfos(orbital_infos=[[[orbital_info]]],
-                                kpt_coords=[(0.0, 0.0, 0.0)],
-                                kpt_weights=[1.0],
-                                lowest_band_index=10,
-                                fermi_level=0.5,
-                                eigval_shift=1.0)
+    return BandEdgeOrbitalInfos.from_orbital_infos(
+        orbital_infos=[[[orbital_info]]],
+        kpt_coords=[(0.0, 0.0, 0.0)],
+        kpt_weights=[1.0],
+        lowest_band_index=10,
+        fermi_level=0.5,
+        eigval_shift=1.0)
 
 
 def test_kpt_idx(band_edge_orbital_infos):
@@ -60,6 +62,37 @@ def test_band_edge_orbital_info_json_roundtrip(band_edge_orbital_infos, tmpdir):
     assert_json_roundtrip(band_edge_orbital_infos, tmpdir)
 
 
+def test_band_edge_orbital_info_arrays(band_edge_orbital_infos, orbital_info):
+    assert band_edge_orbital_infos.elements == ["Mn"]
+    assert band_edge_orbital_infos.orbitals.shape == (1, 1, 1, 1, 4)
+    assert band_edge_orbital_infos.orbital_infos == [[[orbital_info]]]
+    shifted = band_edge_orbital_infos.shifted_orbital_infos[0][0][0]
+    assert shifted.energy == 2.0
+
+
+def test_band_edge_orbital_info_as_dict(band_edge_orbital_infos):
+    band_edge_orbital_infos.participation_ratios[0, 0, 0] = np.nan
+    d = band_edge_orbital_infos.as_dict()
+    assert d["orbitals"] == [[[[[0.5, 0.4, 0.0, 0.0]]]]]
+    assert d["participation_ratios"] == [[[None]]]
+    actual = BandEdgeOrbitalInfos.from_dict(d)
+    assert actual == band_edge_orbital_infos
+    assert actual.orbital_infos[0][0][0].participation_ratio is None
+
+
+def test_band_edge_orbital_info_from_legacy_dict(band_edge_orbital_infos,
+                                                 orbital_info):
+    d = {"@module": "pydefect.analyzer.band_edge_states",
+         "@class": "BandEdgeOrbitalInfos",
+         "orbital_infos": [[[orbital_info.as_dict()]]],
+         "kpt_coords": [(0.0, 0.0, 0.0)],
+         "kpt_weights": [1.0],
+         "lowest_band_index": 10,
+         "fermi_level": 0.5,
+         "eigval_shift": 1.0}
+    assert BandEdgeOrbitalInfos.from_dict(d) == band_edge_orbital_infos
+
+
 def test_band_edge_orbital_info_energies_occupations(band_edge_orbital_infos):
     actual = band_edge_orbital_infos.energies_and_occupations
     expected = [[[[2.0, 1.0]]]]
@@ -79,12 +112,13 @@ def test_band_edge_orbital_info_repr():
                                  participation_ratio=0.2222222)
 
     band_edge_orbital_infos =  \
-        BandEdgeOrbitalInfos(orbital_infos=[[[orbital_info_1, orbital_info_2]]],
-                             kpt_coords=[(0.0, 0.0, 0.0)],
-                             kpt_weights=[1.0],
-                             lowest_band_index=10,
-                             fermi_level=0.5,
-                             eigval_shift=1.0)
+        BandEdgeOrbitalInfos.from_orbital_infos(
+            orbital_infos=[[[orbital_info_1, orbital_info_2]]],
+            kpt_coords=[(0.0, 0.0, 0.0)],
+            kpt_weights=[1.0],
+            lowest_band_index=10,
+            fermi_level=0.5,
+            eigval_shift=1.0)
 
     actual = band_edge_orbital_infos.__str__()
     print(actual)
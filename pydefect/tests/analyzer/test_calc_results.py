@@ -1,7 +1,8 @@
 # -*- coding: utf-8 -*-
 #  Copyright (c) 2020. Distributed under the terms of the MIT License.
 import pytest
-from pydefect.analyzer.calc_results import CalcResults
+from pydefect.analyzer.calc_results import CalcResults, check_convergence, \
+    NoElectronicConvError, NoIonicConvError
 from pymatgen.core import IStructure, Lattice
 
 from vise.tests.helpers.assertion import assert_json_roundtrip
@@ -31,3 +32,14 @@ energy:      1.000
 magnetization:   0.00
 electronic convergence: False
 ionic convergence: False"""
+
+
+def test_check_convergence(calc_results):
+    check_convergence(calc_results, "dir", check=False)
+    with pytest.raises(NoElectronicConvError):
+        check_convergence(calc_results, "dir", check=True)
+    calc_results.electronic_conv = True
+    with pytest.raises(NoIonicConvError):
+        check_convergence(calc_results, "dir", check=True)
+    calc_results.ionic_conv = True
+    check_convergence(calc_results, "dir", check=True)
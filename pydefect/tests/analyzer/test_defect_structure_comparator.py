@@ -63,6 +63,13 @@ def test_atom_mapping_to_perfect(structure_comparator):
     assert structure_comparator.inserted_indices == [0, 5]
 
 
+def test_atom_mapping_read_only(structure_comparator):
+    with pytest.raises(TypeError):
+        structure_comparator.atom_mapping[0] = 0
+    structure_comparator.removed_indices.append(5)
+    assert structure_comparator.removed_indices == [0, 1]
+
+
 def test_defect_structure_analyzer_defect_center(structure_comparator):
     actual = structure_comparator.defect_center_coord
     assert (actual == np.array([0.25, 0.435, 0.435])).all()
@@ -66,6 +66,10 @@ def test_symmetry_relation():
     assert symmetry_relation("4", "2") == SymmRelation.subgroup
     assert symmetry_relation("-43m", "mm2") == SymmRelation.subgroup
     assert symmetry_relation("4/m", "2") == SymmRelation.subgroup
+    assert symmetry_relation("3", "32") == SymmRelation.supergroup
+    assert symmetry_relation("32", "3") == SymmRelation.subgroup
+    assert symmetry_relation("-62m", "32") == SymmRelation.subgroup
+    assert symmetry_relation("-62m", "-6m2") == SymmRelation.same
 
 
 def test_make_def_str_info_symm_rel(def_str_info):
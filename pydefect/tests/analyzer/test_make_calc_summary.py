@@ -1,9 +1,15 @@
 # -*- coding: utf-8 -*-
 #  Copyright (c) 2020 Kumagai group.
-from pydefect.analyzer.calc_results import CalcResults
+from pathlib import Path
+
+import pytest
+from monty.serialization import loadfn
+from pydefect.analyzer.calc_results import CalcResults, NoIonicConvError
 from pydefect.analyzer.calc_summary import SingleCalcSummary, CalcSummary
 from pydefect.analyzer.defect_structure_info import DefectStructureInfo
-from pydefect.analyzer.make_calc_summary import make_calc_summary
+from pydefect.analyzer.make_calc_summary import make_calc_summary, \
+    make_single_calc_summary, make_single_calc_summary_from_dir, \
+    CalcSummaryBuilder
 from pydefect.defaults import defaults
 from pydefect.input_maker.defect_entry import DefectEntry
 from pymatgen.core import IStructure, Lattice
@@ -44,3 +50,75 @@ def test_make_calc_summary(mocker):
     assert actual == expected
 
 
+@pytest.fixture
+def calc_dir(tmpdir, def_str_info):
+    tmpdir.chdir()
+    structure = IStructure(Lattice.cubic(1.0), ["Mg"], [[0.0]*3])
+    _dir = Path("Va_O1_1")
+    _dir.mkdir()
+    CalcResults(structure=structure, energy=9.0, magnetization=0.0,
+                potentials=[0.0], electronic_conv=True, ionic_conv=False
+                ).to_json_file(str(_dir / "calc_results.json"))
+    DefectEntry(name="Va_O1", charge=1, structure=structure,
+                site_symmetry="m-3m", defect_center=(0.5, 0.5, 0.5)
+                ).to_json_file(str(_dir / "defect_entry.json"))
+    def_str_info.to_json_file(str(_dir / "defect_structure_info.json"))
+    return _dir
+
+
+@pytest.fixture
+def p_calc_results():
+    return CalcResults(
+        structure=IStructure(Lattice.cubic(1.0), ["Mg", "O"], [[0.0]*3]*2),
+        energy=10.0, magnetization=0.0, potentials=[0.0, 0.0])
+
+
+def test_make_single_calc_summary_from_dir(calc_dir, def_str_info,
+                                           p_calc_results):
+    actual = make_single_calc_summary_from_dir(calc_dir, p_calc_results)
+    calc_results = loadfn(calc_dir / "calc_results.json")
+    defect_entry = loadfn(calc_dir / "defect_entry.json")
+    expected = make_single_calc_summary(calc_results, defect_entry,
+                                        p_calc_results, def_str_info)
+    assert actual == ("Va_O1_1", expected)
+
+
+def test_calc_summary_builder(mocker, calc_dir, p_calc_results):
+    builder = CalcSummaryBuilder(p_calc_results)
+    builder.add_dir(calc_dir)
+    builder.to_json_files()
+    expected = builder.calc_summary
+    assert loadfn("calc_summary.json") == expected
+    assert Path("calc_summary_stamps.json").exists()
+
+    mock = mocker.patch(
+        "pydefect.analyzer.make_calc_summary.make_single_calc_summary_from_dir")
+    builder = CalcSummaryBuilder(p_calc_results)
+    builder.add_dir(calc_dir)
+    mock.assert_not_called()
+    assert builder.calc_summary == expected
+
+    with pytest.raises(NoIonicConvError):
+        CalcSummaryBuilder(p_calc_results,
+                           check_calc_results=True).add_dir(calc_dir)
+
+    (calc_dir / "defect_entry.json").write_text(
+        (calc_dir / "defect_entry.json").read_text() + " ")
+    mock.return_value = ("Va_O1_1", expected.single_summaries["Va_O1_1"])
+    CalcSummaryBuilder(p_calc_results).add_dir(calc_dir)
+    mock.assert_called_once_with(calc_dir, p_calc_results)
+
+
+def test_calc_summary_builder_w_changed_defaults(mocker, calc_dir,
+                                                 p_calc_results):
+    builder = CalcSummaryBuilder(p_calc_results)
+    builder.add_dir(calc_dir)
+    builder.to_json_files()
+    summary = builder.calc_summary.single_summaries["Va_O1_1"]
+    assert summary.is_energy_strange is False
+
+    mocker.patch.object(defaults, "_abs_strange_energy", -1.0)
+    builder = CalcSummaryBuilder(p_calc_results)
+    builder.add_dir(calc_dir)
+    summary = builder.calc_summary.single_summaries["Va_O1_1"]
+    assert summary.is_energy_strange is True
@@ -3,7 +3,7 @@
 from pydefect.analyzer.calc_results import CalcResults
 from pydefect.analyzer.defect_energy import DefectEnergy, DefectEnergyInfo
 from pydefect.analyzer.make_defect_energy_info import make_defect_energy_info, \
-    num_atom_differences
+    num_atom_differences, num_atom_differences_from_compositions
 from pydefect.chem_pot_diag.chem_pot_diag import StandardEnergies
 from pydefect.corrections.abstract_correction import Correction
 from pydefect.input_maker.defect_entry import DefectEntry
@@ -46,4 +46,10 @@ def test_make_defect_energy_info(mocker):
 def test_num_atom_diff():
     s1 = IStructure(Lattice.cubic(1), ["H", "He"], [[0] * 3] * 2)
     s2 = IStructure(Lattice.cubic(1), ["H", "Li"], [[0] * 3] * 2)
-    assert num_atom_differences(s1, s2) == {"He": 1, "Li": -1}
\ No newline at end of file
+    assert num_atom_differences(s1, s2) == {"He": 1, "Li": -1}
+
+
+def test_num_atom_diff_from_compositions():
+    actual = num_atom_differences_from_compositions({"H": 1.0, "He": 1.0},
+                                                    {"H": 1.0, "Li": 1.0})
+    assert actual == {"He": 1, "Li": -1}
@@ -1,5 +1,11 @@
 # -*- coding: utf-8 -*-
 #  Copyright (c) 2020 Kumagai group.
+import math
+from itertools import product
+
+import numpy as np
+import pytest
+from pydefect.analyzer.defect_structure_info import Displacement
 from pydefect.analyzer.make_defect_structure_info import \
     MakeDefectStructureInfo
 from pydefect.cli.make_defect_vesta_file import fold_coords_in_structure
@@ -39,3 +45,73 @@ def test_make_defect_structure_info2():
     actual = info.defect_structure_info
     print(actual)
 
+
+def per_site_displacement(info, d, p):
+    lattice = info.lattice
+    initial_site, final_site = info.initial[p], info.shifted_final[d]
+    _, image = initial_site.distance_and_image_from_frac_coords(info.center)
+    initial_pos = initial_site.frac_coords - image
+    _, image = final_site.distance_and_image_from_frac_coords(initial_pos)
+    final_pos = final_site.frac_coords - image
+
+    initial_pos_vec = lattice.get_cartesian_coords(initial_pos - info.center)
+    initial_dist = np.linalg.norm(initial_pos_vec)
+    disp_dist, t = lattice.get_distance_and_image(final_site.frac_coords,
+                                                  initial_site.frac_coords)
+    disp_vec = lattice.get_cartesian_coords(
+        final_site.frac_coords - initial_site.frac_coords - t)
+    with np.errstate(invalid="ignore"):
+        cos = round(np.dot(initial_pos_vec, disp_vec)
+                    / (initial_dist * disp_dist), 10)
+    angle = float(round(180 * (1 - np.arccos(cos) / np.pi), 1))
+    angle = None if math.isnan(angle) else angle
+    return Displacement(specie=str(initial_site.specie),
+                        original_pos=tuple(initial_pos),
+                        final_pos=tuple(final_pos),
+                        distance_from_defect=initial_dist,
+                        disp_vector=tuple(disp_vec),
+                        displace_distance=disp_dist,
+                        angle=angle)
+
+
+def test_calc_displacements_wrt_per_site_formula():
+    lattice = Lattice.from_parameters(7.0, 8.0, 9.0, 75, 100, 110)
+    grid = np.array(list(product(range(3), repeat=3))) / 3
+    species = ["H", "He"] * 13 + ["H"]
+    perf = Structure(lattice, species, grid)
+    initial = perf.copy()
+    initial.remove_sites([13])
+    rng = np.random.default_rng(0)
+    final = initial.copy()
+    for site in final:
+        site.coords += rng.normal(scale=0.1, size=3)
+    final.translate_sites(list(range(len(final))), [0.01, -0.02, 0.03])
+
+    info = MakeDefectStructureInfo(perf, initial, final, dist_tol=0.5,
+                                   symprec=0.1)
+
+    distances = [site.distance_and_image_from_frac_coords(
+        info._orig_center)[0] for site in final]
+    assert info._anchor_atom_idx == int(np.argmax(distances))
+    d_site = final[info._anchor_atom_idx]
+    p_site = perf[info._orig_comp.d_to_p[info._anchor_atom_idx]]
+    drift_dist, image = d_site.distance_and_image_from_frac_coords(
+        p_site.frac_coords)
+    assert info._drift_distance == pytest.approx(drift_dist)
+    np.testing.assert_allclose(
+        info._drift_vector, d_site.frac_coords - p_site.frac_coords - image)
+
+    actual = info.calc_displacements()
+    mapping = info.comp_w_init.atom_mapping
+    assert len(mapping) == len(final)
+    for d, p in mapping.items():
+        assert_dataclass_almost_equal(actual[d],
+                                      per_site_displacement(info, d, p))
+
+    disp = actual[0]
+    initial_pos_vec = lattice.get_cartesian_coords(
+        np.array(disp.original_pos) - info.center)
+    assert info.calc_disp_angle(disp.displace_distance,
+                                np.array(disp.disp_vector),
+                                disp.distance_from_defect,
+                                initial_pos_vec) == disp.angle
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+#  Copyright (c) 2020. Distributed under the terms of the MIT License.
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import pydefect
+
+root_dir = Path(pydefect.__file__).parent.parent
+
+# Modules that must not be imported only to build the argument parsers.
+heavy_modules = ["matplotlib",
+                 "pymatgen.analysis.phase_diagram",
+                 "pymatgen.io.vasp",
+                 "pydefect.cli.main_functions",
+                 "pydefect.cli.vasp.main_vasp_functions"]
+
+# Generous budget in seconds for the cumulative import time, which is ~0.2 s
+# when the sub-command functions are lazily imported.
+time_budget = 1.5
+
+
+def import_times(module: str):
+    """Cumulative import times in seconds parsed from -X importtime."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=root_dir, capture_output=True, text=True, check=True)
+    result = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        result[name.strip()] = int(cumulative) / 10 ** 6
+    return result
+
+
+@pytest.mark.parametrize("module", ["pydefect.cli.main",
+                                    "pydefect.cli.vasp.main_vasp"])
+def test_cli_import_time(module):
+    times = import_times(module)
+    assert not [m for m in heavy_modules if m in times]
+    assert times[module] < time_budget
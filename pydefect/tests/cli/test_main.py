@@ -40,7 +40,7 @@ def test_plot_cpd_options(mocker):
 
 
 def test_make_supercell_wo_options(mocker):
-    mock = mocker.patch("pydefect.cli.main.IStructure")
+    mock = mocker.patch("pymatgen.core.IStructure")
     parsed_args = parse_args_main(["s", "-p", "POSCAR-tmp"])
     # func is a pointer so need to point the same address.
     expected = Namespace(
@@ -55,7 +55,7 @@ def test_make_supercell_wo_options(mocker):
 
 
 def test_make_supercell_w_options(mocker):
-    mock = mocker.patch("pydefect.cli.main.IStructure")
+    mock = mocker.patch("pymatgen.core.IStructure")
     parsed_args = parse_args_main(["s",
                                    "-p", "POSCAR-tmp",
                                    "--matrix", "1", "2", "3",
@@ -81,7 +81,7 @@ def test_append_interstitial(mocker):
     mock_loadfn = mocker.patch("pydefect.cli.main.loadfn")
     mock_supercell_info = mocker.Mock(spec=SupercellInfo, autospec=True)
     mock_loadfn.return_value = mock_supercell_info
-    mock_structure = mocker.patch("pydefect.cli.main.Structure")
+    mock_structure = mocker.patch("pymatgen.core.Structure")
     parsed_args = parse_args_main(["ai",
                                    "-s", "supercell_info.json",
                                    "-p", "POSCAR",
@@ -166,7 +166,7 @@ def test_defect_structure_info(mocker):
 
 def test_efnv_correction(mocker):
     mock_calc_results = mocker.Mock(spec=CalcResults, autospec=True)
-    mock_unitcell = mocker.patch("pydefect.cli.main.Unitcell")
+    mock_unitcell = mocker.patch("pydefect.analyzer.unitcell.Unitcell")
 
     def side_effect(filename):
         if filename == "perfect/calc_results.json":
@@ -188,6 +188,9 @@ def test_efnv_correction(mocker):
         verbose=False,
         radius=None,
         calc_all_sites=False,
+        ewald_cache_dir=None,
+        jobs=1,
+        plot=True,
         func=parsed_args.func)
     assert parsed_args == expected
 
@@ -210,9 +213,9 @@ def test_band_edge_states(mocker):
 
 
 def test_defect_energy_infos(mocker):
-    mock_unitcell = mocker.patch("pydefect.cli.main.Unitcell")
+    mock_unitcell = mocker.patch("pydefect.analyzer.unitcell.Unitcell")
     mock_loadfn = mocker.patch("pydefect.cli.main.loadfn")
-    mock_std_energy = mocker.patch("pydefect.cli.main.StandardEnergies")
+    mock_std_energy = mocker.patch("pydefect.chem_pot_diag.chem_pot_diag.StandardEnergies")
     parsed_args = parse_args_main([
         "dei",
         "-d", "Va_O1_0", "Va_O1_1",
@@ -235,7 +238,7 @@ def test_defect_energy_infos(mocker):
 
 def test_defect_energy_summary(mocker):
     mock_pbes = mocker.Mock(spec=PerfectBandEdgeState, autospec=True)
-    mock_unitcell = mocker.patch("pydefect.cli.main.Unitcell")
+    mock_unitcell = mocker.patch("pydefect.analyzer.unitcell.Unitcell")
 
     def side_effect(filename):
         if filename == "perfect/perfect_band_edge_state.json":
@@ -287,3 +290,26 @@ def test_plot_defect_formation_energy(mocker):
         func=parsed_args.func)
     assert parsed_args == expected
 
+
+def test_plot_batch(mocker):
+    mock_p_state = mocker.Mock(spec=PerfectBandEdgeState, autospec=True)
+
+    def side_effect(filename):
+        if filename == "perfect_band_edge_state.json":
+            return mock_p_state
+        else:
+            raise ValueError
+
+    mocker.patch("pydefect.cli.main.loadfn", side_effect=side_effect)
+    parsed_args = parse_args_main([
+        "pb", "-d", "Va_O1_0", "Va_O1_1",
+        "-pbes", "perfect_band_edge_state.json", "-j", "4"])
+
+    expected = Namespace(
+        dirs=[Path("Va_O1_0"), Path("Va_O1_1")],
+        p_state=mock_p_state,
+        y_range=None,
+        jobs=4,
+        verbose=False,
+        func=parsed_args.func)
+    assert parsed_args == expected
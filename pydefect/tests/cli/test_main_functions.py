@@ -17,6 +17,7 @@ from pydefect.cli.main_functions import make_standard_and_relative_energies, \
     pop_interstitial_from_supercell_info, make_defect_set, \
     make_band_edge_states_main_func, make_efnv_correction_main_func, \
     calc_defect_structure_info
+from pydefect.corrections.defect_region import FixedDistanceDefectRegion
 from pydefect.corrections.efnv_correction import ExtendedFnvCorrection
 from pydefect.input_maker.defect import SimpleDefect
 from pydefect.input_maker.defect_entry import DefectEntry
@@ -244,7 +245,7 @@ def test_make_efnv_correction_from_vasp(mocker):
     mock_make_efnv.return_value = mock_efnv
 
     mock_site_pot_plotter = mocker.patch(
-        "pydefect.cli.main_functions.SitePotentialMplPlotter")
+        "pydefect.cli.plot_functions.SitePotentialMplPlotter")
     plotter = mock_site_pot_plotter.from_efnv_corr.return_value
     args = Namespace(dirs=[Path("Va_O1_2")],
                      check_calc_results=True,
@@ -252,7 +253,10 @@ def test_make_efnv_correction_from_vasp(mocker):
                      unitcell=mock_unitcell,
                      verbose=False,
                      radius=None,
-                     calc_all_sites=False)
+                     calc_all_sites=False,
+                     ewald_cache_dir=None,
+                     jobs=1,
+                     plot=True)
 
     make_efnv_correction_main_func(args)
     mock_loadfn.assert_any_call(Path("Va_O1_2") / "defect_entry.json")
@@ -261,8 +265,9 @@ def test_make_efnv_correction_from_vasp(mocker):
     mock_make_efnv.assert_called_with(
         mock_defect_entry.charge, mock_calc_results, mock_perfect_calc_results,
         mock_unitcell.dielectric_constant,
-        defect_region_radius=None,
-        calc_all_sites=False)
+        defect_region=None,
+        calc_all_sites=False,
+        ewald_cache_dir=None)
     mock_efnv.to_json_file.assert_called_with(
         Path("Va_O1_2") / "correction.json")
 
@@ -271,6 +276,28 @@ def test_make_efnv_correction_from_vasp(mocker):
     plotter.construct_plot.assert_called_once_with()
 
 
+def test_make_efnv_correction_w_radius(mocker):
+    mocker.patch("pydefect.cli.main_functions.loadfn")
+    mocker.patch("pydefect.cli.main_functions.get_calc_results")
+    mock_make_efnv = mocker.patch(
+        "pydefect.cli.main_functions.make_efnv_correction")
+    args = Namespace(dirs=[Path("Va_O1_2")],
+                     check_calc_results=False,
+                     perfect_calc_results=mocker.Mock(spec=CalcResults),
+                     unitcell=mocker.Mock(spec=Unitcell),
+                     verbose=False,
+                     radius=2.0,
+                     calc_all_sites=False,
+                     ewald_cache_dir=None,
+                     jobs=1,
+                     plot=False)
+    make_efnv_correction_main_func(args)
+
+    defect_region = mock_make_efnv.call_args.kwargs["defect_region"]
+    assert isinstance(defect_region, FixedDistanceDefectRegion)
+    assert defect_region.defect_region_radius() == 2.0
+
+
 def test_make_band_edge_states(mocker):
     mock_perfect_edge_states = mocker.Mock(
         spec=PerfectBandEdgeState, autospec=True)
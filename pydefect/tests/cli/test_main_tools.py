@@ -1,11 +1,13 @@
 # -*- coding: utf-8 -*-
 #  Copyright (c) 2020. Distributed under the terms of the MIT License.
 import logging
+import warnings
 from pathlib import Path
 
 import pytest
 
-from pydefect.cli.main_tools import sanitize_matrix, str_int_to_int, parse_dirs
+from pydefect.cli.main_tools import sanitize_matrix, str_int_to_int, \
+    parse_dirs, LazyFunction, LazyVaspFileReader
 
 
 def test_sanitize_matrix_9_input_values():
@@ -76,3 +78,60 @@ def test_parse_dirs_skip_when_output_file_exist(tmpdir):
     (Path(tmpdir) / "x").touch()
     parse_dirs([Path(tmpdir)], _inner_function=print_a_to_file_x,
                output_filename="x")
+
+
+def test_parse_dirs_w_jobs(tmpdir, mocker):
+    mock_logger = mocker.patch("pydefect.cli.main_tools.logger")
+    dirs = [Path(tmpdir) / name for name in ["a", "b", "c"]]
+    for d in dirs[:2]:
+        d.mkdir()
+    actual = parse_dirs(dirs, _inner_function=return_name, jobs=2,
+                        initializer=set_prefix, initargs=("_",))
+    assert actual == ["_a", "_b"]
+    mock_logger.warning.assert_any_call(
+        f"Failed directories are:\n{dirs[2]}")
+
+
+def test_parse_dirs_w_jobs_all_succeeded(tmpdir, mocker):
+    mock_logger = mocker.patch("pydefect.cli.main_tools.logger")
+    dirs = [Path(tmpdir) / name for name in ["a", "b", "c"]]
+    for d in dirs:
+        d.mkdir()
+    actual = parse_dirs(dirs, _inner_function=return_name, jobs=3,
+                        initializer=set_prefix, initargs=("_",))
+    assert actual == ["_a", "_b", "_c"]
+    mock_logger.warning.assert_not_called()
+    mock_logger.info.assert_any_call("Parsing all the directories succeeded.")
+
+
+_prefix = {}
+
+
+def set_prefix(prefix):
+    _prefix["value"] = prefix
+
+
+def return_name(path: Path):
+    if not path.exists():
+        raise FileNotFoundError
+    return _prefix["value"] + path.name
+
+
+def test_lazy_function():
+    func = LazyFunction("pathlib:Path.cwd")
+    assert func.__name__ == "cwd"
+    assert func() == Path.cwd()
+
+
+def warn_unknown_potcar(x):
+    from pymatgen.io.vasp.inputs import UnknownPotcarWarning
+    warnings.warn("Unknown POTCAR", UnknownPotcarWarning)
+    return x
+
+
+def test_lazy_vasp_file_reader():
+    func = LazyVaspFileReader(f"{__name__}:warn_unknown_potcar")
+    with warnings.catch_warnings(record=True) as w:
+        warnings.simplefilter("always")
+        assert func(1) == 1
+    assert w == []
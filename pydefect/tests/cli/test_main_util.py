@@ -116,7 +116,7 @@ def test_gkfo_correction(mocker):
             raise ValueError
 
     mocker.patch("pydefect.cli.main_util.loadfn", side_effect=side_effect)
-    mock_unitcell = mocker.patch("pydefect.cli.main.Unitcell")
+    mock_unitcell = mocker.patch("pydefect.analyzer.unitcell.Unitcell")
 
     parsed_args = parse_args_main_util([
         "gkfo",
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+#  Copyright (c) 2020 Kumagai group.
+from pathlib import Path
+
+from pydefect.analyzer.band_edge_states import BandEdgeOrbitalInfos
+from pydefect.cli.plot_functions import plot_dir, init_plot_batch_worker
+from pydefect.corrections.efnv_correction import ExtendedFnvCorrection
+from pydefect.input_maker.defect_entry import DefectEntry
+
+
+def test_plot_dir(mocker, tmpdir):
+    tmpdir.chdir()
+    _dir = Path("Va_O1_2")
+    _dir.mkdir()
+    for name in ["correction.json", "band_edge_orbital_infos.json"]:
+        (_dir / name).touch()
+
+    mock_defect_entry = mocker.Mock(spec=DefectEntry, autospec=True)
+    mock_defect_entry.full_name = "Va_O1_2"
+    mock_defect_entry.name = "Va_O1"
+    mock_efnv = mocker.Mock(spec=ExtendedFnvCorrection, autospec=True)
+    mock_orb_infos = mocker.Mock(spec=BandEdgeOrbitalInfos, autospec=True)
+
+    def side_effect(key):
+        return {"defect_entry.json": mock_defect_entry,
+                "correction.json": mock_efnv,
+                "band_edge_orbital_infos.json": mock_orb_infos}[key.name]
+
+    mocker.patch("pydefect.cli.plot_functions.loadfn", side_effect=side_effect)
+    mock_site_pot_plotter = mocker.patch(
+        "pydefect.cli.plot_functions.SitePotentialMplPlotter")
+    mock_eigval_plotter = mocker.patch(
+        "pydefect.cli.plot_functions.EigenvalueMplPlotter")
+
+    mock_p_state = mocker.Mock()
+    mock_p_state.vbm_info.energy = 10
+    mock_p_state.cbm_info.energy = 20
+    init_plot_batch_worker(mock_p_state, [0.0, 1.0])
+    plot_dir(_dir)
+
+    mock_site_pot_plotter.from_efnv_corr.assert_called_with(
+        title="Va_O1_2", efnv_correction=mock_efnv)
+    plotter = mock_site_pot_plotter.from_efnv_corr.return_value
+    plotter.plt.savefig.assert_called_with(fname=_dir / "correction.pdf")
+
+    mock_eigval_plotter.assert_called_with(
+        title="Va_O1", band_edge_orb_infos=mock_orb_infos,
+        supercell_vbm=10, supercell_cbm=20, y_range=[0.0, 1.0])
+
+
+def test_plot_dir_wo_perfect_band_edge_state(mocker, tmpdir):
+    tmpdir.chdir()
+    _dir = Path("Va_O1_2")
+    _dir.mkdir()
+    (_dir / "band_edge_orbital_infos.json").touch()
+    mock_eigval_plotter = mocker.patch(
+        "pydefect.cli.plot_functions.EigenvalueMplPlotter")
+
+    init_plot_batch_worker(None, None)
+    plot_dir(_dir)
+    mock_eigval_plotter.assert_not_called()
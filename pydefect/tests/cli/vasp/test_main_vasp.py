@@ -9,8 +9,8 @@ from pydefect.defaults import defaults
 
 
 def test_unitcell(mocker):
-    mock = mocker.patch("pydefect.cli.vasp.main_vasp.Vasprun")
-    mock_outcar = mocker.patch("pydefect.cli.vasp.main_vasp.Outcar")
+    mock = mocker.patch("pydefect.cli.vasp.main_vasp.vasprun")
+    mock_outcar = mocker.patch("pydefect.cli.vasp.main_vasp.outcar")
 
     parsed_args = parse_args_main_vasp(["u",
                                         "-vb", "vasprun.xml",
@@ -53,11 +53,11 @@ def test_make_poscars_w_options():
     assert parsed_args == expected
 
 
-def test_make_local_extrema_wo_options(mocker):
-    mock_chgcar = mocker.patch("pydefect.cli.vasp.main_vasp.Chgcar")
+def test_make_local_extrema_wo_options():
     parsed_args = parse_args_main_vasp(["le", "-v", "CHGCAR"])
     expected = Namespace(
-        volumetric_data=[mock_chgcar.from_file.return_value],
+        volumetric_data=["CHGCAR"],
+        cache=True,
         find_max=False,
         info=None,
         threshold_frac=None,
@@ -67,13 +67,12 @@ def test_make_local_extrema_wo_options(mocker):
         radius=0.4,
         func=parsed_args.func)
     assert parsed_args == expected
-    mock_chgcar.from_file.assert_called_once_with("CHGCAR")
 
 
-def test_make_local_extrema_w_options(mocker):
-    mock_chgcar = mocker.patch("pydefect.cli.vasp.main_vasp.Chgcar")
+def test_make_local_extrema_w_options():
     parsed_args = parse_args_main_vasp(["le",
-                                        "-v", "CHGCAR",
+                                        "-v", "AECCAR0", "AECCAR2",
+                                        "--no_cache",
                                         "--find_max",
                                         "--info", "a",
                                         "--threshold_frac", "0.1",
@@ -82,7 +81,8 @@ def test_make_local_extrema_w_options(mocker):
                                         "--tol", "0.4",
                                         "--radius", "0.5"])
     expected = Namespace(
-        volumetric_data=[mock_chgcar.from_file.return_value],
+        volumetric_data=["AECCAR0", "AECCAR2"],
+        cache=False,
         find_max=True,
         info="a",
         threshold_frac=0.1,
@@ -114,6 +114,7 @@ def test_perfect_band_edge_state():
     parsed_args = parse_args_main_vasp(["pbes", "-d", "Va_O1_0"])
     expected = Namespace(
         dir=Path("Va_O1_0"),
+        plot=True,
         func=parsed_args.func)
     assert parsed_args == expected
 
@@ -133,12 +134,15 @@ def test_band_edge_orbital_infos(mocker):
         "-d", "Va_O1_0", "Va_O1_1",
         "-pbes", "perfect_band_edge_state.json",
         "-y", "0.0", "1.0",
+        "--no_cache",
         "-v"])
     expected = Namespace(
         dirs=[Path("Va_O1_0"), Path("Va_O1_1")],
         p_state=mock_p_edge_state,
         y_range=[0.0, 1.0],
         no_participation_ratio=False,
+        plot=True,
+        cache=False,
         verbose=True,
         func=parsed_args.func)
     assert parsed_args == expected
@@ -111,7 +111,11 @@ def test_make_local_extrema(tmpdir, mocker, simple_cubic):
     mock_make_extrema = mocker.patch("pydefect.cli.vasp.main_vasp_functions.make_local_extrema_from_volumetric_data")
     volumetric_data = VolumetricData(simple_cubic,
                                      data={"total": np.array([[[0.0]]])})
-    args = Namespace(volumetric_data=[volumetric_data],
+    mock_read = mocker.patch(
+        "pydefect.cli.vasp.main_vasp_functions.read_volumetric_data",
+        return_value=volumetric_data)
+    args = Namespace(volumetric_data=["CHGCAR"],
+                     cache=False,
                      find_max=True,
                      info="a",
                      threshold_frac=None,
@@ -120,6 +124,7 @@ def test_make_local_extrema(tmpdir, mocker, simple_cubic):
                      tol=0.2,
                      radius=0.3)
     make_local_extrema(args)
+    mock_read.assert_called_once_with("CHGCAR", use_sidecar=False)
     mock_params.assert_called_once_with(None, None, 0.1, 0.2, 0.3)
     mock_make_extrema.assert_called_once_with(volumetric_data=volumetric_data,
                                               params=mock_params.return_value,
@@ -128,6 +133,32 @@ def test_make_local_extrema(tmpdir, mocker, simple_cubic):
     mock_make_extrema.return_value.to_json_file.assert_called_once_with()
 
 
+def test_make_local_extrema_summed(tmpdir, mocker, simple_cubic):
+    tmpdir.chdir()
+
+    mocker.patch("pydefect.cli.vasp.main_vasp_functions.VolumetricDataAnalyzeParams")
+    mock_make_extrema = mocker.patch("pydefect.cli.vasp.main_vasp_functions.make_local_extrema_from_volumetric_data")
+    mock_read = mocker.patch(
+        "pydefect.cli.vasp.main_vasp_functions.read_volumetric_data",
+        side_effect=lambda f, use_sidecar: VolumetricData(
+            simple_cubic, data={"total": np.array([[[float(f[-1])]]])}))
+    args = Namespace(volumetric_data=["AECCAR0", "AECCAR2"],
+                     cache=True,
+                     find_max=False,
+                     info="a",
+                     threshold_frac=None,
+                     threshold_abs=None,
+                     min_dist=0.1,
+                     tol=0.2,
+                     radius=0.3)
+    make_local_extrema(args)
+    assert mock_read.call_args_list == [
+        mocker.call("AECCAR0", use_sidecar=True),
+        mocker.call("AECCAR2", use_sidecar=True)]
+    actual = mock_make_extrema.call_args.kwargs["volumetric_data"]
+    np.testing.assert_array_equal(actual.data["total"], [[[2.0]]])
+
+
 def test_make_defect_entries(tmpdir, supercell_info):
     tmpdir.chdir()
     supercell_info.to_json_file()
@@ -155,15 +186,15 @@ def test_make_calc_results(tmpdir, mocker):
     tmpdir.chdir()
     mock = mocker.patch(
         "pydefect.cli.vasp.main_vasp_functions.make_calc_results_from_vasp")
-    mock_vasprun = mocker.patch("pydefect.cli.vasp.main_vasp_functions.Vasprun")
+    mock_vasprun = mocker.patch(
+        "pydefect.cli.vasp.main_vasp_functions.read_vasprun")
     mock_outcar = mocker.patch("pydefect.cli.vasp.main_vasp_functions.Outcar")
     mock_calc_results = mocker.Mock(spec=CalcResults)
     mock.return_value = mock_calc_results
     args = Namespace(dirs=[Path("a")], verbose=False)
     make_calc_results(args)
 
-    mock_vasprun.assert_called_with(Path("a") / defaults.vasprun,
-                                    parse_potcar_file=False)
+    mock_vasprun.assert_called_with(Path("a") / defaults.vasprun)
     mock_outcar.assert_called_with(Path("a") / defaults.outcar)
     mock.assert_called_with(vasprun=mock_vasprun.return_value,
                             outcar=mock_outcar.return_value)
@@ -190,8 +221,12 @@ def test_make_calc_results(tmpdir, mocker):
 
 
 def test_make_band_edge_orb_infos_and_eigval_plot(mocker):
-    mock_procar = mocker.patch("pydefect.cli.vasp.main_vasp_functions.Procar")
-    mock_vasprun = mocker.patch("pydefect.cli.vasp.main_vasp_functions.Vasprun")
+    mock_procar = mocker.patch(
+        "pydefect.cli.vasp.main_vasp_functions.read_procar")
+    mock_vasprun = mocker.patch(
+        "pydefect.cli.vasp.main_vasp_functions.read_vasprun")
+    mock_band_range = mocker.patch(
+        "pydefect.cli.vasp.main_vasp_functions.band_edge_index_range")
 
     mock_p_state = mocker.Mock()
     mock_p_state.vbm_info.energy = 10
@@ -204,7 +239,7 @@ def test_make_band_edge_orb_infos_and_eigval_plot(mocker):
     mock_make_orbital_infos = mocker.patch(
         "pydefect.cli.vasp.main_vasp_functions.make_band_edge_orbital_infos")
     mock_eigval_plotter = mocker.patch(
-        "pydefect.cli.vasp.main_vasp_functions.EigenvalueMplPlotter")
+        "pydefect.cli.plot_functions.EigenvalueMplPlotter")
 
     def side_effect(key):
         if str(key) == "Va_O1_2/defect_entry.json":
@@ -225,12 +260,17 @@ def test_make_band_edge_orb_infos_and_eigval_plot(mocker):
                      p_state=mock_p_state,
                      y_range=[0.0, 1.0],
                      no_participation_ratio=False,
+                     plot=True,
+                     cache=True,
                      verbose=False)
     make_band_edge_orb_infos_and_eigval_plot(args)
 
-    mock_procar.assert_called_with(Path("Va_O1_2") / defaults.procar)
-    mock_vasprun.assert_called_with(Path("Va_O1_2") / defaults.vasprun,
-                                    parse_potcar_file=False)
+    mock_vasprun.assert_called_with(Path("Va_O1_2") / defaults.vasprun)
+    mock_band_range.assert_called_with(mock_vasprun.return_value.eigenvalues,
+                                       10, 20)
+    mock_procar.assert_called_with(Path("Va_O1_2") / defaults.procar,
+                                   mock_band_range.return_value,
+                                   use_sidecar=True)
 
     mock_make_orbital_infos.assert_called_with(
         mock_procar.return_value, mock_vasprun.return_value, 10, 20,
@@ -245,3 +285,27 @@ def test_make_band_edge_orb_infos_and_eigval_plot(mocker):
         supercell_vbm=10,
         supercell_cbm=20,
         y_range=[0.0, 1.0])
+
+
+def test_make_band_edge_orb_infos_wo_plot(mocker):
+    mock_procar = mocker.patch(
+        "pydefect.cli.vasp.main_vasp_functions.read_procar")
+    mocker.patch("pydefect.cli.vasp.main_vasp_functions.read_vasprun")
+    mocker.patch("pydefect.cli.vasp.main_vasp_functions.band_edge_index_range")
+    mocker.patch("pydefect.cli.vasp.main_vasp_functions.loadfn",
+                 side_effect=FileNotFoundError)
+    mocker.patch(
+        "pydefect.cli.vasp.main_vasp_functions.make_band_edge_orbital_infos")
+    mock_eigval_plotter = mocker.patch(
+        "pydefect.cli.plot_functions.EigenvalueMplPlotter")
+
+    args = Namespace(dirs=[Path("Va_O1_2")],
+                     p_state=mocker.Mock(),
+                     y_range=None,
+                     no_participation_ratio=True,
+                     plot=False,
+                     cache=False,
+                     verbose=False)
+    make_band_edge_orb_infos_and_eigval_plot(args)
+    mock_eigval_plotter.assert_not_called()
+    assert mock_procar.call_args.kwargs == {"use_sidecar": False}
@@ -55,15 +55,14 @@ def test_refine_defect_poscar(mocker, simple_cubic):
     mock_loadfn.assert_called_once_with("defect_entry.json")
 
 
-def test_calc_grids(mocker):
-    mock_chgcar = mocker.patch("pydefect.cli.vasp.main_vasp_util.Chgcar")
+def test_calc_grids():
     parsed_args = parse_args_main_vasp_util(
-        ["cg", "-c", "CHG"])
+        ["cg", "-c", "CHG", "--no_cache"])
     expected = Namespace(
-        chgcar=mock_chgcar.from_file.return_value,
+        chgcar="CHG",
+        cache=False,
         func=parsed_args.func)
     assert parsed_args == expected
-    mock_chgcar.from_file.assert_called_once_with("CHG")
 
 
 def test_calc_defect_charge_info(mocker):
@@ -74,6 +73,7 @@ def test_calc_defect_charge_info(mocker):
         parchgs=["PARCHG.0001.ALLK"],
         bin_interval=0.3,
         grids=mock_grids.from_file.return_value,
+        cache=True,
         func=parsed_args.func)
     assert parsed_args == expected
     mock_grids.from_file.assert_called_once_with("Grids.npz")
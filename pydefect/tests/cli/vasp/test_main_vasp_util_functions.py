@@ -111,24 +111,27 @@ def test_refine_poscar(tmpdir, mocker, before_refine, after_refine):
 
 
 def test_calc_grids(mocker):
+    mock_read = mocker.patch(f"{_filepath}.read_volumetric_data")
     mock_grids = mocker.patch(f"{_filepath}.Grids")
-    args = Namespace(chgcar="CHGCAR")
+    args = Namespace(chgcar="CHGCAR", cache=False)
     calc_grids(args)
-    mock_grids.from_chgcar.assert_called_once_with("CHGCAR")
+    mock_read.assert_called_once_with("CHGCAR", use_sidecar=False)
+    mock_grids.from_chgcar.assert_called_once_with(mock_read.return_value)
     mock_grids.from_chgcar.return_value.dump.assert_called_once_with()
 
 
 def test_make_defect_charge_info_main(mocker):
-    mock_chgcar = mocker.patch(f"{_filepath}.Chgcar")
-    m_chgcar = mock_chgcar.from_file.return_value
+    mock_read = mocker.patch(f"{_filepath}.read_volumetric_data")
+    m_chgcar = mock_read.return_value
     mock_make_charge_info = mocker.patch(f"{_filepath}.make_defect_charge_info")
     mock_charge_info = mock_make_charge_info.return_value
     mock_grids = mocker.Mock()
     args = Namespace(parchgs=["PARCHG.0189.ALLK"],
                      grids=mock_grids,
-                     bin_interval=0.1)
+                     bin_interval=0.1,
+                     cache=True)
     make_defect_charge_info_main(args)
 
     mock_make_charge_info.assert_called_once_with([m_chgcar], [188], 0.1, mock_grids)
-    mock_chgcar.from_file.assert_called_once_with("PARCHG.0189.ALLK")
+    mock_read.assert_called_once_with("PARCHG.0189.ALLK", use_sidecar=True)
     mock_charge_info.to_json_file.assert_called_once_with()
@@ -1,11 +1,14 @@
 # -*- coding: utf-8 -*-
 #  Copyright (c) 2020 Kumagai group.
 import numpy as np
+import pytest
 from pydefect.analyzer.band_edge_states import OrbitalInfo, \
     BandEdgeOrbitalInfos
 from pydefect.analyzer.defect_structure_info import DefectStructureInfo
 from pydefect.cli.vasp.make_band_edge_orbital_infos import \
-    make_band_edge_orbital_infos
+    make_band_edge_orbital_infos, l_grouping_matrix, calc_orbital_characters, \
+    band_edge_index_range
+from pydefect.cli.vasp.read_procar import ProcarProjections
 from pymatgen.core import Structure, Lattice
 from pymatgen.electronic_structure.core import Spin
 from pymatgen.io.vasp import Procar, Vasprun
@@ -17,8 +20,8 @@ def test_make_band_edge_orbital_infos(mocker):
     mock_vasprun = mocker.Mock(spec=Vasprun, autospec=True)
     mock_str_info = mocker.Mock(spec=DefectStructureInfo, autospec=True)
 
-    mock_vasprun.actual_kpoints = [[0.0, 0.0, 0.0]]
-    mock_vasprun.actual_kpoints_weights = [1.0]
+    mock_vasprun.actual_kpoints = [[0.0, 0.0, 0.0], [0.5, 0.0, 0.0]]
+    mock_vasprun.actual_kpoints_weights = [0.5, 0.5]
     mock_vasprun.final_structure = Structure(
         Lattice.cubic(1), species=["H", "H", "He"], coords=[[0] * 3] * 3)
     mock_vasprun.eigenvalues = {Spin.up: np.array([[[-3.01, 1.],
@@ -81,17 +84,14 @@ def test_make_band_edge_orbital_infos(mocker):
         mock_procar, mock_vasprun, vbm=0.0, cbm=5.0, str_info=mock_str_info,
         eigval_shift=1.0)
 
-    expected = BandEdgeOrbitalInfos(
+    expected = BandEdgeOrbitalInfos.from_orbital_infos(
         orbital_infos=[[
-            [OrbitalInfo(energy=-2.9, orbitals={"H": [1.0, 0.0, 0.0, 0.0], "He": [0.0, 0.0, 0.0, 0.0]}, occupation=1.0, participation_ratio=1.0),
-             OrbitalInfo(energy=8.01, orbitals={"H": [1.0, 0.0, 0.0, 0.0], "He": [0.0, 0.0, 0.0, 0.0]}, occupation=0.0, participation_ratio=1.0)],
-            [OrbitalInfo(energy=-2.99, orbitals={"H": [1.0, 0.0, 0.0, 0.0], "He": [0.0, 0.0, 0.0, 0.0]}, occupation=1.0, participation_ratio=1.0),
-             OrbitalInfo(energy=7.90, orbitals={"H": [1.0, 0.0, 0.0, 0.0], "He": [0.0, 0.0, 0.0, 0.0]}, occupation=0.0, participation_ratio=1.0)]],
-           [[OrbitalInfo(energy=7.99, orbitals={"H": [1.0, 0.0, 0.0, 0.0], "He": [0.0, 0.0, 0.0, 0.0]}, occupation=0.0, participation_ratio=1.0),
-             OrbitalInfo(energy=10.00, orbitals={"H": [1.0, 0.0, 0.0, 0.0], "He": [0.0, 0.0, 0.0, 0.0]}, occupation=0.0, participation_ratio=1.0)],
-            [OrbitalInfo(energy=8.00, orbitals={"H": [1.0, 0.0, 0.0, 0.0], "He": [0.0, 0.0, 0.0, 0.0]}, occupation=0.0, participation_ratio=1.0),
-             OrbitalInfo(energy=10.00, orbitals={"H": [1.0, 0.0, 0.0, 0.0], "He": [0.0, 0.0, 0.0, 0.0]}, occupation=0.0, participation_ratio=1.0)]]],
-        kpt_coords=[(0.0, 0.0, 0.0)], kpt_weights=[1.0], lowest_band_index=1,
+            [OrbitalInfo(energy=-2.9, orbitals={"H": [1.0, 0.0, 0.0, 0.0], "He": [0.0, 0.0, 0.0, 0.0]}, occupation=1.0, participation_ratio=1.0)],
+            [OrbitalInfo(energy=-2.99, orbitals={"H": [1.0, 0.0, 0.0, 0.0], "He": [0.0, 0.0, 0.0, 0.0]}, occupation=1.0, participation_ratio=1.0)]],
+           [[OrbitalInfo(energy=7.99, orbitals={"H": [1.0, 0.0, 0.0, 0.0], "He": [0.0, 0.0, 0.0, 0.0]}, occupation=0.0, participation_ratio=1.0)],
+            [OrbitalInfo(energy=8.00, orbitals={"H": [1.0, 0.0, 0.0, 0.0], "He": [0.0, 0.0, 0.0, 0.0]}, occupation=0.0, participation_ratio=1.0)]]],
+        kpt_coords=[(0.0, 0.0, 0.0), (0.5, 0.0, 0.0)], kpt_weights=[0.5, 0.5],
+        lowest_band_index=1,
         fermi_level=20.0,
         eigval_shift=1.0)
     assert_dataclass_almost_equal(actual, expected, check_is_subclass=True)
@@ -99,19 +99,77 @@ def test_make_band_edge_orbital_infos(mocker):
     actual = make_band_edge_orbital_infos(
         mock_procar, mock_vasprun, vbm=0.0, cbm=5.0, eigval_shift=2.0)
 
-    expected = BandEdgeOrbitalInfos(
+    expected = BandEdgeOrbitalInfos.from_orbital_infos(
         orbital_infos=[[
-            [OrbitalInfo(energy=-2.9, orbitals={"H": [1.0, 0.0, 0.0, 0.0], "He": [0.0, 0.0, 0.0, 0.0]}, occupation=1.0),
-             OrbitalInfo(energy=8.01, orbitals={"H": [1.0, 0.0, 0.0, 0.0], "He": [0.0, 0.0, 0.0, 0.0]}, occupation=0.0)],
-            [OrbitalInfo(energy=-2.99, orbitals={"H": [1.0, 0.0, 0.0, 0.0], "He": [0.0, 0.0, 0.0, 0.0]}, occupation=1.0),
-             OrbitalInfo(energy=7.90, orbitals={"H": [1.0, 0.0, 0.0, 0.0], "He": [0.0, 0.0, 0.0, 0.0]}, occupation=0.0)]],
-            [[OrbitalInfo(energy=7.99, orbitals={"H": [1.0, 0.0, 0.0, 0.0], "He": [0.0, 0.0, 0.0, 0.0]}, occupation=0.0),
-              OrbitalInfo(energy=10.00, orbitals={"H": [1.0, 0.0, 0.0, 0.0], "He": [0.0, 0.0, 0.0, 0.0]}, occupation=0.0)],
-             [OrbitalInfo(energy=8.00, orbitals={"H": [1.0, 0.0, 0.0, 0.0], "He": [0.0, 0.0, 0.0, 0.0]}, occupation=0.0),
-              OrbitalInfo(energy=10.00, orbitals={"H": [1.0, 0.0, 0.0, 0.0], "He": [0.0, 0.0, 0.0, 0.0]}, occupation=0.0)]]],
-        kpt_coords=[(0.0, 0.0, 0.0)], kpt_weights=[1.0], lowest_band_index=1,
+            [OrbitalInfo(energy=-2.9, orbitals={"H": [1.0, 0.0, 0.0, 0.0], "He": [0.0, 0.0, 0.0, 0.0]}, occupation=1.0)],
+            [OrbitalInfo(energy=-2.99, orbitals={"H": [1.0, 0.0, 0.0, 0.0], "He": [0.0, 0.0, 0.0, 0.0]}, occupation=1.0)]],
+            [[OrbitalInfo(energy=7.99, orbitals={"H": [1.0, 0.0, 0.0, 0.0], "He": [0.0, 0.0, 0.0, 0.0]}, occupation=0.0)],
+             [OrbitalInfo(energy=8.00, orbitals={"H": [1.0, 0.0, 0.0, 0.0], "He": [0.0, 0.0, 0.0, 0.0]}, occupation=0.0)]]],
+        kpt_coords=[(0.0, 0.0, 0.0), (0.5, 0.0, 0.0)], kpt_weights=[0.5, 0.5],
+        lowest_band_index=1,
         fermi_level=20.0,
         eigval_shift=2.0)
     assert_dataclass_almost_equal(actual, expected, check_is_subclass=True)
 
 
+def test_l_grouping_matrix():
+    np.testing.assert_array_equal(l_grouping_matrix(3), np.eye(3))
+    actual = l_grouping_matrix(9)
+    assert actual.shape == (9, 4)
+    np.testing.assert_array_equal(actual.sum(axis=0), [1, 3, 5, 0])
+
+
+def test_calc_orbital_characters():
+    structure = Structure(Lattice.cubic(1), species=["H", "He", "H"],
+                          coords=[[0] * 3] * 3)
+    # [k-idx, band-idx, ion-idx, orbital-idx]
+    orbitals = np.zeros((1, 2, 3, 9))
+    orbitals[0, 0, 0, 0] = 0.1
+    orbitals[0, 0, 2, 1:4] = 0.1
+    orbitals[0, 1, 1, 4:9] = 0.2
+    chars, p_ratios = calc_orbital_characters(orbitals, structure,
+                                              ["H", "He"], atom_indices=[0])
+    np.testing.assert_array_almost_equal(
+        chars, [[[[0.1, 0.3, 0.0, 0.0], [0.0, 0.0, 0.0, 0.0]],
+                 [[0.0, 0.0, 0.0, 0.0], [0.0, 0.0, 1.0, 0.0]]]])
+    np.testing.assert_array_almost_equal(p_ratios, [[0.25, 0.0]])
+
+    _, p_ratios = calc_orbital_characters(orbitals, structure, ["H", "He"])
+    assert p_ratios is None
+
+
+def test_band_edge_index_range():
+    eigenvalues = {Spin.up: np.array([[[-3.0, 1.], [-0.5, 1.], [1.5, 0.],
+                                       [8.0, 0.]]]),
+                   Spin.down: np.array([[[-5.0, 1.], [-1.5, 1.], [6.5, 0.],
+                                         [8.0, 0.]]])}
+    assert band_edge_index_range(eigenvalues, vbm=0.0, cbm=1.0) == (1, 2)
+
+
+def test_make_band_edge_orbital_infos_w_procar_projections(mocker):
+    mock_vasprun = mocker.Mock(spec=Vasprun, autospec=True)
+    mock_vasprun.actual_kpoints = [[0.0, 0.0, 0.0]]
+    mock_vasprun.actual_kpoints_weights = [1.0]
+    mock_vasprun.final_structure = Structure(
+        Lattice.cubic(1), species=["H", "He"], coords=[[0] * 3] * 2)
+    mock_vasprun.eigenvalues = {Spin.up: np.array([[[-3.0, 1.], [-0.5, 1.],
+                                                    [1.5, 0.], [8.0, 0.]]])}
+    mock_vasprun.efermi = 0.0
+
+    # [k-idx, band-idx, ion-idx, orbital-idx] of the 1st and 2nd bands.
+    data = np.array([[[[0.2, 0.0, 0.0], [0.0, 0.6, 0.0]],
+                      [[0.0, 0.0, 0.4], [0.1, 0.0, 0.0]]]], dtype=np.float32)
+    projections = ProcarProjections(data={Spin.up: data},
+                                    lowest_band_index=1,
+                                    orbitals=["s", "p", "d"])
+    actual = make_band_edge_orbital_infos(projections, mock_vasprun,
+                                          vbm=0.0, cbm=1.0)
+    assert actual.lowest_band_index == 1
+    np.testing.assert_array_almost_equal(
+        actual.orbitals, [[[[[0.2, 0.0, 0.0], [0.0, 0.6, 0.0]],
+                            [[0.0, 0.0, 0.4], [0.1, 0.0, 0.0]]]]])
+
+    projections.lowest_band_index = 2
+    with pytest.raises(ValueError):
+        make_band_edge_orbital_infos(projections, mock_vasprun,
+                                     vbm=0.0, cbm=1.0)
@@ -2,10 +2,12 @@
 #  Copyright (c) 2020. Distributed under the terms of the MIT License.
 
 import numpy as np
+import pytest
 from pydefect.analyzer.calc_results import CalcResults
 from pydefect.cli.vasp.make_efnv_correction import \
     make_efnv_correction
-from pydefect.corrections.defect_region import calc_max_sphere_radius
+from pydefect.corrections.defect_region import calc_max_sphere_radius, \
+    FixedDistanceDefectRegion
 from pydefect.corrections.efnv_correction import PotentialSite
 from pymatgen.core import IStructure, Lattice
 
@@ -23,10 +25,10 @@ def test_make_efnv_correction(mocker):
     mock_perfect.potentials = [3.0, 4.0, 5.0, 6.0, 7.0]
     mock_defect.potentials = [14.0, 25.0, 36.0, 47.0]
 
-    mock_ewald = mocker.patch("pydefect.cli.vasp.make_efnv_correction.Ewald")
+    mock_ewald = mocker.patch("pydefect.cli.vasp.make_efnv_correction.get_ewald")
     ewald = mocker.Mock()
     ewald.lattice_energy = 1e3
-    ewald.atomic_site_potential.return_value = 1e4
+    ewald.atomic_site_potentials.side_effect = lambda x: np.full(len(x), 1e4)
     mock_ewald.return_value = ewald
 
     efnvc = make_efnv_correction(charge=2,
@@ -46,6 +48,40 @@ def test_make_efnv_correction(mocker):
                            ]
 
 
+def test_make_efnv_correction_w_pc_potential_grid(mocker):
+    mock_perfect = mocker.Mock(spec=CalcResults, autospec=True)
+    mock_defect = mocker.Mock(spec=CalcResults, autospec=True)
+    mock_perfect.structure = IStructure(
+        Lattice.cubic(10), species=["H", "He"], coords=[[0, 0, 0], [0, 0, 1/2]])
+    mock_defect.structure = IStructure(
+        Lattice.cubic(10), species=["He"], coords=[[0, 0, 1/2]])
+    mock_perfect.potentials = [3.0, 4.0]
+    mock_defect.potentials = [14.0]
+
+    grid = mocker.Mock()
+    grid.ewald.lattice = Lattice.cubic(10).matrix
+    grid.ewald.dielectric_tensor = np.eye(3)
+    grid.ewald.lattice_energy = 1e3
+    grid.potentials.side_effect = lambda x: np.full(len(x), 1e4)
+
+    efnvc = make_efnv_correction(charge=2,
+                                 calc_results=mock_defect,
+                                 perfect_calc_results=mock_perfect,
+                                 dielectric_tensor=np.eye(3),
+                                 defect_region=FixedDistanceDefectRegion(1.0),
+                                 pc_potential_grid=grid)
+    unit_conversion = 180.95128169876497
+    grid.potentials.assert_called_once()
+    assert efnvc.sites == [PotentialSite("He", 5.0, 10.0, 2e4 * unit_conversion)]
+
+    with pytest.raises(ValueError):
+        make_efnv_correction(charge=2,
+                             calc_results=mock_defect,
+                             perfect_calc_results=mock_perfect,
+                             dielectric_tensor=np.eye(3) * 2,
+                             pc_potential_grid=grid)
+
+
 def test_calc_max_sphere_radius():
     lattice_vectors_1 = np.array([[5, 0, 0], [0, 10, 0], [0, 0, 20]])
     lattice_vectors_2 = np.array([[10, 0, 0], [0, 10, 0], [10, 10, 10]])
@@ -1,14 +1,20 @@
 # -*- coding: utf-8 -*-
 #  Copyright (c) 2020 Kumagai group.
 from copy import copy
+from itertools import product
+
+import pytest
 
 from pandas import DataFrame
 from pandas._testing import assert_frame_equal
 from pydefect.cli.vasp.make_local_extrema import extrema_coords, \
+    ChargeDensityAnalyzer, periodic_peak_indices, GridSphere, \
+    get_grid_sphere, \
     find_inequivalent_coords, \
     make_local_extrema_from_volumetric_data
 from pydefect.input_maker.local_extrema import CoordInfo
 from pydefect.util.structure_tools import Coordination
+from pymatgen.core import Lattice
 from pymatgen.io.vasp import Chgcar, VolumetricData
 
 import numpy as np
@@ -53,3 +59,72 @@ def test_extrema_coords(vasp_files, simple_cubic, vol_params):
     expected = DataFrame([[0.5, 0.5, 0.0, -2.0, -1.25]],
                          columns=["a", "b", "c", "value", "ave_value"])
     assert_frame_equal(actual, expected)
+
+
+def test_charge_distribution_df(simple_cubic):
+    data = np.arange(12, dtype=float).reshape((2, 3, 2))
+    analyzer = ChargeDensityAnalyzer(VolumetricData(simple_cubic,
+                                                    data={"total": data}))
+    actual = analyzer.charge_distribution_df
+    assert len(actual) == 12
+    np.testing.assert_allclose(actual.iloc[9].to_numpy(),
+                               [0.5, 1 / 3, 0.5, 9.0])
+    assert analyzer.charge_distribution_df is actual
+
+
+def test_periodic_peak_indices():
+    data = np.zeros((4, 5, 6))
+    data[0, 4, 5] = 2.0  # peak at the corner beyond the periodic boundary
+    data[1, 4, 5] = 1.0  # not a peak as adjacent to the above
+    data[2, 2, 2] = 1.0
+    actual = periodic_peak_indices(data)
+    np.testing.assert_array_equal(actual, [[0, 4, 5], [2, 2, 2]])
+
+
+def test_periodic_peak_indices_constant():
+    assert periodic_peak_indices(np.ones((3, 3, 3))).shape == (0, 3)
+
+
+def test_local_extrema_charge_density(simple_cubic):
+    data = np.zeros((5, 5, 10))
+    data[3, 1, 6] = -1.0
+    analyzer = ChargeDensityAnalyzer(VolumetricData(simple_cubic,
+                                                    data={"total": data}))
+    actual = analyzer.get_local_extrema(find_min=True)
+    np.testing.assert_allclose(actual, [[3 / 5, 1 / 5, 6 / 10]])
+    assert analyzer.extrema_df["Charge Density"].tolist() == [-1.0]
+
+
+@pytest.mark.parametrize("radius", [0.3, 1.05, 4.0])
+def test_grid_sphere(radius):
+    lattice = Lattice.from_parameters(3, 4, 5, 80, 95, 105)
+    dim = (6, 8, 10)
+    grid = np.array(list(product(*[np.arange(n) / n for n in dim])))
+    sphere = GridSphere(lattice, dim, radius)
+    for center in [[0.0, 0.0, 0.0], [0.93, 0.41, 0.07], [0.5, 0.125, 0.3]]:
+        distances = lattice.get_all_distances(grid, center)[:, 0]
+        expected = np.where(distances < radius)[0]
+        np.testing.assert_array_equal(sphere.grid_indices(center), expected)
+
+
+def test_get_grid_sphere():
+    lattice = Lattice.cubic(3)
+    actual = get_grid_sphere(lattice, (6, 6, 6), 1.0)
+    assert get_grid_sphere(lattice, (6, 6, 6), 1.0) is actual
+    assert get_grid_sphere(lattice, (6, 6, 6), 1.1) is not actual
+
+
+def test_cluster_nodes_across_boundary(simple_cubic):
+    data = np.zeros((10, 10, 10))
+    data[0, 5, 5] = -1.0
+    data[9, 5, 5] = -1.0
+    data[5, 5, 5] = -2.0
+    analyzer = ChargeDensityAnalyzer(VolumetricData(simple_cubic,
+                                                    data={"total": data}))
+    analyzer.extrema_coords = [np.array([0.0, 0.5, 0.5]),
+                               np.array([0.5, 0.5, 0.5]),
+                               np.array([0.9, 0.5, 0.5])]
+    analyzer.extrema_type = "local minima"
+    analyzer.cluster_nodes(tol=0.15)
+    np.testing.assert_allclose(analyzer.extrema_coords,
+                               [[0.5, 0.5, 0.5], [0.95, 0.5, 0.5]])
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+#  Copyright (c) 2020 Kumagai group.
+import os
+
+import numpy as np
+import pytest
+from pydefect.cli.vasp.read_procar import read_procar, sidecar_filename
+from pymatgen.electronic_structure.core import Spin
+from pymatgen.io.vasp import Procar
+
+orbital_header = "ion      s     py     pz     px    tot\n"
+phase_header = "ion          s             py             pz             px\n"
+
+
+def band_block(band_idx, values):
+    lines = [f"band {band_idx + 1:5d} # energy  {band_idx - 1.0:12.8f} "
+             f"# occ.  1.00000000\n", " \n", orbital_header]
+    for ion_idx, v in enumerate(values, 1):
+        lines.append(f"{ion_idx:5d}" + "".join(f"{i:7.3f}" for i in v)
+                     + f"{sum(v):7.3f}\n")
+    lines.append("tot  " + "".join(f"{i:7.3f}" for i in values.sum(axis=0))
+                 + f"{values.sum():7.3f}\n")
+    lines.append(phase_header)
+    for ion_idx, v in enumerate(values, 1):
+        lines.append(f"{ion_idx:5d}" + "".join(f"{i:7.3f} {0.0:6.3f} "
+                                               for i in v) + "\n")
+    lines.append("charge " + "  ".join(f"{i:.3f}" for i in values.sum(axis=0))
+                 + "\n \n")
+    return lines
+
+
+@pytest.fixture
+def projections():
+    # [spin, k-idx, band-idx, ion-idx, orbital-idx]
+    return np.round(np.random.default_rng(0).random((2, 2, 4, 3, 4)), 3)
+
+
+@pytest.fixture
+def procar_file(tmpdir, projections):
+    lines = ["PROCAR lm decomposed + phase\n"]
+    for by_spin in projections:
+        lines.append("# of k-points:    2         # of bands:    4         "
+                     "# of ions:    3\n\n")
+        for k_idx, by_kpt in enumerate(by_spin, 1):
+            lines.append(f" k-point {k_idx:5d} :    0.00000000 0.00000000 "
+                         f"0.{k_idx}0000000     weight = 0.50000000\n\n")
+            for band_idx, values in enumerate(by_kpt):
+                lines.extend(band_block(band_idx, values))
+        lines.append("\n")
+    filename = tmpdir / "PROCAR"
+    filename.write_text("".join(lines), encoding="utf-8")
+    return filename
+
+
+def test_read_procar(procar_file, projections):
+    actual = read_procar(str(procar_file), band_range=(1, 2))
+    assert actual.lowest_band_index == 1
+    assert actual.highest_band_index == 2
+    assert actual.orbitals == ["s", "py", "pz", "px"]
+    assert actual.data[Spin.up].dtype == np.float32
+
+    expected = Procar(str(procar_file))
+    for spin in [Spin.up, Spin.down]:
+        np.testing.assert_allclose(actual.data[spin],
+                                   expected.data[spin][:, 1:3], atol=1e-6)
+    assert sidecar_filename(procar_file).exists()
+
+
+def test_read_procar_from_sidecar(procar_file, projections):
+    read_procar(str(procar_file), band_range=(0, 3))
+    procar_file.write_text("", encoding="utf-8")
+    sidecar = sidecar_filename(procar_file)
+    stat = os.stat(procar_file)
+    os.utime(sidecar, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    actual = read_procar(str(procar_file), band_range=(2, 3))
+    assert actual.lowest_band_index == 2
+    np.testing.assert_allclose(actual.data[Spin.down],
+                               projections[1][:, 2:4], atol=1e-6)
+
+
+def test_read_procar_sidecar_not_covering_range(procar_file, projections):
+    read_procar(str(procar_file), band_range=(1, 2))
+    actual = read_procar(str(procar_file), band_range=(0, 2))
+    np.testing.assert_allclose(actual.data[Spin.up],
+                               projections[0][:, 0:3], atol=1e-6)
+
+
+def test_read_procar_wo_sidecar(procar_file):
+    read_procar(str(procar_file), band_range=(1, 2), use_sidecar=False)
+    assert not sidecar_filename(procar_file).exists()
+
+
+def test_read_procar_out_of_range(procar_file):
+    with pytest.raises(ValueError):
+        read_procar(str(procar_file), band_range=(1, 4))
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+#  Copyright (c) 2020 Kumagai group.
+import numpy as np
+import pytest
+from pydefect.cli.vasp.read_vasprun import read_vasprun, VasprunSummary
+from pymatgen.io.vasp import Vasprun
+
+
+@pytest.mark.parametrize("filename", ["MgO_2x2x2_perfect/vasprun.xml",
+                                      "unitcell_Ne_solid/vasprun-band.xml"])
+def test_read_vasprun(vasp_files, filename):
+    expected = Vasprun(vasp_files / filename, parse_potcar_file=False)
+    actual = read_vasprun(vasp_files / filename)
+    assert actual.final_structure == expected.final_structure
+    assert list(actual.eigenvalues) == list(expected.eigenvalues)
+    for spin, eigenvalues in expected.eigenvalues.items():
+        np.testing.assert_array_equal(actual.eigenvalues[spin], eigenvalues)
+    assert actual.actual_kpoints == expected.actual_kpoints
+    assert actual.actual_kpoints_weights == \
+           list(expected.actual_kpoints_weights)
+    assert actual.efermi == expected.efermi
+    assert actual.num_ionic_steps == expected.nionic_steps
+    assert actual.converged_electronic == expected.converged_electronic
+    assert actual.converged_ionic == expected.converged_ionic
+    assert actual.parameters["NELM"] == expected.parameters["NELM"]
+
+
+def test_read_vasprun_truncated(vasp_files, tmpdir):
+    original = vasp_files / "MgO_conv_Va_O_0/vasprun.xml"
+    expected = Vasprun(original, parse_potcar_file=False).initial_structure
+    text = original.read_text()
+    filename = tmpdir / "vasprun.xml"
+    filename.write_text(text[:text.index("<eigenvalues>")], encoding="utf-8")
+    actual = read_vasprun(filename)
+    assert actual.eigenvalues is None
+    assert actual.num_ionic_steps == 0
+    assert actual.final_structure == expected
+
+
+@pytest.fixture
+def vasprun_summary(simple_cubic):
+    return VasprunSummary(final_structure=simple_cubic,
+                          eigenvalues={},
+                          actual_kpoints=[(0.0, 0.0, 0.0)],
+                          actual_kpoints_weights=[1.0],
+                          efermi=0.0,
+                          incar={},
+                          parameters={"NELM": 3, "NSW": 5, "IBRION": 2},
+                          num_ionic_steps=5,
+                          final_electronic_steps=[frozenset()] * 3)
+
+
+def test_vasprun_summary_convergence(vasprun_summary):
+    assert vasprun_summary.converged_electronic is False
+    assert vasprun_summary.converged_ionic is False
+
+    vasprun_summary.final_electronic_steps.pop()
+    vasprun_summary.num_ionic_steps = 4
+    assert vasprun_summary.converged_electronic is True
+    assert vasprun_summary.converged_ionic is True
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+#  Copyright (c) 2020 Kumagai group.
+import os
+import shutil
+import weakref
+
+import numpy as np
+import pytest
+from pydefect.cli.vasp.read_volumetric_data import read_volumetric_data, \
+    sidecar_filename, sum_volumetric_data
+from pymatgen.io.vasp import Chgcar, Poscar
+
+
+@pytest.fixture
+def chgcar_file(tmpdir, vasp_files):
+    filename = tmpdir / "CHGCAR"
+    shutil.copy(vasp_files / "H2_CHGCAR", filename)
+    return filename
+
+
+def test_read_volumetric_data(chgcar_file):
+    expected = Chgcar.from_file(str(chgcar_file))
+    actual = read_volumetric_data(str(chgcar_file))
+    assert sidecar_filename(chgcar_file).exists()
+    assert actual.structure == expected.structure
+    np.testing.assert_array_equal(actual.data["total"],
+                                  expected.data["total"])
+
+    from_sidecar = read_volumetric_data(str(chgcar_file))
+    assert from_sidecar.data["total"].flags.writeable is False
+    assert from_sidecar.structure == expected.structure
+    np.testing.assert_array_equal(from_sidecar.data["total"],
+                                  expected.data["total"])
+
+
+def test_read_volumetric_data_spin(tmpdir, simple_cubic):
+    data = {"total": np.arange(24.0).reshape((2, 3, 4)),
+            "diff": np.arange(24.0).reshape((2, 3, 4)) - 12}
+    filename = str(tmpdir / "CHGCAR")
+    Chgcar(Poscar(simple_cubic), data).write_file(filename)
+    read_volumetric_data(filename)
+    actual = read_volumetric_data(filename)
+    for k, v in data.items():
+        np.testing.assert_allclose(actual.data[k], v)
+
+
+def test_read_volumetric_data_outdated_sidecar(chgcar_file):
+    np.save(sidecar_filename(chgcar_file), np.zeros((1, 20, 20, 36)))
+    stat = os.stat(sidecar_filename(chgcar_file))
+    os.utime(chgcar_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    actual = read_volumetric_data(str(chgcar_file))
+    assert actual.data["total"].any()
+
+
+def test_read_volumetric_data_wo_sidecar(chgcar_file):
+    read_volumetric_data(str(chgcar_file), use_sidecar=False)
+    assert not sidecar_filename(chgcar_file).exists()
+
+
+def test_sum_volumetric_data(simple_cubic):
+    a = Chgcar(Poscar(simple_cubic), {"total": np.array([[[1.0, 2.0]]])})
+    b = Chgcar(Poscar(simple_cubic), {"total": np.array([[[3.0, 5.0]]])})
+    actual = sum_volumetric_data([a, b, b])
+    np.testing.assert_array_equal(actual.data["total"], [[[7.0, 12.0]]])
+    np.testing.assert_array_equal(a.data["total"], [[[1.0, 2.0]]])
+    assert sum_volumetric_data([a]) is a
+
+
+def test_sum_volumetric_data_consumes_inputs_lazily(simple_cubic):
+    refs = []
+
+    def volumetric_data():
+        for value in [1.0, 2.0, 4.0]:
+            # all the data yielded so far must have been released
+            assert all(ref() is None for ref in refs)
+            data = Chgcar(Poscar(simple_cubic),
+                          {"total": np.array([[[value]]])})
+            refs.append(weakref.ref(data))
+            yield data
+            del data
+
+    actual = sum_volumetric_data(volumetric_data())
+    np.testing.assert_array_equal(actual.data["total"], [[[7.0]]])
+    assert len(refs) == 3
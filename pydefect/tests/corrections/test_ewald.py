@@ -1,10 +1,13 @@
 # -*- coding: utf-8 -*-
 #  Copyright (c) 2020. Distributed under the terms of the MIT License.
 
+from collections import OrderedDict
+from pathlib import Path
+
 import numpy as np
 import pytest
 from numpy import pi, sqrt, exp, cos
-from pydefect.corrections.ewald import Ewald
+from pydefect.corrections.ewald import Ewald, get_ewald
 from scipy.special import erfc
 from vise.tests.helpers.assertion import assert_msonable
 
@@ -81,6 +84,81 @@ def test_ewald_rec(ewald, mocker):
     expected = exp(-g_epsilon_g / 4 / ewald.mod_ewald_param ** 2) / g_epsilon_g * cos_term / ewald.volume
     assert actual == expected
 
+
+def test_ewald_sums_agree_with_explicit_loop():
+    ewald = Ewald(lattice=np.array([[5, 0, 0], [1, 6, 0], [0, 0, 7]]),
+                  dielectric_tensor=np.array([[5, 1, 0], [1, 8, 0], [0, 0, 3]]),
+                  accuracy=5)
+    shift = [0.1, 0.2, 0.3]
+
+    expected_real = 0.0
+    for r in ewald.r_lattice_set(include_self=True, shift=shift):
+        x = sqrt(r @ ewald.epsilon_inv @ r)
+        expected_real += erfc(ewald.mod_ewald_param * x) / x
+    expected_real /= 4 * pi * ewald.root_epsilon
+
+    expected_rec = 0.0
+    cart_coord = np.dot(shift, ewald.lattice)
+    for g in ewald.g_lattice_set():
+        x = g @ ewald.dielectric_tensor @ g
+        expected_rec += (exp(-x / 4 / ewald.mod_ewald_param ** 2) / x
+                         * cos(np.dot(g, cart_coord)))
+    expected_rec /= ewald.volume
+
+    assert ewald.ewald_real(include_self=True, shift=shift) == \
+           pytest.approx(expected_real, rel=1e-12)
+    assert ewald.ewald_rec(shift) == pytest.approx(expected_rec, rel=1e-12)
+
+
+def test_atomic_site_potentials():
+    ewald = Ewald(lattice=np.array([[5, 0, 0], [1, 6, 0], [0, 0, 7]]),
+                  dielectric_tensor=np.array([[5, 1, 0], [1, 8, 0], [0, 0, 3]]),
+                  accuracy=5)
+    rel_coords = [[0.1, 0.2, 0.3], [-0.5, 0.0, 0.25], [0.4, -0.3, 0.0]]
+    actual = ewald.atomic_site_potentials(rel_coords)
+    expected = [ewald.atomic_site_potential(c) for c in rel_coords]
+    np.testing.assert_allclose(actual, expected, rtol=1e-12)
+
+
+def test_ewald_num_vectors(ewald):
+    assert ewald.num_r_vectors == np.prod([2 * n + 1 for n in ewald.r_vector_nums])
+    assert ewald.num_g_vectors == len(ewald.g_lattice_set())
+    stats = ewald.sum_statistics()
+    assert stats["num_r_vectors"] == ewald.num_r_vectors
+    assert stats["real_time"] >= 0.0 and stats["rec_time"] >= 0.0
+
+
+def test_ewald_from_optimized_param():
+    lattice = np.array([[5, 0, 0], [0, 5, 0], [0, 0, 30]])
+    diele = np.array([[3, 0, 0], [0, 3, 0], [0, 0, 20]])
+    default = Ewald(lattice, diele, accuracy=10)
+    actual = Ewald.from_optimized_param(lattice, diele, accuracy=10)
+    assert (actual.num_r_vectors + actual.num_g_vectors
+            < default.num_r_vectors + default.num_g_vectors)
+    assert actual.lattice_energy == pytest.approx(default.lattice_energy,
+                                                  rel=1e-5)
+
+
+def test_get_ewald_in_process_cache():
+    lattice = np.array([[5, 0, 0], [0, 6, 0], [0, 0, 7]])
+    ewald = get_ewald(lattice, np.eye(3) * 3, accuracy=5)
+    assert get_ewald(lattice.copy(), np.eye(3) * 3, accuracy=5) is ewald
+    assert get_ewald(lattice, np.eye(3) * 4, accuracy=5) is not ewald
+
+
+def test_get_ewald_disk_cache(tmpdir, mocker):
+    lattice = np.array([[5, 0, 0], [1, 6, 0], [0, 0, 7]])
+    diele = np.array([[5, 1, 0], [1, 8, 0], [0, 0, 3]])
+    expected = get_ewald(lattice, diele, accuracy=4, cache_dir=Path(tmpdir))
+    assert len(list(Path(tmpdir).glob("ewald_*.npz"))) == 1
+
+    mocker.patch("pydefect.corrections.ewald._ewald_cache", OrderedDict())
+    actual = get_ewald(lattice, diele, accuracy=4, cache_dir=Path(tmpdir))
+    assert actual is not expected
+    assert actual.ewald_param == expected.ewald_param
+    assert actual.lattice_energy == expected.lattice_energy
+    np.testing.assert_array_equal(actual.rec_weights, expected.rec_weights)
+
 #
 # def test_ewald_speed():
 #     ewald = Ewald(lattice=np.array([[1, 0, 0], [0, 1, 0], [0, 0, 1]]),
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+#  Copyright (c) 2020. Distributed under the terms of the MIT License.
+
+import numpy as np
+import pytest
+from pydefect.corrections.ewald import Ewald
+from pydefect.corrections.pc_potential_grid import PointChargePotentialGrid
+
+
+@pytest.fixture(scope="module")
+def ewald():
+    return Ewald(lattice=np.array([[8, 0, 0], [1, 7, 0], [0, 0, 9]]),
+                 dielectric_tensor=np.array([[5, 1, 0], [1, 8, 0], [0, 0, 3]]),
+                 accuracy=10)
+
+
+@pytest.fixture(scope="module")
+def grid(ewald):
+    return PointChargePotentialGrid(ewald)
+
+
+def test_pc_potential_grid(ewald, grid):
+    assert grid.grid_size == (16, 15, 18)
+
+    coords = np.random.default_rng(1).random((50, 3)) - 0.5
+    expected = ewald.atomic_site_potentials(coords)
+    actual = grid.potentials(coords)
+    np.testing.assert_allclose(actual, expected, atol=3 * grid.error_estimate)
+    assert grid.error_estimate < 1e-6
+
+
+def test_pc_potential_grid_near_origin(ewald, grid):
+    coords = [[0.01, 0.0, 0.0], [0.0, -0.02, 0.01]]
+    np.testing.assert_allclose(grid.potentials(coords),
+                               ewald.atomic_site_potentials(coords),
+                               rtol=1e-5)
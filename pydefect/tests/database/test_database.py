@@ -1,7 +1,10 @@
 # -*- coding: utf-8 -*-
 #  Copyright (c) 2020. Distributed under the terms of the MIT License.
 
-from pydefect.database.database import electronegativity, oxidation_state
+from pydefect.database.database import electronegativity, oxidation_state, \
+    point_group_data, num_symmetry_operation, is_proper_subgroup
+from pymatgen.symmetry.groups import SpaceGroup
+from vise.util.structure_symmetrizer import num_sym_op
 
 
 def test_electronegativity():
@@ -22,3 +25,22 @@ def test_oxidation_state_bi():
 
 def test_oxidation_state_not_exist():
     assert oxidation_state("Os") == 0
+
+
+def test_num_symmetry_operation():
+    assert num_symmetry_operation("m-3m") == 48
+    assert num_symmetry_operation("..6") == 6
+    for point_group in point_group_data:
+        assert num_symmetry_operation(point_group) == num_sym_op[point_group]
+
+
+def test_point_group_subgroups_wrt_pymatgen():
+    assert len(point_group_data) == 32
+    # P32 is parsed as P3_2 in pymatgen.
+    symbols = {"32": "P321", "3m": "P3m1", "-3m": "P-3m1"}
+    space_groups = {pg: SpaceGroup(symbols.get(pg, f"P{pg}"))
+                    for pg in point_group_data}
+    for group, sg in space_groups.items():
+        for subgroup, sub_sg in space_groups.items():
+            expected = subgroup != group and sub_sg.is_subgroup(sg)
+            assert is_proper_subgroup(subgroup, group) is expected
@@ -2,8 +2,11 @@
 #  Copyright (c) 2020. Distributed under the terms of the MIT License.
 
 import numpy as np
+import pytest
 
-from pydefect.util.structure_tools import Distances, Coordination
+from pydefect.util.structure_tools import Distances, Coordination, \
+    nearest_site_indices, min_image_vectors, periodic_cluster_labels
+from pymatgen.core import Lattice, Structure
 from vise.tests.helpers.assertion import assert_msonable
 
 
@@ -59,3 +62,79 @@ def test_coord_distances(mocker, ortho_conventional):
 
 def test_coordination_msonable(tmpdir):
     assert_msonable(Coordination({"H": [2.5, 3.0, 3.5]}, 3.905, [1]))
+
+
+def test_distances_many(ortho_conventional):
+    centers = [[0.25, 0.25, 0.25], [0.5, 0.5, 0.5], [0.25, 0.26, 0.0]]
+    actual = Distances.many(ortho_conventional, centers)
+    for center, distances in zip(centers, actual):
+        expected = Distances(ortho_conventional, center_coord=center)
+        np.testing.assert_almost_equal(distances.distances(),
+                                       expected.distances())
+        np.testing.assert_almost_equal(
+            distances.distances(remove_self=False, specie="He"),
+            expected.distances(remove_self=False, specie="He"))
+
+
+@pytest.mark.parametrize("dist_tol", [0.5, 10.0])
+def test_nearest_site_indices(dist_tol):
+    rng = np.random.default_rng(1)
+    lattice = Lattice.from_parameters(6, 7, 8, 80, 95, 110)
+    structure = Structure(lattice, ["H", "He"] * 20, rng.random((40, 3)))
+    coords = np.concatenate([structure.frac_coords[:30]
+                             + rng.normal(scale=0.03, size=(30, 3)),
+                             rng.random((10, 3)) - 0.5])
+    species = [None] * 20 + ["H"] * 10 + ["He"] * 10
+    actual = nearest_site_indices(structure, coords, dist_tol, species)
+    expected = [Distances(structure, c, dist_tol).atom_idx_at_center(s)
+                for c, s in zip(coords, species)]
+    assert actual == expected
+
+
+def test_nearest_site_indices_w_ties(ortho_conventional):
+    coords = [[0.25, 0.25, 0.25], [0.75, 0.25, 0.75], [0.0, 0.25, 0.0]]
+    species = [None, "He", None]
+    actual = nearest_site_indices(ortho_conventional, coords, dist_tol=3.0,
+                                  species=species)
+    expected = [Distances(ortho_conventional, c, 3.0).atom_idx_at_center(s)
+                for c, s in zip(coords, species)]
+    assert actual == expected
+
+
+def test_min_image_vectors():
+    rng = np.random.default_rng(0)
+    lattice = Lattice.from_parameters(5, 6, 9, 70, 100, 120)
+    coords1 = rng.random((20, 3)) * 3 - 1
+    coords2 = rng.random((20, 3))
+    for c2 in [coords2, coords2[0]]:
+        vectors, distances, images = min_image_vectors(lattice, coords1, c2)
+        for i, c1 in enumerate(coords1):
+            c = c2[i] if c2.ndim == 2 else c2
+            distance, image = lattice.get_distance_and_image(c1, c)
+            assert distances[i] == pytest.approx(distance, abs=1e-12)
+            np.testing.assert_array_equal(images[i], image)
+            np.testing.assert_almost_equal(
+                vectors[i], lattice.get_cartesian_coords(c + image - c1))
+
+
+@pytest.mark.parametrize("tol", [0.5, 4.0])
+def test_periodic_cluster_labels(tol):
+    rng = np.random.default_rng(2)
+    lattice = Lattice.from_parameters(4, 5, 6, 75, 95, 110)
+    coords = rng.random((40, 3))
+    actual = periodic_cluster_labels(lattice, coords, tol)
+
+    distances = lattice.get_all_distances(coords, coords)
+    expected = np.arange(len(coords))
+    for _ in range(len(coords)):  # propagate the smallest connected label
+        expected = np.min(np.where(distances <= tol, expected, len(coords)),
+                          axis=1)
+    _, expected = np.unique(expected, return_inverse=True)
+    np.testing.assert_array_equal(actual, expected)
+
+
+def test_periodic_cluster_labels_across_boundary():
+    lattice = Lattice.cubic(10)
+    coords = [[0.99, 0.5, 0.5], [0.5, 0.5, 0.5], [0.01, 0.5, 0.5]]
+    actual = periodic_cluster_labels(lattice, coords, tol=0.3)
+    np.testing.assert_array_equal(actual, [0, 1, 0])
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+#  Copyright (c) 2020. Distributed under the terms of the MIT License.
+from pydefect.util import symmetry_cache
+from pydefect.util.symmetry_cache import SymmetryData, get_symmetry_data, \
+    get_symmetrizer, symmetry_cache_key
+from pymatgen.core import Structure
+from vise.tests.helpers.assertion import assert_msonable
+
+
+def test_symmetry_data_msonable():
+    assert_msonable(SymmetryData(point_group="m-3m",
+                                 sg_number=225,
+                                 site_symmetry_symbols=["m-3m"],
+                                 equivalent_atoms=[0]))
+
+
+def test_symmetry_cache_key(simple_cubic):
+    shifted = Structure.from_dict(simple_cubic.as_dict())
+    shifted.translate_sites([0], [1.0, 0.0, -1.0])
+    assert symmetry_cache_key(simple_cubic, 0.1, 5.0) == \
+           symmetry_cache_key(shifted, 0.1, 5.0)
+    assert symmetry_cache_key(simple_cubic, 0.1, 5.0) != \
+           symmetry_cache_key(simple_cubic, 0.01, 5.0)
+
+
+def test_get_symmetrizer(simple_cubic):
+    actual = get_symmetrizer(simple_cubic, 0.1, 5.0)
+    assert actual is get_symmetrizer(simple_cubic.copy(), 0.1, 5.0)
+    assert actual.point_group == "m-3m"
+
+
+def test_get_symmetry_data(mocker, simple_cubic, tmpdir):
+    tmpdir.chdir()
+    symmetry_cache._symmetry_data_cache.clear()
+    actual = get_symmetry_data(simple_cubic, cache_dir=tmpdir)
+    expected = SymmetryData(point_group="m-3m",
+                            sg_number=221,
+                            site_symmetry_symbols=["m-3m"],
+                            equivalent_atoms=[0])
+    assert actual == expected
+    assert len(tmpdir.listdir()) == 1
+
+    symmetry_cache._symmetry_data_cache.clear()
+    mock = mocker.patch("pydefect.util.symmetry_cache.get_symmetrizer")
+    assert get_symmetry_data(simple_cubic, cache_dir=tmpdir) == expected
+    mock.assert_not_called()
@@ -2,8 +2,6 @@
 from itertools import combinations
 from typing import List
 
-from mp_api.client import MPRester
-
 from pydefect.defaults import defaults
 from vise.util.logger import get_logger
 
@@ -16,6 +14,8 @@ class MpQuery:
                  element_list: List[str],
                  e_above_hull: float = defaults.e_above_hull,
                  properties: List[str] = None):
+        # mp_api imports matplotlib via pymatgen, so imported here.
+        from mp_api.client import MPRester
         # API key is parsed via .pmgrc.yaml
         with MPRester() as m:
             # Due to mp_decode=True by default, class objects are restored.
@@ -2,12 +2,170 @@
 #  Copyright (c) 2020. Distributed under the terms of the MIT License.
 from collections import defaultdict
 from dataclasses import dataclass
-from typing import List, Dict, Optional, Set
+from itertools import product, chain
+from typing import List, Dict, Optional, Set, Tuple
 
 import numpy as np
+from numpy.linalg import norm
 from monty.json import MSONable
 from pydefect.defaults import defaults
-from pymatgen.core import Structure, Element
+from pymatgen.core import Structure, Element, Lattice
+from pymatgen.util.coord import pbc_shortest_vectors
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+from scipy.spatial import cKDTree
+
+
+def distance_matrix(structure: Structure, centers) -> np.ndarray:
+    """Minimum-image distances from centers to all sites in structure.
+
+    Returns an (num centers, num sites) array.
+    """
+    centers = np.reshape(np.array(centers, dtype=float), (-1, 3))
+    _, d2 = pbc_shortest_vectors(structure.lattice, centers,
+                                 structure.frac_coords, return_d2=True)
+    return np.sqrt(d2)
+
+
+def min_image_vectors(lattice: Lattice, frac_coords1, frac_coords2
+                      ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Pairwise minimum-image vectors from frac_coords1 to frac_coords2.
+
+    frac_coords1 is an (N, 3) array, and frac_coords2 is either an (N, 3)
+    array or a single point. The results are the same as those of
+    Lattice.get_distance_and_image(frac_coords1[i], frac_coords2[i]); for a
+    single point, they are identical, and otherwise they can differ by
+    rounding errors as the differences are taken first.
+
+    Returns:
+        Cartesian vectors, distances, and images such that frac_coords2 +
+        images are the nearest to frac_coords1.
+    """
+    frac_coords1 = np.reshape(np.array(frac_coords1, dtype=float), (-1, 3))
+    frac_coords2 = np.array(frac_coords2, dtype=float)
+    if frac_coords2.ndim == 1:
+        vectors, d2 = pbc_shortest_vectors(lattice, frac_coords1,
+                                           frac_coords2, return_d2=True)
+    else:
+        vectors, d2 = pbc_shortest_vectors(lattice,
+                                           frac_coords1 - frac_coords2,
+                                           [0.0, 0.0, 0.0], return_d2=True)
+    vectors = vectors[:, 0]
+    images = np.round(lattice.get_fractional_coords(vectors)
+                      + frac_coords1 - frac_coords2)
+    return vectors, np.sqrt(d2[:, 0]), images.astype(int)
+
+
+# Distances within this tolerance are regarded as degenerate.
+_tie_tol = 1e-8
+
+
+def nearest_site_indices(structure: Structure,
+                         frac_coords,
+                         dist_tol: float,
+                         species: Optional[List] = None
+                         ) -> List[Optional[int]]:
+    """Indices of the nearest sites to frac_coords within dist_tol.
+
+    The result is the same as that of Distances.atom_idx_at_center, but
+    candidates are searched with a KD-tree built over the sites and their
+    neighboring images, so that the cost scales as O(N log N).
+
+    species: Species of the sites to be mapped for each coord. None means
+        any species.
+    """
+    frac_coords = np.reshape(np.array(frac_coords, dtype=float), (-1, 3))
+    species = species or [None] * len(frac_coords)
+    lattice = structure.lattice
+    # Neighboring images are sufficient only when dist_tol is shorter than
+    # the interplanar distances.
+    rec_lattice = lattice.reciprocal_lattice_crystallographic
+    plane_distances = 1 / np.array(rec_lattice.abc)
+    if dist_tol >= min(plane_distances) - _tie_tol:
+        return [Distances(structure, c, dist_tol).atom_idx_at_center(s)
+                for c, s in zip(frac_coords, species)]
+
+    images = np.array(list(product((-1, 0, 1), repeat=3)))
+    image_coords = structure.frac_coords % 1 + images[:, np.newaxis, :]
+    tree = cKDTree(lattice.get_cartesian_coords(image_coords.reshape(-1, 3)))
+    queries = lattice.get_cartesian_coords(frac_coords % 1)
+    candidates = tree.query_ball_point(queries, r=dist_tol + _tie_tol)
+
+    query_idx = np.repeat(np.arange(len(queries)), [len(c) for c in candidates])
+    point_idx = np.fromiter(chain.from_iterable(candidates), dtype=int,
+                            count=len(query_idx))
+    site_idx = point_idx % len(structure)
+    distances = norm(tree.data[point_idx] - queries[query_idx], axis=1)
+
+    elements = [Element(s) if s else None for s in species]
+    unique_elements = list(set(elements))
+    allowed = np.array([[e is None or site_specie == e
+                         for site_specie in structure.species]
+                        for e in unique_elements], dtype=bool)
+    element_idx = np.array([unique_elements.index(e) for e in elements])
+    mask = allowed[element_idx[query_idx], site_idx]
+    query_idx, site_idx, distances = \
+        query_idx[mask], site_idx[mask], distances[mask]
+
+    order = np.lexsort((site_idx, distances, query_idx))
+    query_idx, site_idx, distances = \
+        query_idx[order], site_idx[order], distances[order]
+    mapped_queries, first = np.unique(query_idx, return_index=True)
+    nearest_sites = np.full(len(queries), -1)
+    nearest_sites[mapped_queries] = site_idx[first]
+    shortest = np.full(len(queries), np.inf)
+    shortest[mapped_queries] = distances[first]
+
+    # Near-degenerate cases are determined with the same distances as
+    # Distances to keep the results identical.
+    ambiguous = set(query_idx[(distances < shortest[query_idx] + _tie_tol)
+                              & (site_idx != nearest_sites[query_idx])])
+    ambiguous.update(np.flatnonzero(abs(shortest - dist_tol) < _tie_tol))
+
+    result = []
+    for i, (site, d) in enumerate(zip(nearest_sites, shortest)):
+        if i in ambiguous:
+            indices = np.unique(site_idx[query_idx == i])
+            _, d2 = pbc_shortest_vectors(lattice, frac_coords[i],
+                                         structure.frac_coords[indices],
+                                         return_d2=True)
+            exact = np.sqrt(d2[0])
+            result.append(int(indices[np.argmin(exact)])
+                          if min(exact) <= dist_tol else None)
+        else:
+            result.append(int(site) if d <= dist_tol else None)
+    return result
+
+
+def periodic_cluster_labels(lattice: Lattice, frac_coords, tol: float
+                            ) -> np.ndarray:
+    """Single-linkage clusters of points with the periodic boundary condition.
+
+    Points whose minimum-image distance is within tol are connected, and the
+    connected components are the clusters, as scipy's fcluster with the
+    "distance" criterion does for single linkage. Neighbors are searched
+    with a KD-tree over the points and their images.
+
+    Returns:
+        Cluster labels numbered in the order of the first member indices.
+    """
+    frac_coords = np.reshape(np.array(frac_coords, dtype=float), (-1, 3)) % 1
+    rec_lattice = lattice.reciprocal_lattice_crystallographic
+    ranges = np.ceil(tol * np.array(rec_lattice.abc)).astype(int)
+    images = np.array(list(product(*[range(-n, n + 1) for n in ranges])))
+    image_coords = frac_coords + images[:, np.newaxis, :]
+    tree = cKDTree(lattice.get_cartesian_coords(image_coords.reshape(-1, 3)))
+    neighbors = tree.query_ball_point(
+        lattice.get_cartesian_coords(frac_coords), r=tol)
+
+    num_points = len(frac_coords)
+    rows = np.repeat(np.arange(num_points), [len(n) for n in neighbors])
+    cols = np.fromiter(chain.from_iterable(neighbors), dtype=int,
+                       count=len(rows)) % num_points
+    graph = coo_matrix((np.ones(len(rows)), (rows, cols)),
+                       shape=(num_points, num_points))
+    _, labels = connected_components(graph, directed=False)
+    return labels
 
 
 class Distances:
@@ -18,26 +176,42 @@ class Distances:
         self.structure = structure
         self.coord = center_coord
         self.dist_tol = dist_tol or defaults.dist_tol
+        self._all_distances = None
 
-    def distances(self, remove_self=True, specie=None) -> List[float]:
+    @classmethod
+    def many(cls, structure: Structure, centers, dist_tol: float = None
+             ) -> List["Distances"]:
+        """Distances for multiple centers with a single batched calculation.
+        """
         result = []
-        lattice = self.structure.lattice
-        for site in self.structure:
-            if specie and Element(specie) != site.specie:
-                result.append(float("inf"))
-                continue
-            distance, _ = \
-                lattice.get_distance_and_image(site.frac_coords, self.coord)
-            if remove_self and distance < 1e-5:
-                continue
-            result.append(distance)
-
+        for center, d in zip(centers, distance_matrix(structure, centers)):
+            distances = cls(structure, center, dist_tol)
+            distances._all_distances = d
+            result.append(distances)
         return result
 
+    @property
+    def all_distances(self) -> np.ndarray:
+        if self._all_distances is None:
+            self._all_distances = distance_matrix(self.structure,
+                                                  self.coord)[0]
+        return self._all_distances
+
+    def _specie_mask(self, specie) -> np.ndarray:
+        element = Element(specie)
+        return np.array([site.specie == element for site in self.structure])
+
+    def distances(self, remove_self=True, specie=None) -> List[float]:
+        result = self.all_distances
+        if specie:
+            result = np.where(self._specie_mask(specie), result, float("inf"))
+        if remove_self:
+            result = result[result >= 1e-5]
+        return result.tolist()
+
     def atom_idx_at_center(self, specie: str) -> Optional[int]:
         distances = self.distances(remove_self=False, specie=specie)
-        sorted_dists = sorted(distances)
-        if sorted_dists[0] > self.dist_tol:
+        if min(distances) > self.dist_tol:
             return None
         return np.argmin(distances)
 
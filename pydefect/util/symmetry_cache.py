@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+#  Copyright (c) 2020. Distributed under the terms of the MIT License.
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+from monty.json import MSONable
+from monty.serialization import loadfn
+from pydefect.defaults import defaults
+from pymatgen.core import Structure
+from vise.defaults import defaults as vise_defaults
+from vise.util.logger import get_logger
+from vise.util.mix_in import ToJsonFileMixIn
+from vise.util.structure_symmetrizer import StructureSymmetrizer
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class SymmetryData(MSONable, ToJsonFileMixIn):
+    """Subset of the spglib dataset used in pydefect. """
+    point_group: str
+    sg_number: int
+    site_symmetry_symbols: List[str]
+    equivalent_atoms: List[int]
+
+    @classmethod
+    def from_symmetrizer(cls, symmetrizer: StructureSymmetrizer
+                         ) -> "SymmetryData":
+        sym_data = symmetrizer.spglib_sym_data
+        return cls(point_group=sym_data.pointgroup,
+                   sg_number=int(sym_data.number),
+                   site_symmetry_symbols=list(sym_data.site_symmetry_symbols),
+                   equivalent_atoms=[int(i) for i in sym_data.equivalent_atoms])
+
+
+def symmetry_cache_key(structure: Structure,
+                       symprec: float,
+                       angle_tolerance: float) -> str:
+    """Content hash of the structure and tolerances for symmetry analysis.
+
+    Fractional coordinates are wrapped into [0, 1) and the arrays are
+    rounded so that the tiny numerical noise does not matter.
+    """
+    h = hashlib.sha256()
+    frac_coords = np.round(structure.frac_coords % 1, 8) % 1
+    for array in (structure.lattice.matrix, frac_coords):
+        h.update(np.round(np.array(array, dtype=float), 8).tobytes())
+    h.update(np.array([site.specie.Z for site in structure]).tobytes())
+    h.update(repr((float(symprec), float(angle_tolerance))).encode())
+    return h.hexdigest()
+
+
+_cache_size = 32
+_symmetrizer_cache: "OrderedDict[str, StructureSymmetrizer]" = OrderedDict()
+_symmetry_data_cache: "OrderedDict[str, SymmetryData]" = OrderedDict()
+
+
+def _add_to_cache(cache: OrderedDict, key: str, value) -> None:
+    cache[key] = value
+    if len(cache) > _cache_size:
+        cache.popitem(last=False)
+
+
+def get_symmetrizer(
+        structure: Structure,
+        symprec: float = vise_defaults.symmetry_length_tolerance,
+        angle_tolerance: float = vise_defaults.symmetry_angle_tolerance
+) -> StructureSymmetrizer:
+    """StructureSymmetrizer shared among the calls with the same inputs.
+
+    Spglib is therefore run once per structure and tolerances in a process.
+    The defaults are the same as those of StructureSymmetrizer.
+    """
+    key = symmetry_cache_key(structure, symprec, angle_tolerance)
+    if key in _symmetrizer_cache:
+        _symmetrizer_cache.move_to_end(key)
+        return _symmetrizer_cache[key]
+
+    result = StructureSymmetrizer(structure, symprec, angle_tolerance)
+    _add_to_cache(_symmetrizer_cache, key, result)
+    return result
+
+
+def get_symmetry_data(
+        structure: Structure,
+        symprec: float = vise_defaults.symmetry_length_tolerance,
+        angle_tolerance: float = vise_defaults.symmetry_angle_tolerance,
+        cache_dir: Optional[Path] = None) -> SymmetryData:
+    """Point group, site symmetries and equivalent atoms of a structure.
+
+    Results are kept in an in-process LRU cache. When cache_dir, or
+    symmetry_cache_dir in pydefect.yaml, is set, they are also stored in
+    symmetry_*.json files there, so that spglib is skipped in later runs.
+    """
+    key = symmetry_cache_key(structure, symprec, angle_tolerance)
+    if key in _symmetry_data_cache:
+        _symmetry_data_cache.move_to_end(key)
+        return _symmetry_data_cache[key]
+
+    cache_dir = cache_dir or defaults.symmetry_cache_dir
+    filename = Path(cache_dir) / f"symmetry_{key[:16]}.json" \
+        if cache_dir else None
+    if filename and filename.exists():
+        result = loadfn(filename)
+    else:
+        symmetrizer = get_symmetrizer(structure, symprec, angle_tolerance)
+        result = SymmetryData.from_symmetrizer(symmetrizer)
+        if filename:
+            Path(cache_dir).mkdir(parents=True, exist_ok=True)
+            result.to_json_file(str(filename))
+
+    _add_to_cache(_symmetry_data_cache, key, result)
+    return result